@@ -1,21 +1,20 @@
 import asyncio
 import logging
+import time
 from datetime import datetime as dt
 from datetime import date as d
 
 import orjson
 from aiogram import Bot
 from aiogram.enums.chat_action import ChatAction
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, NotFoundError
 
+from .metrics import inbox_metrics, tool_metrics
+from .run_ledger import TERMINAL_STATUSES, run_ledger
 from yclients import YClients
 from yclients.services.online_bookings_service.models import (
     BookableServicesQueryParams,
     BookableServicesRequest,
-    BookableDatesQueryParams,
-    BookableDatesRequest,
-    BookableTimesQueryParams,
-    BookableTimesRequest,
     BookRecordRequestBody,
     BookRecordRequest,
 )
@@ -29,6 +28,28 @@ client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 assistant_id = settings.OPENAI_ASSISTANT_ID
 model = settings.OPENAI_MODEL
 
+# Ассистент общий для всех пользователей, поэтому запрашивается один раз на процесс.
+_assistant = None
+_assistant_lock = asyncio.Lock()
+
+
+async def get_assistant(client: AsyncOpenAI, assistant_id: str):
+    '''Возвращает объект ассистента, запрашивая его у OpenAI только при первом обращении.
+
+    Параметры:
+        client (AsyncOpenAI): Клиент OpenAI.
+        assistant_id (str): Идентификатор ассистента.
+
+    Возвращает:
+        Assistant: Объект ассистента.
+    '''
+    global _assistant
+    async with _assistant_lock:
+        if _assistant is None or _assistant.id != assistant_id:
+            _assistant = await client.beta.assistants.retrieve(assistant_id=assistant_id)
+            logger.info(f"Assistant {assistant_id} initialized successfully")
+        return _assistant
+
 
 class AssistantManager:
     '''Класс для управления ассистентом и взаимодействия с YClients API для конкретного пользователя.
@@ -43,10 +64,14 @@ class AssistantManager:
         user_phone (str): Телефонный номер пользователя.
         assistant_id (str): Идентификатор ассистента OpenAI.
         thread_id (str): Идентификатор текущей сессии (thread) ассистента.
-        assistant: Объект ассистента OpenAI.
-        thread: Текущий поток сообщений ассистента.
+        assistant: Объект ассистента OpenAI (общий на процесс).
+        thread: Поток сообщений ассистента, если он создан этим менеджером.
         run: Текущий запуск (run) ассистента.
+        ready (bool): Данные пользователя и поток загружены, повторная инициализация не нужна.
+        inbox (list[str] | None): Сообщения, ожидающие окончания активного запуска.
+        inbox_led (bool): У очереди есть вызов, который отправит её ассистенту и вернёт ответ.
         lock (asyncio.Lock): Асинхронный lock для предотвращения одновременных запросов.
+        init_lock (asyncio.Lock): Lock инициализации.
     '''
 
     def __init__(self, db, yclients, user_id):
@@ -62,7 +87,11 @@ class AssistantManager:
         self.assistant = None
         self.thread = None
         self.run = None
+        self.ready = False
+        self.inbox: list[str] | None = None
+        self.inbox_led = False
         self.lock = asyncio.Lock()
+        self.init_lock = asyncio.Lock()
 
     @staticmethod
     async def get_datetime_now():
@@ -76,116 +105,378 @@ class AssistantManager:
     async def initialize(self):
         '''Инициализирует ассистента и поток сообщений для пользователя.
 
+        Ассистент запрашивается один раз на процесс (см. `get_assistant`). Поток пользователя берётся
+        из базы без запроса к OpenAI: если OpenAI ответит на запрос к нему 404, поток создаётся заново
+        (см. `add_message`). После загрузки данных пользователя повторные вызовы ничего не запрашивают.
+
         Возвращает:
             str или None: Идентификатор потока сообщений или None в случае ошибки.
         '''
-        try:
-            if self.assistant_id:
-                # Инициализация ассистента вынести за пределы try для сокращения вложенности
-                self.assistant = await self.client.beta.assistants.retrieve(assistant_id=self.assistant_id)
-                logger.info(f"Assistant {self.assistant_id} initialized successfully")
+        if self.ready:
+            return self.thread_id
+        async with self.init_lock:
+            if self.ready:
+                return self.thread_id
+            try:
+                if self.assistant_id:
+                    self.assistant = await get_assistant(self.client, self.assistant_id)
+
+                user_data = await self.db.get_user_by_telegram_id(self.user_id)
+                if user_data and user_data.get('thread_id'):
+                    self.thread_id = user_data['thread_id']
+                    self.user_fullname = f'{user_data["surname"]} {user_data["name"]}'
+                    self.user_phone = user_data['phone']
+                    self.ready = True
+                    logger.info(f"Thread {self.thread_id} loaded for user {self.user_id}")
+                elif not self.thread_id:
+                    await self.create_thread()
+
+                return self.thread_id
+            except Exception as e:
+                logger.error(f"Error initializing assistant for user {self.user_id}: {str(e)}")
+                return None
 
-            user_data = await self.db.get_user_by_telegram_id(self.user_id)
-            if user_data and user_data.get('thread_id'):
-                self.thread_id = user_data['thread_id']
-                self.user_fullname = f'{user_data["surname"]} {user_data["name"]}'
-                self.user_phone = user_data['phone']
-                # Объединить асинхронные вызовы для уменьшения количества обращений к API
-                self.thread = await self.client.beta.threads.retrieve(thread_id=self.thread_id)
-                logger.info(f"Thread {self.thread_id} retrieved for user {self.user_id}")
-            else:
-                self.thread = await self.client.beta.threads.create()
-                self.thread_id = self.thread.id
-                # Вынести обновление БД в отдельную функцию для лучшей читаемости
-                await self.db.update_user_thread_id(self.user_id, self.thread_id)
-                logger.info(f"New thread {self.thread_id} created for user {self.user_id}")
+    async def create_thread(self):
+        '''Создаёт новый поток сообщений и сохраняет его идентификатор в базе.'''
+        self.thread = await self.client.beta.threads.create()
+        self.thread_id = self.thread.id
+        run_ledger.reconciled(self.thread_id)
+        await self.db.update_user_thread_id(self.user_id, self.thread_id)
+        logger.info(f"New thread {self.thread_id} created for user {self.user_id}")
 
-            return self.thread_id
-        except Exception as e:
-            logger.error(f"Error initializing assistant for user {self.user_id}: {str(e)}")
-            return None
+    async def add_message(self, role, content):
+        '''Добавляет сообщение в поток. Если поток не найден (404), создаёт новый и повторяет запрос.
+
+        Параметры:
+            role (str): Роль отправителя ('user' или 'assistant').
+            content (str): Содержание сообщения.
+        '''
+        try:
+            await self.client.beta.threads.messages.create(
+                thread_id=self.thread_id,  # type: ignore
+                role=role,
+                content=content,
+            )
+        except NotFoundError:
+            logger.warning(f"Thread {self.thread_id} not found for user {self.user_id}, creating a new one")
+            await self.create_thread()
+            await self.client.beta.threads.messages.create(
+                thread_id=self.thread_id,  # type: ignore
+                role=role,
+                content=content,
+            )
 
     async def cleanup(self):
         '''Очистка ресурсов (если необходимо).'''
         pass  # TODO: Реализовать, если будет необходимо
 
-    async def add_message_to_thread_and_run(self, role, content, message, bot: Bot, user_data):
+    async def add_message_to_thread_and_run(
+        self, role, content, message, bot: Bot, user_data, on_delta=None, on_start=None
+    ):
         '''Добавляет сообщение в поток и запускает ассистента.
 
+        Сообщения, пришедшие во время активного запуска, попадают в очередь пользователя (не больше
+        ASSISTANT_INBOX_SIZE сообщений). После завершения запуска вся очередь отправляется ассистенту одним
+        сообщением в одном запуске. Ответ возвращается вызову, открывшему очередь, остальные получают None.
+        Если этот вызов отменён до начала запуска, очередь вместе со своим сообщением отправляет следующий вызов.
+
         Параметры:
             role (str): Роль отправителя ('user' или 'assistant').
             content (str): Содержание сообщения.
             message: Сообщение Telegram.
             bot (Bot): Экземпляр бота.
             user_data: Данные пользователя.
+            on_delta (Callable[[str, str], None], optional): Получает фрагменты текста ответа в потоковом
+                режиме: идентификатор сообщения ассистента и фрагмент.
+            on_start (Callable[[], Awaitable], optional): Вызывается, когда начинается обработка сообщения.
 
         Возвращает:
-            str: Ответ ассистента или сообщение об ошибке.
+            str или None: Ответ ассистента или сообщение об ошибке; None, если сообщение объединено
+                с другими в очереди и ответ на них вернёт другой вызов.
         '''
-        if self.lock.locked():
-            logger.info(f"Run already in progress for user {self.user_id}. Queuing message.")
+        if not self.lock.locked() and self.inbox is None:
+            inbox_metrics.messages += 1
+            inbox_metrics.runs += 1
+            async with self.lock:
+                return await self.run_message(role, content, message, bot, on_delta, on_start)
+
+        # Очередь без ведущего вызова (он отменён) забирает следующее сообщение: ответ на неё вернёт оно.
+        leader = self.inbox is None or not self.inbox_led
+        if not leader and len(self.inbox) >= settings.ASSISTANT_INBOX_SIZE:  # type: ignore[arg-type]
+            inbox_metrics.rejected += 1
+            logger.info(f"Inbox of user {self.user_id} is full, message rejected")
             return 'Отвечаю на предыдущий вопрос ✨. Подождите, пожалуйста... 😊'
-        async with self.lock:
-            try:
-                if not self.thread:
-                    await self.initialize()
 
-                await self.cancel_existing_runs()
+        if self.inbox is None:
+            self.inbox = []
+        batch = self.inbox
+        batch.append(content)
+        inbox_metrics.enqueue()
+        logger.info(f"Run already in progress for user {self.user_id}. Queued message {len(batch)}.")
+        if not leader:
+            return None
 
-                await self.client.beta.threads.messages.create(
-                    thread_id=self.thread_id,  # type: ignore
-                    role=role,
-                    content=content,
-                )
+        self.inbox_led = True
+        try:
+            await self.lock.acquire()
+        except asyncio.CancelledError:
+            # Остальные вызовы уже вернули None: очередь остаётся следующему сообщению пользователя.
+            if self.inbox is batch:
+                self.inbox_led = False
+            raise
+        try:
+            self.inbox = None
+            self.inbox_led = False
+            inbox_metrics.dequeue(len(batch))
+            return await self.run_message(role, '\n\n'.join(batch), message, bot, on_delta, on_start)
+        finally:
+            self.lock.release()
 
-                current_datetime = await self.get_datetime_now()
+    async def run_message(self, role, content, message, bot: Bot, on_delta=None, on_start=None):
+        '''Добавляет сообщение в поток и выполняет запуск ассистента. Вызывается под `lock`.
 
-                self.run = await self.client.beta.threads.runs.create(
-                    thread_id=self.thread_id,  # type: ignore
-                    assistant_id=self.assistant_id,  # type: ignore
-                    additional_instructions=(
-                        f'Клиент: {self.user_fullname}\n'
-                        f'Номер телефона: {self.user_phone}\n'
-                        f'Текущее время: {current_datetime}'
-                    ),
-                )
-                logger.info(f"Run started for thread {self.thread_id}")
+        Параметры:
+            role (str): Роль отправителя ('user' или 'assistant').
+            content (str): Содержание сообщения.
+            message: Сообщение Telegram.
+            bot (Bot): Экземпляр бота.
+            on_delta (Callable[[str, str], None], optional): Получает фрагменты текста ответа.
+            on_start (Callable[[], Awaitable], optional): Вызывается перед добавлением сообщения.
 
-                return await self.handle_run(bot, message)
-            except Exception as e:
-                logger.error(f"Error adding message to thread for user {self.user_id}: {str(e)}")
-                return 'Произошла ошибка при обработке вашего запроса.'
+        Возвращает:
+            str: Ответ ассистента или сообщение об ошибке.
+        '''
+        if on_start is not None:
+            await on_start()
+        try:
+            if not self.thread_id:
+                await self.initialize()
+
+            await self.cancel_existing_runs()
+
+            await self.add_message(role, content)
+
+            current_datetime = await self.get_datetime_now()
+            additional_instructions = (
+                f'Клиент: {self.user_fullname}\n'
+                f'Номер телефона: {self.user_phone}\n'
+                f'Текущее время: {current_datetime}'
+            )
+
+            if settings.ASSISTANT_STREAMING:
+                try:
+                    stream = await self.client.beta.threads.runs.create(
+                        thread_id=self.thread_id,  # type: ignore
+                        assistant_id=self.assistant_id,  # type: ignore
+                        additional_instructions=additional_instructions,
+                        stream=True,
+                    )
+                except Exception as e:
+                    logger.warning(f"Streaming run unavailable for thread {self.thread_id}, polling instead: {e}")
+                    # Запуск мог быть создан до ошибки.
+                    run_ledger.forget(self.thread_id)  # type: ignore
+                    await self.cancel_existing_runs()
+                else:
+                    logger.info(f"Streaming run started for thread {self.thread_id}")
+                    return await self.handle_stream(bot, message, stream, on_delta)
+
+            self.run = await self.client.beta.threads.runs.create(
+                thread_id=self.thread_id,  # type: ignore
+                assistant_id=self.assistant_id,  # type: ignore
+                additional_instructions=additional_instructions,
+            )
+            run_ledger.started(self.thread_id, self.run.id)  # type: ignore
+            logger.info(f"Run started for thread {self.thread_id}")
+
+            return await self.handle_run(bot, message)
+        except Exception as e:
+            logger.error(f"Error adding message to thread for user {self.user_id}: {str(e)}")
+            if self.thread_id:
+                run_ledger.forget(self.thread_id)
+            return 'Произошла ошибка при обработке вашего запроса.'
 
     async def cancel_existing_runs(self):
-        '''Отменяет существующие запуски ассистента для текущего потока.'''
+        '''Отменяет незавершённые запуски ассистента для текущего потока.
+
+        Активный запуск берётся из локального журнала запусков (см. `RunLedger`). Список запусков
+        запрашивается у OpenAI, только если журнал не знает состояния потока: после перезапуска процесса
+        или ошибки.
+        '''
         try:
-            runs = await self.client.beta.threads.runs.list(thread_id=self.thread_id)  # type: ignore
-            for run in runs.data:
-                if run.status not in ('expired', 'cancelled', 'completed'):
-                    await self.client.beta.threads.runs.cancel(thread_id=self.thread_id, run_id=run.id)  # type: ignore
-                    logger.info(f"Run {run.id} canceled for thread {self.thread_id}")
+            if run_ledger.needs_reconcile(self.thread_id):  # type: ignore
+                runs = await self.client.beta.threads.runs.list(thread_id=self.thread_id)  # type: ignore
+                run_ledger.counters['reconciled'] += 1
+                run_ids = [run.id for run in reversed(runs.data) if run.status not in TERMINAL_STATUSES]
+            else:
+                run_ids = [run_id for run_id in [run_ledger.active_run(self.thread_id)] if run_id]  # type: ignore
+            for run_id in run_ids:
+                await self.client.beta.threads.runs.cancel(thread_id=self.thread_id, run_id=run_id)  # type: ignore
+                run_ledger.counters['cancelled'] += 1
+                logger.info(f"Run {run_id} canceled for thread {self.thread_id}")
+            run_ledger.reconciled(self.thread_id)  # type: ignore
         except Exception as e:
+            run_ledger.forget(self.thread_id)  # type: ignore
             logger.error(f"Error canceling runs for thread {self.thread_id}: {str(e)}")
 
-    async def handle_run(self, bot, message):
-        '''Обрабатывает текущий запуск ассистента, ожидая его завершения.
+    @staticmethod
+    async def keep_typing(bot: Bot, chat_id: int):
+        '''Показывает пользователю статус «печатает», пока задача не будет отменена.
+
+        Параметры:
+            bot (Bot): Экземпляр бота.
+            chat_id (int): Идентификатор чата.
+        '''
+        while True:
+            try:
+                await bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
+            except Exception as e:
+                logger.warning(f"Failed to send typing action to chat {chat_id}: {str(e)}")
+            # Статус держится около 5 секунд, чаще обновлять его не нужно.
+            await asyncio.sleep(4)
+
+    async def handle_stream(self, bot, message, stream, on_delta=None):
+        '''Обрабатывает запуск ассистента в потоковом режиме: события запуска обрабатываются по мере
+        поступления, результаты инструментов отправляются внутри потока.
+
+        Если поток оборвался до завершения запуска, ожидание продолжается опросом (см. `handle_run`).
+        Запуск, не завершившийся за ASSISTANT_RUN_DEADLINE секунд, отменяется.
 
         Параметры:
             bot (Bot): Экземпляр бота.
             message: Сообщение Telegram.
+            stream: Поток событий запуска (AsyncStream[AssistantStreamEvent]).
+            on_delta (Callable[[str, str], None], optional): Получает фрагменты текста ответа.
 
         Возвращает:
             str: Ответ ассистента или сообщение об ошибке.
         '''
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.ASSISTANT_RUN_DEADLINE
+        self.run = None
+        typing = asyncio.create_task(self.keep_typing(bot, message.chat.id))
+        try:
+            reply = await asyncio.wait_for(
+                self.consume_stream(stream, on_delta), timeout=settings.ASSISTANT_RUN_DEADLINE
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Run for user {self.user_id} exceeded the deadline")
+            await self.cancel_run()
+            return 'Не удалось получить ответ вовремя. Попробуйте, пожалуйста, ещё раз.'
+        except Exception as e:
+            logger.warning(f"Run stream for user {self.user_id} interrupted: {str(e)}")
+            reply = None
+        finally:
+            typing.cancel()
+
+        if reply is not None:
+            return reply
+        if self.run is None:
+            run_ledger.forget(self.thread_id)  # type: ignore
+            return 'Произошла ошибка при обработке вашего запроса.'
+        logger.info(f"Run stream for thread {self.thread_id} ended early, polling run {self.run.id}")
+        return await self.handle_run(bot, message, deadline=deadline)
+
+    async def consume_stream(self, stream, on_delta=None) -> str | None:
+        '''Читает события запуска до его завершения.
+
+        Параметры:
+            stream: Поток событий запуска (AsyncStream[AssistantStreamEvent]).
+            on_delta (Callable[[str, str], None], optional): Получает фрагменты текста ответа.
+
+        Возвращает:
+            str или None: Ответ ассистента, сообщение об ошибке или None, если поток закончился раньше запуска.
+        '''
+        reply = None
+        while stream is not None:
+            next_stream = None
+            async with stream:
+                async for event in stream:
+                    if event.event.startswith('thread.run.') and not event.event.startswith('thread.run.step.'):
+                        run_ledger.track(self.thread_id, event.data)  # type: ignore
+                    if event.event == 'thread.run.created':
+                        self.run = event.data
+                    elif event.event == 'thread.message.delta' and on_delta is not None:
+                        for part in event.data.delta.content or []:
+                            if part.type == 'text' and part.text and part.text.value:  # type: ignore
+                                on_delta(event.data.id, part.text.value)  # type: ignore
+                    elif event.event == 'thread.message.completed' and event.data.role == 'assistant':
+                        reply = event.data.content[0].text.value  # type: ignore
+                    elif event.event == 'thread.run.requires_action':
+                        self.run = event.data
+                        tool_outputs = await self.collect_tool_outputs(
+                            event.data.required_action.submit_tool_outputs  # type: ignore
+                        )
+                        next_stream = await self.client.beta.threads.runs.submit_tool_outputs(
+                            run_id=self.run.id,  # type: ignore
+                            thread_id=self.thread_id,  # type: ignore
+                            tool_outputs=tool_outputs,
+                            stream=True,
+                        )
+                        logger.info(f"Tool outputs submitted for run {self.run.id}")  # type: ignore
+                        break
+                    elif event.event == 'thread.run.completed':
+                        logger.info(f"Assistant response: {reply}")
+                        return reply or 'Произошла ошибка при обработке вашего запроса.'
+                    elif event.event in (
+                        'thread.run.failed',
+                        'thread.run.cancelled',
+                        'thread.run.expired',
+                        'thread.run.incomplete',
+                        'error',
+                    ):
+                        logger.error(f"Run for user {self.user_id} ended with event {event.event}")
+                        if event.event == 'error':
+                            run_ledger.forget(self.thread_id)  # type: ignore
+                        return 'Произошла ошибка при обработке вашего запроса.'
+            stream = next_stream
+        return None
+
+    async def cancel_run(self):
+        '''Отменяет текущий запуск ассистента, если он известен.'''
+        if self.run is None:
+            return
+        try:
+            await self.client.beta.threads.runs.cancel(thread_id=self.thread_id, run_id=self.run.id)  # type: ignore
+            run_ledger.finished(self.thread_id, self.run.id)  # type: ignore
+            run_ledger.counters['cancelled'] += 1
+            logger.info(f"Run {self.run.id} canceled for thread {self.thread_id}")
+        except Exception as e:
+            run_ledger.forget(self.thread_id)  # type: ignore
+            logger.error(f"Error canceling run {self.run.id} for thread {self.thread_id}: {str(e)}")
+
+    async def handle_run(self, bot, message, deadline: float | None = None):
+        '''Обрабатывает текущий запуск ассистента опросом, ожидая его завершения.
+
+        Интервал опроса начинается с ASSISTANT_POLL_INITIAL секунд и удваивается до ASSISTANT_POLL_MAX,
+        после отправки результатов инструментов — снова с начального. Запуск, не завершившийся
+        к сроку, отменяется.
+
+        Параметры:
+            bot (Bot): Экземпляр бота.
+            message: Сообщение Telegram.
+            deadline (float | None): Срок по часам цикла событий. По умолчанию - через ASSISTANT_RUN_DEADLINE секунд.
+
+        Возвращает:
+            str: Ответ ассистента или сообщение об ошибке.
+        '''
+        loop = asyncio.get_running_loop()
+        deadline = deadline or loop.time() + settings.ASSISTANT_RUN_DEADLINE
+        delay = settings.ASSISTANT_POLL_INITIAL
+        run_status = None
+        typing = asyncio.create_task(self.keep_typing(bot, message.chat.id))
         try:
             while True:
-                # Уменьшить задержку ожидания и добавить прерывание цикла после нескольких итераций для избегания бесконечного цикла
-                await bot.send_chat_action(chat_id=message.chat.id, action=ChatAction.TYPING)
-                await asyncio.sleep(1.5)
+                if loop.time() + delay > deadline:
+                    logger.error(f"Run for user {self.user_id} exceeded the deadline")
+                    await self.cancel_run()
+                    return 'Не удалось получить ответ вовремя. Попробуйте, пожалуйста, ещё раз.'
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.ASSISTANT_POLL_MAX)
                 run_status = await self.client.beta.threads.runs.retrieve(
                     thread_id=self.thread_id,  # type: ignore
                     run_id=self.run.id,  # type: ignore
                 )
+                run_ledger.track(self.thread_id, run_status)  # type: ignore
 
                 if run_status.status == 'completed':
                     messages = await self.client.beta.threads.messages.list(thread_id=self.thread_id)  # type: ignore
@@ -196,27 +487,29 @@ class AssistantManager:
                         return message_text
                 elif run_status.status == 'requires_action':
                     await self.handle_required_actions(run_status.required_action.submit_tool_outputs)  # type: ignore
-                elif run_status.status in ('canceled', 'expired', 'failed'):
+                    delay = settings.ASSISTANT_POLL_INITIAL
+                elif run_status.status in ('cancelled', 'expired', 'failed', 'incomplete'):
                     return 'Произошла ошибка при обработке вашего запроса.'
         except Exception as e:
             logger.error(
                 f"Error handling run for user {self.user_id}, status: {getattr(run_status, 'status', 'unknown')}: {str(e)}"
             )
+            run_ledger.forget(self.thread_id)  # type: ignore
             return 'Произошла ошибка при обработке вашего запроса.'
+        finally:
+            typing.cancel()
 
     async def handle_required_actions(self, required_action):
         '''Обрабатывает требуемые действия, вызванные ассистентом.
 
+        Вызовы инструментов одного шага выполняются параллельно (см. `collect_tool_outputs`);
+        результаты отправляются одним запросом в исходном порядке.
+
         Параметры:
             required_action: Объект требуемого действия (RequiredAction).
         '''
         try:
-            tool_outputs = []
-            for tool_call in required_action.tool_calls:
-                function_name = tool_call.function.name
-                arguments = orjson.loads(tool_call.function.arguments)
-                function_response = await self.call_function(function_name, arguments)
-                tool_outputs.append({'tool_call_id': tool_call.id, 'output': function_response})
+            tool_outputs = await self.collect_tool_outputs(required_action)
 
             await self.client.beta.threads.runs.submit_tool_outputs(
                 run_id=self.run.id,  # type: ignore
@@ -227,6 +520,55 @@ class AssistantManager:
         except Exception as e:
             logger.error(f"Error handling required actions for run {self.run.id}: {str(e)}")  # type: ignore
 
+    async def collect_tool_outputs(self, required_action) -> list[dict]:
+        '''Выполняет вызовы инструментов шага параллельно, но не более ASSISTANT_TOOL_CONCURRENCY одновременно.
+
+        Параметры:
+            required_action: Объект требуемого действия (RequiredActionSubmitToolOutputs).
+
+        Возвращает:
+            list[dict]: Выводы инструментов в исходном порядке вызовов.
+        '''
+        semaphore = asyncio.Semaphore(max(1, settings.ASSISTANT_TOOL_CONCURRENCY))
+        return await asyncio.gather(
+            *(self.run_tool_call(tool_call, semaphore) for tool_call in required_action.tool_calls)
+        )
+
+    async def run_tool_call(self, tool_call, semaphore: asyncio.Semaphore) -> dict:
+        '''Выполняет один вызов инструмента с ограничением по времени ASSISTANT_TOOL_TIMEOUT.
+
+        Ошибки не прерывают остальные вызовы шага: ассистент получает их в выводе инструмента
+        как JSON вида {"error": "...", "code": "..."}.
+
+        Параметры:
+            tool_call: Вызов инструмента (RequiredActionFunctionToolCall).
+            semaphore (asyncio.Semaphore): Ограничение одновременных вызовов шага.
+
+        Возвращает:
+            dict: Вывод инструмента для submit_tool_outputs.
+        '''
+        function_name = tool_call.function.name
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                arguments = orjson.loads(tool_call.function.arguments or '{}')
+                result = await asyncio.wait_for(
+                    self.call_function(function_name, arguments),
+                    timeout=settings.ASSISTANT_TOOL_TIMEOUT,
+                )
+                outcome = result.get('code', 'error') if isinstance(result, dict) and 'error' in result else 'ok'
+            except orjson.JSONDecodeError:
+                result = {'error': 'Некорректные аргументы функции.', 'code': 'invalid_arguments'}
+                outcome = 'invalid_arguments'
+            except asyncio.TimeoutError:
+                logger.warning(f"Function {function_name} timed out for user {self.user_id}")
+                result = {'error': f'Функция {function_name} не ответила вовремя.', 'code': 'timeout'}
+                outcome = 'timeout'
+            tool_metrics.record(function_name, time.perf_counter() - started, outcome)
+
+        output = result if isinstance(result, str) else orjson.dumps(result).decode('utf-8')
+        return {'tool_call_id': tool_call.id, 'output': output}
+
     async def call_function(self, function_name, arguments):
         '''Вызывает функцию по имени с заданными аргументами.
 
@@ -243,6 +585,7 @@ class AssistantManager:
                 'get_bookable_dates': self.get_bookable_dates,
                 'get_bookable_times': self.get_bookable_times,
                 'create_book_record': self.create_book_record,
+                'get_client_records': self.get_client_records,
             }
 
             func = function_mapping.get(function_name)
@@ -252,10 +595,10 @@ class AssistantManager:
                 return await func(arguments)
             else:
                 logger.warning(f"Function {function_name} not implemented")
-                return f"Функция {function_name} не реализована."
+                return {'error': f"Функция {function_name} не реализована.", 'code': 'not_implemented'}
         except Exception as e:
             logger.error(f"Error calling function {function_name} with arguments {arguments}: {str(e)}")
-            return f"Ошибка выполнения функции {function_name}"
+            return {'error': f"Ошибка выполнения функции {function_name}", 'code': 'exception'}
 
     async def get_bookable_services(self, params):
         '''Получает список доступных для бронирования услуг из YClients API.
@@ -299,14 +642,8 @@ class AssistantManager:
             if not service_ids:
                 return {'error': 'Пожалуйста, укажите ID услуг.'}
 
-            dates_response = await self.yclients.online_bookings.get_bookable_dates(
-                BookableDatesRequest(
-                    query=BookableDatesQueryParams(service_ids=service_ids),
-                ),
-            )
-            if dates_response and dates_response.success:
-                dates = dates_response.data.booking_dates
-                dates_list = dates
+            dates_list = await self.yclients.availability.get_dates(service_ids=service_ids)
+            if dates_list is not None:
                 logger.info(f"Bookable dates retrieved for services {service_ids} for user {self.user_id}")
                 return orjson.dumps({'dates': dates_list}).decode('utf-8')
             else:
@@ -332,15 +669,12 @@ class AssistantManager:
             if not staff_id or not date or not service_ids:
                 return {'error': 'Пожалуйста, укажите ID сотрудника, дату и ID услуг.'}
 
-            times_response = await self.yclients.online_bookings.get_bookable_times(
-                request_model=BookableTimesRequest(
-                    query=BookableTimesQueryParams(),
-                ),
+            times = await self.yclients.availability.get_times(
+                service_ids=service_ids,
                 staff_id=staff_id,
-                date=d.fromisoformat(date),
+                day=d.fromisoformat(date),
             )
-            if times_response and times_response.success:
-                times = times_response.data
+            if times is not None:
                 times_list = [{'time': time.time} for time in times]
                 logger.info(
                     f"Bookable times retrieved for date {date} and services {service_ids} for user {self.user_id}"
@@ -352,6 +686,41 @@ class AssistantManager:
             logger.error(f"Error getting bookable times for user {self.user_id}: {str(e)}")
             return {'error': 'Не удалось получить доступное время.'}
 
+    async def get_client_records(self, params):
+        '''Получает предстоящие записи пользователя из локального зеркала записей YClients.
+
+        Параметры:
+            params (dict): Параметры запроса, необязательный ключ 'limit' - максимальное количество записей.
+
+        Возвращает:
+            str: JSON-строка с записями или сообщение об ошибке.
+        '''
+        try:
+            user_data = await self.db.get_user_by_telegram_id(self.user_id)
+            if not user_data:
+                return {'error': 'Пользователь не найден. Пожалуйста, зарегистрируйтесь.'}
+
+            records = await self.db.get_client_records(
+                client_id=user_data['yclients_id'],
+                phone=user_data['phone'],
+                limit=params.get('limit', 10),
+            )
+            if not records and await self.db.get_records_mirror_lag() is None:
+                return {'error': 'Не удалось получить записи.'}
+            records_list = [
+                {
+                    'datetime': record['datetime'],
+                    'staff': record['staff_name'],
+                    'services': [service['title'] for service in record['services']],
+                }
+                for record in records
+            ]
+            logger.info(f"Client records retrieved from mirror for user {self.user_id}")
+            return orjson.dumps({'records': records_list}).decode('utf-8')
+        except Exception as e:
+            logger.error(f"Error getting client records for user {self.user_id}: {str(e)}")
+            return {'error': 'Не удалось получить записи.'}
+
     async def create_book_record(self, params):
         '''Создает запись бронирования в YClients.
 
@@ -0,0 +1,165 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+# Верхние границы корзин гистограммы задержек (сек); последняя корзина — всё, что дольше.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    '''Гистограмма задержек с фиксированными корзинами.
+
+    Атрибуты:
+        buckets (tuple[float, ...]): Верхние границы корзин (сек).
+        counts (list[int]): Количество наблюдений по корзинам, последняя — сверх последней границы.
+        count (int): Общее количество наблюдений.
+        total (float): Сумма наблюдений (сек).
+    '''
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        '''Добавляет наблюдение.
+
+        Параметры:
+            seconds (float): Задержка (сек).
+        '''
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float | None:
+        '''Оценивает квантиль по верхней границе корзины, в которую он попадает.
+
+        Параметры:
+            q (float): Квантиль от 0 до 1.
+
+        Возвращает:
+            float | None: Оценка квантиля (сек), inf — если он сверх последней границы, None — если наблюдений нет.
+        '''
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def snapshot(self) -> dict:
+        '''Возвращает состояние гистограммы.
+
+        Возвращает:
+            dict: Корзины с количеством наблюдений, их количество, средняя задержка, оценки p50 и p95.
+        '''
+        labels = [f'le_{bound:g}' for bound in self.buckets] + ['le_inf']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'count': self.count,
+            'avg': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+        }
+
+
+class ToolMetrics:
+    '''Метрики вызовов инструментов ассистента: гистограммы задержек и счётчики исходов по инструментам.
+
+    Атрибуты:
+        latency (defaultdict[str, LatencyHistogram]): Гистограммы задержек по имени инструмента.
+        outcomes (defaultdict[str, Counter]): Количество вызовов по исходам ('ok', 'error', 'timeout' и т.д.).
+    '''
+
+    def __init__(self):
+        self.latency: defaultdict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.outcomes: defaultdict[str, Counter] = defaultdict(Counter)
+
+    def record(self, tool: str, seconds: float, outcome: str = 'ok'):
+        '''Записывает вызов инструмента.
+
+        Параметры:
+            tool (str): Имя инструмента.
+            seconds (float): Длительность вызова (сек).
+            outcome (str): Исход вызова.
+        '''
+        self.latency[tool].observe(seconds)
+        self.outcomes[tool][outcome] += 1
+
+    def stats(self) -> dict[str, dict]:
+        '''Возвращает метрики по инструментам.
+
+        Возвращает:
+            dict[str, dict]: Гистограмма задержек и количество вызовов по исходам для каждого инструмента.
+        '''
+        return {
+            tool: {**histogram.snapshot(), 'outcomes': dict(self.outcomes[tool])}
+            for tool, histogram in self.latency.items()
+        }
+
+
+class InboxMetrics:
+    '''Метрики очередей сообщений пользователей, пришедших во время активного запуска ассистента.
+
+    Атрибуты:
+        depth (int): Сообщений в очередях сейчас.
+        max_depth (int): Максимальное количество сообщений в очередях.
+        messages (int): Сообщений, принятых к обработке.
+        runs (int): Запусков, в которых эти сообщения обработаны.
+        queued (int): Сообщений, прошедших через очередь.
+        batches (int): Объединённых сообщений, отправленных ассистенту из очередей.
+        rejected (int): Сообщений, отклонённых из-за заполненной очереди.
+    '''
+
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self.messages = 0
+        self.runs = 0
+        self.queued = 0
+        self.batches = 0
+        self.rejected = 0
+
+    def enqueue(self):
+        '''Записывает сообщение, поставленное в очередь.'''
+        self.messages += 1
+        self.queued += 1
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def dequeue(self, size: int):
+        '''Записывает объединение очереди в одно сообщение для ассистента.
+
+        Параметры:
+            size (int): Количество объединённых сообщений.
+        '''
+        self.depth -= size
+        self.batches += 1
+        self.runs += 1
+
+    def stats(self) -> dict:
+        '''Возвращает метрики очередей.
+
+        Возвращает:
+            dict: Глубина очередей, счётчики и коэффициенты объединения: сообщений очереди на одно объединённое
+                сообщение и всех принятых сообщений на один запуск.
+        '''
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'messages': self.messages,
+            'runs': self.runs,
+            'queued': self.queued,
+            'batches': self.batches,
+            'rejected': self.rejected,
+            'coalescing_ratio': self.queued / self.batches if self.batches else None,
+            'messages_per_run': self.messages / self.runs if self.runs else None,
+        }
+
+
+# Общие на процесс метрики: менеджеры ассистента создаются на каждого пользователя.
+tool_metrics = ToolMetrics()
+inbox_metrics = InboxMetrics()
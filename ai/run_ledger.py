@@ -0,0 +1,112 @@
+from collections import Counter
+
+# Статусы, в которых запуск больше не занимает поток.
+TERMINAL_STATUSES = frozenset({'completed', 'cancelled', 'expired', 'failed', 'incomplete'})
+
+
+class RunLedger:
+    '''Локальный журнал запусков ассистента по потокам.
+
+    Журнал знает активный запуск каждого потока, с которым процесс работал: запуски записываются при создании
+    и по событиям потока, завершённые удаляются. Поток, состояние которого журнал не знает (процесс перезапущен
+    или запрос к запуску завершился ошибкой), нужно сверить со списком запусков в OpenAI.
+
+    Атрибуты:
+        active (dict[str, str]): Идентификатор активного запуска по идентификатору потока.
+        known (set[str]): Потоки, состояние запусков которых журнал знает.
+        counters (Counter): Количество сверок, отмен и пропусков из-за ошибок.
+    '''
+
+    def __init__(self):
+        self.active: dict[str, str] = {}
+        self.known: set[str] = set()
+        self.counters: Counter = Counter()
+
+    def needs_reconcile(self, thread_id: str) -> bool:
+        '''Проверяет, нужно ли сверить поток со списком запусков в OpenAI.
+
+        Параметры:
+            thread_id (str): Идентификатор потока.
+
+        Возвращает:
+            bool: True, если состояние запусков потока неизвестно.
+        '''
+        return thread_id not in self.known
+
+    def active_run(self, thread_id: str) -> str | None:
+        '''Возвращает активный запуск потока.
+
+        Параметры:
+            thread_id (str): Идентификатор потока.
+
+        Возвращает:
+            str | None: Идентификатор запуска или None, если активного запуска нет.
+        '''
+        return self.active.get(thread_id)
+
+    def reconciled(self, thread_id: str, run_ids: list[str] | None = None):
+        '''Записывает состояние потока по списку запусков из OpenAI (или новый поток без запусков).
+
+        Параметры:
+            thread_id (str): Идентификатор потока.
+            run_ids (list[str] | None): Незавершённые запуски потока, последний — самый новый.
+        '''
+        self.known.add(thread_id)
+        if run_ids:
+            self.active[thread_id] = run_ids[-1]
+        else:
+            self.active.pop(thread_id, None)
+
+    def track(self, thread_id: str, run):
+        '''Обновляет журнал по объекту запуска из ответа OpenAI или события потока.
+
+        Параметры:
+            thread_id (str): Идентификатор потока.
+            run: Запуск ассистента (Run).
+        '''
+        if run.status in TERMINAL_STATUSES:
+            self.finished(thread_id, run.id)
+        elif thread_id in self.known:
+            self.active[thread_id] = run.id
+
+    def started(self, thread_id: str, run_id: str):
+        '''Записывает созданный запуск.
+
+        Параметры:
+            thread_id (str): Идентификатор потока.
+            run_id (str): Идентификатор запуска.
+        '''
+        if thread_id in self.known:
+            self.active[thread_id] = run_id
+
+    def finished(self, thread_id: str, run_id: str):
+        '''Удаляет завершённый или отменённый запуск.
+
+        Параметры:
+            thread_id (str): Идентификатор потока.
+            run_id (str): Идентификатор запуска.
+        '''
+        if self.active.get(thread_id) == run_id:
+            del self.active[thread_id]
+
+    def forget(self, thread_id: str):
+        '''Помечает состояние потока неизвестным после ошибки: перед следующим запуском поток будет сверен.
+
+        Параметры:
+            thread_id (str): Идентификатор потока.
+        '''
+        self.known.discard(thread_id)
+        self.active.pop(thread_id, None)
+        self.counters['forgotten'] += 1
+
+    def stats(self) -> dict:
+        '''Возвращает состояние журнала.
+
+        Возвращает:
+            dict: Количество известных потоков, активных запусков и счётчики.
+        '''
+        return {'threads': len(self.known), 'active': len(self.active), **self.counters}
+
+
+# Общий на процесс журнал: менеджеры ассистента создаются на каждого пользователя и могут удаляться из реестра.
+run_ledger = RunLedger()
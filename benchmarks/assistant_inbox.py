@@ -0,0 +1,85 @@
+'''
+Серии сообщений во время активного запуска ассистента: у каждого из --users пользователей первое сообщение
+запускает ассистента, ещё --burst - 1 сообщений приходят с интервалом --gap секунд, пока запуск идёт.
+Сообщение, которое менеджер отклонил, пользователь отправляет повторно через --resend-delay секунд.
+Выводятся количество запусков и отклонённых сообщений на серию и время до ответа на последнее сообщение.
+
+Запуск:
+    python -m benchmarks.assistant_inbox [--users 5] [--burst 5] [--think 1.0] [--gap 0.1] [--resend-delay 1.5]
+'''
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from types import SimpleNamespace
+
+from openai import AsyncOpenAI
+
+import ai.manager
+from ai.metrics import inbox_metrics
+from ai.registry import AssistantManagerRegistry
+from benchmarks.assistant_init import FakeBot, FakeDb
+from config.settings import settings
+from tests.fakes.openai import FakeOpenAI
+
+# Ответ менеджера на сообщение, которое не принято к обработке.
+REJECTED = 'Отвечаю на предыдущий вопрос ✨. Подождите, пожалуйста... 😊'
+
+
+async def send(manager, text: str, resend_delay: float, counters: dict) -> float:
+    message = SimpleNamespace(chat=SimpleNamespace(id=manager.user_id))
+    while True:
+        answer = await manager.add_message_to_thread_and_run('user', text, message, FakeBot(), None)
+        if answer != REJECTED:
+            return time.perf_counter()
+        counters['rejected'] += 1
+        await asyncio.sleep(resend_delay)
+
+
+async def burst(registry, db, user_id: int, size: int, gap: float, resend_delay: float, counters: dict) -> float:
+    manager = await registry.get_manager(db=db, yclients=None, user_id=user_id)
+    await manager.initialize()
+    started = time.perf_counter()
+    tasks = []
+    for i in range(size):
+        tasks.append(asyncio.create_task(send(manager, f'Сообщение {i + 1}', resend_delay, counters)))
+        await asyncio.sleep(gap)
+    return max(await asyncio.gather(*tasks)) - started
+
+
+async def main(users: int, size: int, think: float, gap: float, resend_delay: float):
+    settings.ASSISTANT_STREAMING = True
+    server = FakeOpenAI(think=think, tool_rounds=0)
+    await server.start()
+    ai.manager.client = AsyncOpenAI(base_url=server.url, api_key='fake', max_retries=0)
+    ai.manager.assistant_id = 'asst_fake'
+    registry = AssistantManagerRegistry()
+    db = FakeDb(users)
+    counters = {'rejected': 0}
+    try:
+        durations = await asyncio.gather(
+            *(burst(registry, db, user_id, size, gap, resend_delay, counters) for user_id in range(1, users + 1))
+        )
+    finally:
+        await ai.manager.client.close()
+        await server.stop()
+    print(
+        f'{users} bursts of {size} messages: {server.hits["runs.create"] / users:.1f} runs/burst, '
+        f'{counters["rejected"] / users:.1f} rejected/burst, '
+        f'last message answered after p50 {statistics.median(durations):.2f} s, max {max(durations):.2f} s'
+    )
+    print(inbox_metrics.stats())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--burst', type=int, default=5)
+    parser.add_argument('--think', type=float, default=1.0)
+    parser.add_argument('--gap', type=float, default=0.1)
+    parser.add_argument('--resend-delay', type=float, default=1.5)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(main(args.users, args.burst, args.think, args.gap, args.resend_delay))
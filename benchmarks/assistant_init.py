@@ -0,0 +1,86 @@
+'''
+Запросы к OpenAI на одно сообщение пользователя по пути обработчика user_text: получение менеджера из реестра,
+initialize() и запуск ассистента. У --users пользователей по --messages сообщений; после первого сообщения
+поток первого пользователя удаляется на сервере (ответы 404), чтобы пройти и путь восстановления потока.
+
+Запуск:
+    python -m benchmarks.assistant_init [--users 5] [--messages 10]
+'''
+
+import argparse
+import asyncio
+import logging
+from collections import Counter
+from types import SimpleNamespace
+
+from openai import AsyncOpenAI
+
+import ai.manager
+from ai.registry import AssistantManagerRegistry
+from config.settings import settings
+from tests.fakes.openai import FakeOpenAI
+
+
+class FakeDb:
+    '''Хранилище пользователей в памяти с интерфейсом Database, нужным менеджеру ассистента.'''
+
+    def __init__(self, users: int):
+        self.users = {
+            user_id: {'name': 'Анна', 'surname': 'Иванова', 'phone': '79990000000', 'thread_id': f'thread_u{user_id}'}
+            for user_id in range(1, users + 1)
+        }
+
+    async def get_user_by_telegram_id(self, telegram_id: int) -> dict | None:
+        user = self.users.get(telegram_id)
+        return dict(user) if user else None
+
+    async def update_user_thread_id(self, telegram_id: int, thread_id: str) -> bool:
+        if telegram_id not in self.users:
+            return False
+        self.users[telegram_id]['thread_id'] = thread_id
+        return True
+
+
+class FakeBot:
+    async def send_chat_action(self, chat_id: int, action: str):
+        pass
+
+
+async def main(users: int, messages: int):
+    settings.ASSISTANT_STREAMING = True
+    server = FakeOpenAI(think=0.01, tool_rounds=0)
+    await server.start()
+    ai.manager.client = AsyncOpenAI(base_url=server.url, api_key='fake', max_retries=0)
+    ai.manager.assistant_id = 'asst_fake'
+    registry = AssistantManagerRegistry()
+    db = FakeDb(users)
+    bot = FakeBot()
+    replies = Counter()
+    try:
+        for i in range(messages):
+            for user_id in range(1, users + 1):
+                manager = await registry.get_manager(db=db, yclients=None, user_id=user_id)  # type: ignore[arg-type]
+                await manager.initialize()
+                message = SimpleNamespace(chat=SimpleNamespace(id=user_id))
+                answer = await manager.add_message_to_thread_and_run('user', 'Привет!', message, bot, None)
+                replies['ok' if answer == server.reply else 'error'] += 1
+            if i == 0:
+                server.deleted_threads.add(db.users[1]['thread_id'])
+    finally:
+        await ai.manager.client.close()
+        await server.stop()
+
+    total = users * messages
+    print(f'{total} messages, replies: {dict(replies)}')
+    for kind, count in sorted(server.hits.items()):
+        print(f'  {kind:<26} {count:5d}  {count / total:5.2f} per message')
+    print(f'  {"total":<26} {sum(server.hits.values()):5d}  {sum(server.hits.values()) / total:5.2f} per message')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--messages', type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(main(args.users, args.messages))
@@ -0,0 +1,96 @@
+'''
+Задержка ответа ассистента (p50/p95) с фейковым сервером Assistants API: прежний цикл опроса с фиксированной
+паузой 1,5 с, опрос с адаптивным интервалом и потоковый режим. Каждый запуск «думает» около --think секунд,
+с вероятностью --tool-share один раз вызывает инструмент (--tool-latency секунд) и отвечает текстом.
+Кроме задержки выводится количество запросов к OpenAI и к Telegram на один ответ.
+
+Запуск:
+    python -m benchmarks.assistant_runs [--replies 20] [--think 0.8] [--tool-share 0.5] [--tool-latency 0.1]
+'''
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from openai import AsyncOpenAI
+
+from ai.manager import AssistantManager
+from config.settings import settings
+from tests.fakes.openai import FakeOpenAI
+
+MODES = {
+    'fixed 1.5 s poll': {'ASSISTANT_STREAMING': False, 'ASSISTANT_POLL_INITIAL': 1.5, 'ASSISTANT_POLL_MAX': 1.5},
+    'adaptive poll': {'ASSISTANT_STREAMING': False, 'ASSISTANT_POLL_INITIAL': 0.2, 'ASSISTANT_POLL_MAX': 2.0},
+    'streaming': {'ASSISTANT_STREAMING': True},
+}
+
+
+class FakeBot:
+    def __init__(self):
+        self.chat_actions = 0
+
+    async def send_chat_action(self, chat_id: int, action: str):
+        self.chat_actions += 1
+
+
+async def reply(client: AsyncOpenAI, bot: FakeBot, user_id: int, tool_latency: float) -> float:
+    manager = AssistantManager(None, None, user_id)
+    manager.client = client
+    manager.assistant_id = 'asst_fake'
+    manager.thread = SimpleNamespace(id=f'thread_{user_id}')
+    manager.thread_id = manager.thread.id
+
+    async def get_bookable_dates(params):
+        await asyncio.sleep(tool_latency)
+        return '{"dates": ["2024-10-21"]}'
+
+    manager.get_bookable_dates = get_bookable_dates  # type: ignore[method-assign]
+    message = SimpleNamespace(chat=SimpleNamespace(id=user_id))
+    started = time.perf_counter()
+    await manager.add_message_to_thread_and_run('user', 'Когда можно записаться?', message, bot, None)
+    return time.perf_counter() - started
+
+
+def percentile(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+async def main(replies: int, think: float, tool_share: float, tool_latency: float, seed: int):
+    server = FakeOpenAI(think=think)
+    await server.start()
+    client = AsyncOpenAI(base_url=server.url, api_key='fake', max_retries=0)
+    try:
+        for name, overrides in MODES.items():
+            for key, value in overrides.items():
+                setattr(settings, key, value)
+            rng = random.Random(seed)
+            server.hits.clear()
+            bot = FakeBot()
+            samples = []
+            for i in range(replies):
+                server.think = think * rng.uniform(0.5, 1.5)
+                server.tool_rounds = int(rng.random() < tool_share)
+                samples.append(await reply(client, bot, i + 1, tool_latency))
+            print(
+                f'{name:<18} p50 {statistics.median(samples):6.2f} s  p95 {percentile(samples, 0.95):6.2f} s  '
+                f'{sum(server.hits.values()) / replies:5.1f} OpenAI req/reply  '
+                f'{bot.chat_actions / replies:4.1f} Telegram req/reply'
+            )
+    finally:
+        await client.close()
+        await server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--replies', type=int, default=20)
+    parser.add_argument('--think', type=float, default=0.8)
+    parser.add_argument('--tool-share', type=float, default=0.5)
+    parser.add_argument('--tool-latency', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.replies, args.think, args.tool_share, args.tool_latency, args.seed))
@@ -0,0 +1,91 @@
+'''
+Сравнение пропускной способности Database: соединение на каждый вызов против пула соединений.
+
+Запуск:
+    python -m benchmarks.db_connections [--ops 2000] [--concurrency 8]
+'''
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import aiosqlite
+
+from database.database import Database
+
+
+async def seed(db: Database, users: int):
+    for telegram_id in range(users):
+        await db.add_user(telegram_id, 'Имя', 'Отчество', 'Фамилия', '+70000000000', 0, 0)
+
+
+async def connect_per_call_get_user(db_path: str, telegram_id: int):
+    '''Повторяет прежнее поведение: новое соединение на каждый запрос.'''
+    async with aiosqlite.connect(db_path) as conn:
+        conn.row_factory = aiosqlite.Row
+        async with conn.execute('SELECT * FROM users WHERE telegram_id = ?;', (telegram_id,)) as cursor:
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+
+
+async def connect_per_call_add_message(db_path: str, user_id: int):
+    async with aiosqlite.connect(db_path) as conn:
+        await conn.execute(
+            'INSERT INTO messages (user_id, message, sender) VALUES (?, ?, ?);',
+            (user_id, 'Привет', 'user'),
+        )
+        await conn.commit()
+
+
+async def measure(name: str, ops: int, concurrency: int, make_call) -> float:
+    async def worker(offset: int):
+        for i in range(offset, ops, concurrency):
+            await make_call(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    rate = ops / elapsed
+    print(f'{name:<40} {ops:>7} ops  {elapsed:8.3f} s  {rate:10.1f} ops/s')
+    return rate
+
+
+async def main(ops: int, users: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.sqlite')
+        db = Database(db_path)
+        await db.connect()
+        await db.create_tables()
+        await seed(db, users)
+
+        baseline_read = await measure(
+            'get_user (connect per call)', ops, concurrency, lambda i: connect_per_call_get_user(db_path, i % users)
+        )
+        pooled_read = await measure(
+            'get_user (pool)', ops, concurrency, lambda i: db.get_user_by_telegram_id(i % users)
+        )
+
+        baseline_write = await measure(
+            'add_message (connect per call)',
+            ops,
+            concurrency,
+            lambda i: connect_per_call_add_message(db_path, i % users),
+        )
+        pooled_write = await measure(
+            'add_message (pool)', ops, concurrency, lambda i: db.add_message(i % users, 'Привет', 'user')
+        )
+
+        print(f'\nread speedup:  x{pooled_read / baseline_read:.2f}')
+        print(f'write speedup: x{pooled_write / baseline_write:.2f}')
+        await db.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ops', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.users, args.concurrency))
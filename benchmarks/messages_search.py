@@ -0,0 +1,110 @@
+'''
+Задержка полнотекстового поиска по сообщениям (FTS5) против LIKE-сканирования на синтетическом корпусе.
+
+Запуск:
+    python -m benchmarks.messages_search [--messages 1000000] [--queries 20]
+'''
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database.database import Database
+
+WORDS = (
+    'здравствуйте запись ботокс ботулинотерапия биоревитализация пилинг чистка лица массаж мезотерапия '
+    'коллагенотерапия губы консультация цена стоимость сколько стоит можно ли завтра сегодня вечером утром '
+    'свободное время мастер косметолог перенести отменить спасибо подскажите пожалуйста процедура курс '
+    'противопоказания результат эффект недели месяц скидка акция абонемент'
+).split()
+
+QUERIES = ['ботокс', 'биоревитализация цена', 'перенести запись', 'противопоказания', 'абонемент скидка']
+
+
+def make_vocabulary(rng: random.Random, size: int) -> list[str]:
+    '''Синтетический словарь «фоновых» слов: реальная переписка гораздо разнообразнее, чем WORDS.'''
+    syllables = 'ка ра ми но то ле ви са ду пе ро ли ма не ты зо бу хи ча ше'.split()
+    return [''.join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)]
+
+
+def make_message(rng: random.Random, vocabulary: list[str]) -> str:
+    words = rng.choices(vocabulary, k=rng.randint(4, 20))
+    # Предметные слова встречаются примерно в 2% сообщений, как редкие запросы поддержки.
+    if rng.random() < 0.02:
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return ' '.join(words)
+
+
+async def seed(db: Database, messages: int, users: int, batch: int = 50_000):
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng, 20_000)
+    started = datetime.utcnow() - timedelta(days=365)
+    for offset in range(0, messages, batch):
+        rows = [
+            (
+                rng.randrange(users),
+                make_message(rng, vocabulary),
+                rng.choice(('user', 'assistant')),
+                (started + timedelta(seconds=(offset + i) * 30)).isoformat(sep=' '),
+            )
+            for i in range(min(batch, messages - offset))
+        ]
+        async with db.pool.writer() as conn:
+            await conn.executemany(
+                'INSERT INTO messages (user_id, message, sender, created_at) VALUES (?, ?, ?, ?);',
+                rows,
+            )
+
+
+async def like_search(db: Database, query: str, limit: int) -> list:
+    conditions = ' AND '.join('message LIKE ?' for _ in query.split())
+    async with db.pool.reader() as conn:
+        async with conn.execute(
+            f'SELECT * FROM messages WHERE {conditions} ORDER BY created_at DESC LIMIT ?;',
+            [f'%{word}%' for word in query.split()] + [limit],
+        ) as cursor:
+            return await cursor.fetchall()
+
+
+async def measure(name: str, runs: int, call) -> list[float]:
+    timings = []
+    for i in range(runs):
+        query = QUERIES[i % len(QUERIES)]
+        started = time.perf_counter()
+        await call(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f'{name:<10} p50 {statistics.median(timings):9.2f} ms   p95 {p95:9.2f} ms')
+    return timings
+
+
+async def main(messages: int, users: int, runs: int, limit: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.sqlite'))
+        await db.connect()
+        await db.create_tables()
+
+        started = time.perf_counter()
+        await seed(db, messages, users)
+        print(f'seeded {messages} messages in {time.perf_counter() - started:.1f} s\n')
+
+        like = await measure('LIKE', runs, lambda q: like_search(db, q, limit))
+        fts = await measure('FTS5', runs, lambda q: db.search_messages(q, limit=limit))
+        print(f'\nmedian speedup: x{statistics.median(like) / statistics.median(fts):.1f}')
+        await db.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=5_000)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.users, args.queries, args.limit))
@@ -0,0 +1,94 @@
+'''
+Зеркало записей YClients: длительность полной и инкрементальной синхронизации с фейковым сервером
+и задержка чтения записей клиента из зеркала против запроса списка записей к API.
+
+Запуск:
+    python -m benchmarks.records_mirror [--records 5000] [--latency 0.1] [--reads 200] [--changed 50]
+'''
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database.database import Database
+from database.records_mirror import RecordsMirror
+from tests.fakes.yclients import FakeYClients, record
+from yclients import YClients, YClientsManager
+from yclients.services.records_service.models import GetRecordsQueryParams, GetRecordsRequest
+
+
+def percentiles(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0]
+    return f'p50 {statistics.median(samples) * 1000:8.2f} ms  p95 {p95 * 1000:8.2f} ms'
+
+
+async def main(records: int, latency: float, reads: int, changed: int):
+    server = FakeYClients(latency=latency)
+    # Записи изменялись раньше по одной в минуту: после полной синхронизации инкрементальная получает
+    # только записи, изменённые за `overlap` до последнего изменения.
+    server.records = {
+        i: record(i, changed=(datetime.now() - timedelta(hours=1, minutes=i)).isoformat(timespec='seconds'))
+        for i in range(1, records + 1)
+    }
+    await server.start()
+    yclients = YClients(YClientsManager(server.url, 'partner', 'user', '1', rate_limiter=None))
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, 'bot.db'))
+        await db.connect()
+        await db.create_tables()
+        mirror = RecordsMirror(db.pool, yclients.records)
+        try:
+            for label in ('full', 'incremental'):
+                server.hits.clear()
+                started = time.perf_counter()
+                result = await mirror.run_once()
+                print(
+                    f'{label:<12} sync  {result["fetched"]:>6} records  {result["removed"]:>5} removed  '
+                    f'{time.perf_counter() - started:7.2f} s  {sum(server.hits.values())} requests'
+                )
+
+            changed_at = datetime.now().isoformat(timespec='seconds')
+            for i in range(1, changed + 1):
+                server.records[i] = record(i, changed=changed_at)
+            server.hits.clear()
+            started = time.perf_counter()
+            result = await mirror.run_once()
+            print(
+                f'{"changes":<12} sync  {result["fetched"]:>6} records  {result["removed"]:>5} removed  '
+                f'{time.perf_counter() - started:7.2f} s  {sum(server.hits.values())} requests'
+            )
+
+            mirror_samples = []
+            for i in range(reads):
+                started = time.perf_counter()
+                await db.get_client_records(client_id=i % 500 + 1)
+                mirror_samples.append(time.perf_counter() - started)
+            print(f'\nmirror read  {percentiles(mirror_samples)}')
+
+            api_samples = []
+            for i in range(min(reads, 20)):
+                request = GetRecordsRequest(query=GetRecordsQueryParams(staff_id=i % 5 + 1, count=25))
+                started = time.perf_counter()
+                await yclients.records.get_records(request)
+                api_samples.append(time.perf_counter() - started)
+            print(f'api request  {percentiles(api_samples)}')
+            print(f'mirror lag   {await db.get_records_mirror_lag():.2f} s')
+        finally:
+            await db.close()
+            await yclients.close()
+            await server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--reads', type=int, default=200)
+    parser.add_argument('--changed', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.records, args.latency, args.reads, args.changed))
@@ -0,0 +1,133 @@
+'''
+Время до первого видимого текста ответа ассистента (p50/p95) с фейковыми сервером Assistants API и ботом:
+прежняя доставка целым сообщением после завершения запуска (с паузой 1 с перед запуском) и постепенная доставка
+правками сообщения-заглушки. Сервер отдаёт ответ длиной --reply-chars фрагментами по --chunk-size символов
+раз в --chunk-delay секунд. Кроме задержки выводится число запросов к Telegram на ответ и минимальный
+интервал между правками одного сообщения.
+
+Запуск:
+    python -m benchmarks.telegram_streaming [--replies 10] [--think 0.8] [--chunk-delay 0.05] [--edit-interval 1.0]
+'''
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from types import SimpleNamespace
+
+from openai import AsyncOpenAI
+
+from ai.manager import AssistantManager
+from benchmarks.assistant_runs import percentile
+from bot import messages
+from bot.utils.md_utils import markdown_to_telegram_html
+from bot.utils.streaming import StreamingReply
+from config.settings import settings
+from tests.fakes.openai import FakeOpenAI
+
+REPLY = (
+    '**Свободные даты** на чистку лица:\n\n'
+    '- 21 октября — `10:00`, `12:30`\n'
+    '- 22 октября — `15:00`\n'
+    '- 24 октября — _весь день_\n\n'
+    'Записать вас на одно из этих окон? Подробнее об услуге — [на сайте](https://example.com/services).\n\n'
+)
+
+
+class FakeBot:
+    '''Бот, запоминающий моменты запросов к Telegram.'''
+
+    def __init__(self):
+        self.requests = 0
+        self.first_text: float | None = None
+        self.edits: list[float] = []
+
+    def _seen(self, text: str):
+        self.requests += 1
+        if self.first_text is None and text != messages.REPLY_PLACEHOLDER:
+            self.first_text = time.perf_counter()
+
+    async def send_chat_action(self, chat_id: int, action: str):
+        self.requests += 1
+
+    async def send_message(self, chat_id: int, text: str, **kwargs):
+        self._seen(text)
+        return SimpleNamespace(message_id=1)
+
+    async def edit_message_text(self, text: str, chat_id: int, message_id: int, **kwargs):
+        self.edits.append(time.perf_counter())
+        self._seen(text)
+
+    async def delete_message(self, chat_id: int, message_id: int):
+        self.requests += 1
+
+
+def manager_for(client: AsyncOpenAI, user_id: int) -> AssistantManager:
+    manager = AssistantManager(None, None, user_id)
+    manager.client = client
+    manager.assistant_id = 'asst_fake'
+    manager.thread = SimpleNamespace(id=f'thread_{user_id}')
+    manager.thread_id = manager.thread.id
+    return manager
+
+
+async def buffered(client: AsyncOpenAI, bot: FakeBot, user_id: int):
+    manager = manager_for(client, user_id)
+    message = SimpleNamespace(chat=SimpleNamespace(id=user_id))
+    await bot.send_chat_action(user_id, 'typing')
+    await asyncio.sleep(1)
+    answer = await manager.add_message_to_thread_and_run('user', 'Когда можно записаться?', message, bot, None)
+    await bot.send_message(user_id, markdown_to_telegram_html(answer))
+
+
+async def streamed(client: AsyncOpenAI, bot: FakeBot, user_id: int):
+    manager = manager_for(client, user_id)
+    message = SimpleNamespace(chat=SimpleNamespace(id=user_id))
+    reply = StreamingReply(bot, user_id)  # type: ignore[arg-type]
+    await reply.start()
+    answer = await manager.add_message_to_thread_and_run(
+        'user', 'Когда можно записаться?', message, bot, None, on_delta=reply.feed
+    )
+    await reply.finish(answer)
+
+
+async def main(replies: int, think: float, reply_chars: int, chunk_size: int, chunk_delay: float):
+    settings.ASSISTANT_STREAMING = True
+    text = (REPLY * (reply_chars // len(REPLY) + 1))[:reply_chars]
+    server = FakeOpenAI(think=think, tool_rounds=0, reply=text, chunk_size=chunk_size, chunk_delay=chunk_delay)
+    await server.start()
+    client = AsyncOpenAI(base_url=server.url, api_key='fake', max_retries=0)
+    try:
+        for name, deliver in (('buffered', buffered), ('streamed', streamed)):
+            first, total, requests, gaps = [], [], 0, []
+            for i in range(replies):
+                bot = FakeBot()
+                started = time.perf_counter()
+                await deliver(client, bot, i + 1)
+                total.append(time.perf_counter() - started)
+                first.append(bot.first_text - started)  # type: ignore[operator]
+                requests += bot.requests
+                gaps.extend(b - a for a, b in zip(bot.edits, bot.edits[1:]))
+            print(
+                f'{name:<9} first text p50 {statistics.median(first):5.2f} s  p95 {percentile(first, 0.95):5.2f} s  '
+                f'full reply p50 {statistics.median(total):5.2f} s  {requests / replies:4.1f} Telegram req/reply  '
+                f'min edit gap {min(gaps) if gaps else float("nan"):4.2f} s'
+            )
+    finally:
+        await client.close()
+        await server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--replies', type=int, default=10)
+    parser.add_argument('--think', type=float, default=0.8)
+    parser.add_argument('--reply-chars', type=int, default=800)
+    parser.add_argument('--chunk-size', type=int, default=8)
+    parser.add_argument('--chunk-delay', type=float, default=0.05)
+    parser.add_argument('--edit-interval', type=float, default=1.0)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    settings.TELEGRAM_EDIT_INTERVAL = args.edit_interval
+    asyncio.run(main(args.replies, args.think, args.reply_chars, args.chunk_size, args.chunk_delay))
@@ -0,0 +1,74 @@
+'''
+Скорость импорта клиентов (строк в секунду): последовательная отправка порций с валидацией в цикле событий
+против конвейера с пулом процессов валидации и несколькими одновременными запросами. Фейковый сервер отвечает
+на массовое добавление с заданной задержкой; каждая 100-я строка отклоняется «API», каждая 250-я не проходит
+валидацию. Последний запуск повторяется с той же контрольной точкой — он не должен отправить ни одной строки.
+
+Запуск:
+    python -m benchmarks.yclients_client_import [--rows 20000] [--latency 0.2] [--concurrency 4] [--workers 2]
+'''
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+import orjson
+
+from tests.fakes.yclients import FakeYClients
+from yclients import YClients, YClientsManager
+from yclients.client_import import ClientImporter
+
+
+def write_source(path: str, rows: int):
+    with open(path, 'wb') as f:
+        for i in range(1, rows + 1):
+            client = {'name': f'Клиент {i}', 'phone': f'7900{i:07d}', 'email': f'client{i}@example.com'}
+            if i % 250 == 0:
+                del client['phone']
+            f.write(orjson.dumps(client) + b'\n')
+
+
+async def run(server: FakeYClients, directory: str, source: str, name: str, **options) -> dict:
+    server.hits.clear()
+    yclients = YClients(YClientsManager(server.url, 'partner', 'user', '1', rate_limiter=None))
+    importer = ClientImporter(
+        yclients.clients,
+        checkpoint_path=os.path.join(directory, f'{name}.checkpoint'),
+        retry_path=os.path.join(directory, f'{name}.retry.jsonl'),
+        **options,
+    )
+    try:
+        stats = await importer.run(source)
+    finally:
+        await yclients.close()
+    print(
+        f'{name:<12} {stats["rows"]:>7} rows  {stats["created"]:>7} created  {stats["failed"]:>5} failed  '
+        f'{stats["elapsed"]:7.2f} s  {stats["rows_per_sec"]:>9.1f} rows/s  {sum(server.hits.values())} requests'
+    )
+    return stats
+
+
+async def main(rows: int, latency: float, concurrency: int, workers: int):
+    server = FakeYClients(latency=latency)
+    await server.start()
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'clients.jsonl')
+        write_source(source, rows)
+        try:
+            baseline = await run(server, directory, source, 'sequential', concurrency=1, workers=0)
+            pipeline = await run(server, directory, source, 'pipeline', concurrency=concurrency, workers=workers)
+            await run(server, directory, source, 'pipeline', concurrency=concurrency, workers=workers)
+            print(f'\nspeedup: x{pipeline["rows_per_sec"] / baseline["rows_per_sec"]:.1f}')
+        finally:
+            await server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.latency, args.concurrency, args.workers))
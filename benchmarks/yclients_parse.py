@@ -0,0 +1,93 @@
+'''
+Разбор ответов YClients в модели: прежний путь (orjson.loads + Model(**dict)) против валидации
+напрямую из байтов тела (кэшированный TypeAdapter.validate_json).
+
+Тела ответов генерируются по схемам моделей visits_service и records_service; для каждой модели
+измеряются время разбора и выделенная память (tracemalloc).
+
+Запуск:
+    python -m benchmarks.yclients_parse [--items 50] [--runs 2000]
+'''
+
+import argparse
+import enum
+import time
+import tracemalloc
+import types
+import typing
+from datetime import date, datetime
+
+import orjson
+from pydantic import BaseModel
+
+from yclients.services.common.parsing import parse_response, response_adapter
+from yclients.services.records_service.models import GetPartnerRecordsResponse, GetRecordResponse, GetRecordsResponse
+from yclients.services.visits_service.models import GetVisitDetailsResponse, GetVisitResponse
+
+MODELS = [GetVisitResponse, GetVisitDetailsResponse, GetRecordResponse, GetRecordsResponse, GetPartnerRecordsResponse]
+
+
+def sample(annotation, items: int):
+    '''Строит JSON-совместимое значение, проходящее валидацию для аннотации.'''
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (typing.Union, types.UnionType):
+        return sample(next(arg for arg in args if arg is not type(None)), items)
+    if origin is typing.Literal:
+        return args[0]
+    if origin is list:
+        return [sample(args[0] if args else str, max(1, items // 10)) for _ in range(items)]
+    if origin is dict or annotation is dict:
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {field.alias or name: sample(field.annotation, items) for name, field in annotation.model_fields.items()}
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return next(iter(annotation)).value
+    if annotation is bool:
+        return True
+    if annotation is int:
+        return 12345
+    if annotation is float:
+        return 1500.5
+    if annotation is datetime:
+        return '2024-09-01T10:00:00+03:00'
+    if annotation is date:
+        return '2024-09-01'
+    if annotation is list:
+        return []
+    return 'Косметология, процедура'
+
+
+def measure(runs: int, call) -> tuple[float, int]:
+    started = time.perf_counter()
+    for _ in range(runs):
+        call()
+    elapsed_us = (time.perf_counter() - started) / runs * 1e6
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_us, peak
+
+
+def main(items: int, runs: int):
+    print(f'{"model":<28} {"bytes":>8} {"dict µs":>9} {"raw µs":>9} {"speedup":>8} {"dict KiB":>9} {"raw KiB":>8}')
+    for model in MODELS:
+        body = orjson.dumps(sample(model, items))
+        response_adapter(model).validate_json(body)  # прогрев: адаптер создаётся один раз на класс
+
+        dict_us, dict_peak = measure(runs, lambda: parse_response(model, orjson.loads(body)))
+        raw_us, raw_peak = measure(runs, lambda: parse_response(model, body))
+        print(
+            f'{model.__name__:<28} {len(body):>8} {dict_us:>9.1f} {raw_us:>9.1f} {dict_us / raw_us:>7.2f}x '
+            f'{dict_peak / 1024:>9.1f} {raw_peak / 1024:>8.1f}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=50, help='Размер списков в ответах')
+    parser.add_argument('--runs', type=int, default=2000)
+    args = parser.parse_args()
+    main(args.items, args.runs)
@@ -0,0 +1,62 @@
+'''
+Сколько запросов к API YClients экономит объединение одинаковых одновременных GET-запросов (single-flight).
+
+Каждый из пользователей одновременно открывает список услуг и даты для одного из нескольких мастеров
+(как при массовом открытии сценария записи). Фейковый сервер считает запросы, дошедшие до «API».
+
+Запуск:
+    python -m benchmarks.yclients_single_flight [--users 100] [--staff 5] [--latency 0.05]
+'''
+
+import argparse
+import asyncio
+import time
+
+from tests.fakes.yclients import FakeYClients
+from yclients import YClients, YClientsManager
+from yclients.services.online_bookings_service.models import (
+    BookableDatesQueryParams,
+    BookableDatesRequest,
+    BookableServicesRequest,
+)
+
+
+async def user_session(yclients: YClients, staff_id: int):
+    await yclients.online_bookings.get_bookable_services(BookableServicesRequest())
+    await yclients.online_bookings.get_bookable_dates(
+        BookableDatesRequest(query=BookableDatesQueryParams(staff_id=staff_id))
+    )
+
+
+async def run(server: FakeYClients, users: int, staff: int, coalesce: bool) -> int:
+    server.hits.clear()
+    manager = YClientsManager(server.url, 'partner', 'user', '1', coalesce_requests=coalesce)
+    yclients = YClients(manager)
+    started = time.perf_counter()
+    await asyncio.gather(*(user_session(yclients, user % staff) for user in range(users)))
+    elapsed = time.perf_counter() - started
+    upstream = sum(server.hits.values())
+    name = 'single-flight' if coalesce else 'no coalescing'
+    print(f'{name:<15} {users * 2:>5} calls  {upstream:>5} upstream  {elapsed:7.3f} s  {dict(server.hits)}')
+    await yclients.close()
+    return upstream
+
+
+async def main(users: int, staff: int, latency: float):
+    server = FakeYClients(latency=latency)
+    await server.start()
+    try:
+        baseline = await run(server, users, staff, coalesce=False)
+        coalesced = await run(server, users, staff, coalesce=True)
+        print(f'\nupstream calls saved: {baseline - coalesced} ({(baseline - coalesced) / baseline:.0%})')
+    finally:
+        await server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--staff', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.staff, args.latency))
@@ -0,0 +1,178 @@
+'''
+Свободные сеансы на услугу на 30 дней: локальный расчёт SlotEngine по графикам сотрудников против запроса
+get_bookable_times по каждому сотруднику и дню. Результаты сверяются между собой.
+
+По умолчанию данные генерирует фейковый сервер (случайные графики и записи, эталонный расчёт свободного
+времени по минутам). С --record ответы реального API (настройки из .env) сохраняются в файл: графики, услуги,
+сетка журнала и get_bookable_times по каждому набору услуг (--service-ids, можно несколько раз, ID через
+запятую). С --fixtures сверка выполняется по сохранённым ответам без сети; тот же формат проверяется
+в tests/test_slots.py.
+
+Запуск:
+    python -m benchmarks.yclients_slots [--staff 5] [--days 30] [--latency 0.1] [--seed 1]
+    python -m benchmarks.yclients_slots --record fixtures.json --service-ids 1 --service-ids 1,2 [--days 7]
+    python -m benchmarks.yclients_slots --fixtures fixtures.json
+'''
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import orjson
+
+from tests.fakes.yclients import FakeYClients, staff_schedule
+from yclients import YClients, YClientsManager
+from yclients.services.online_bookings_service.models import (
+    BookableTimesQueryParams,
+    BookableTimesRequest,
+    BookableTimesResponse,
+)
+from yclients.services.journal_service.models import (
+    JournalSeancesQueryParams,
+    JournalSeancesRequest,
+    JournalSeancesResponse,
+)
+from yclients.services.online_bookings_service.models._additional import StaffSeance
+from yclients.services.services_service.models import ServicesRequest, ServicesRequestQueryParams, ServicesResponse
+from yclients.services.staff_schedule_service.models import GetStaffScheduleRequest
+from yclients.services.staff_schedule_service.models.requests import GetStaffScheduleQueryParams
+from yclients.services.staff_schedule_service.models.responses import GetStaffScheduleResponse
+from yclients.slots import SlotEngine, compare_seances
+
+
+def report(local: list[StaffSeance], remote: list[StaffSeance]):
+    diff = compare_seances(local, remote)
+    print(f'seances: {len(local)} local, {len(remote)} api')
+    print(f'missing: {len(diff["missing"])} {diff["missing"][:5]}')
+    print(f'extra:   {len(diff["extra"])} {diff["extra"][:5]}')
+
+
+async def run_fake(staff: int, days: int, latency: float, seed: int):
+    rng = random.Random(seed)
+    server = FakeYClients(latency=latency)
+    period = [date.today() + timedelta(days=offset) for offset in range(days)]
+    server.schedules = {
+        (staff_id, day.isoformat()): staff_schedule(staff_id, day, rng)
+        for staff_id in range(1, staff + 1)
+        for day in period
+        if rng.random() > 0.2
+    }
+    server.service_lengths = {1: {staff_id: rng.choice([1800, 2700, 3600]) for staff_id in range(1, staff + 1)}}
+    await server.start()
+    yclients = YClients(YClientsManager(server.url, 'partner', 'user', '1', rate_limiter=None))
+    try:
+        server.hits.clear()
+        started = time.perf_counter()
+        remote = await yclients.online_bookings.get_bookable_times_range(
+            list(range(1, staff + 1)), period, service_ids=[1], concurrency=4
+        )
+        print(f'book_times fan-out  {time.perf_counter() - started:7.3f} s  {sum(server.hits.values())} requests')
+
+        server.hits.clear()
+        started = time.perf_counter()
+        local = await yclients.slots.free_slots([1], days=days)
+        print(f'slot engine (cold)  {time.perf_counter() - started:7.3f} s  {sum(server.hits.values())} requests')
+
+        server.hits.clear()
+        started = time.perf_counter()
+        await yclients.slots.free_slots([1], days=days)
+        print(f'slot engine (warm)  {time.perf_counter() - started:7.3f} s  {sum(server.hits.values())} requests\n')
+        report(local, remote)
+    finally:
+        await yclients.close()
+        await server.stop()
+
+
+async def record(path: str, service_groups: list[list[int]], days: int):
+    from yclients.utils import get_yclients
+
+    yclients = get_yclients()
+    start = date.today()
+    end = start + timedelta(days=days - 1)
+    try:
+        schedule = await yclients.staff_schedule.get_staff_schedule(
+            GetStaffScheduleRequest(
+                query=GetStaffScheduleQueryParams(
+                    start_date=start.isoformat(), end_date=end.isoformat(), include=['busy_intervals']
+                )
+            )
+        )
+        services = await yclients.services.get_services(ServicesRequest(query=ServicesRequestQueryParams()))
+        journal = {}
+        book_times: dict[str, dict] = {}
+        for item in schedule.data:
+            key = f'{item.staff_id}/{item.date.isoformat()}'
+            seances = await yclients.journal.get_journal_seances(
+                JournalSeancesRequest(query=JournalSeancesQueryParams(date=item.date, staff_id=item.staff_id)),
+                staff_id=item.staff_id,
+                date=item.date,
+            )
+            journal[key] = seances.model_dump(mode='json')
+            for service_ids in service_groups:
+                response = await yclients.online_bookings.get_bookable_times(
+                    staff_id=item.staff_id,
+                    date=item.date,
+                    request_model=BookableTimesRequest(query=BookableTimesQueryParams(service_ids=service_ids)),
+                )
+                group = ','.join(map(str, service_ids))
+                book_times.setdefault(group, {})[key] = response.model_dump(mode='json')
+    finally:
+        await yclients.close()
+    fixtures = {
+        'recorded_at': datetime.now().isoformat(),
+        'schedule': schedule.model_dump(mode='json'),
+        'services': services.model_dump(mode='json'),
+        'journal': journal,
+        'book_times': book_times,
+    }
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(fixtures))
+    print(f'recorded {len(schedule.data)} staff days to {path}')
+
+
+async def run_fixtures(path: str):
+    with open(path, 'rb') as f:
+        fixtures = orjson.loads(f.read())
+    engine = SlotEngine(None, None)  # type: ignore[arg-type]
+    engine.add_schedules(GetStaffScheduleResponse.model_validate(fixtures['schedule']).data)
+    engine.add_services(ServicesResponse.model_validate(fixtures['services']).data)
+    for key, payload in fixtures.get('journal', {}).items():
+        staff_id, day = key.split('/')
+        engine.set_journal(int(staff_id), date.fromisoformat(day), JournalSeancesResponse.model_validate(payload).data)
+    days = sorted({schedule['date'] for schedule in fixtures['schedule']['data']})
+    start = date.fromisoformat(days[0])
+    for group, responses in fixtures['book_times'].items():
+        remote = []
+        for key, payload in responses.items():
+            staff_id = int(key.split('/')[0])
+            response = BookableTimesResponse.model_validate(payload)
+            remote.extend(StaffSeance(**seance.model_dump(), staff_id=staff_id) for seance in response.data)
+        local = engine.compute(
+            [int(service_id) for service_id in group.split(',')],
+            start,
+            (date.fromisoformat(days[-1]) - start).days + 1,
+            now=datetime.fromisoformat(fixtures['recorded_at']),
+        )
+        print(f'services {group}')
+        report(local, remote)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--staff', type=int, default=5)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--record')
+    parser.add_argument('--fixtures')
+    parser.add_argument('--service-ids', action='append', default=[], help='ID услуг через запятую')
+    args = parser.parse_args()
+    if args.record:
+        service_groups = [[int(service_id) for service_id in group.split(',')] for group in args.service_ids]
+        asyncio.run(record(args.record, service_groups, args.days))
+    elif args.fixtures:
+        asyncio.run(run_fixtures(args.fixtures))
+    else:
+        asyncio.run(run_fake(args.staff, args.days, args.latency, args.seed))
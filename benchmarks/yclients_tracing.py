@@ -0,0 +1,87 @@
+'''
+Накладные расходы отладочного логирования на запрос к YClients при выключенном DEBUG.
+
+Сравниваются прежние f-строки (тело, параметры, ответ и repr модели форматируются всегда) и ленивая
+трассировка RequestTracer (форматирование только для записываемых событий).
+
+Запуск:
+    python -m benchmarks.yclients_tracing [--items 50] [--runs 2000]
+'''
+
+import argparse
+import logging
+import os
+import time
+
+import orjson
+
+from benchmarks.yclients_parse import sample
+from yclients.services.common.parsing import parse_response
+from yclients.services.records_service.models import GetRecordsResponse
+from yclients.tracing import RequestTracer
+
+logger = logging.getLogger('benchmarks.yclients_tracing')
+
+
+def eager_logging(method: str, url: str, body: dict, params: dict, response_data: dict, parsed):
+    '''Повторяет прежнее логирование запроса.'''
+    logger.debug(f'🏗️ Preparing request: {method} {url}\n' f'\tBody: {body}\n\tQuery Params: {params}')
+    logger.debug(f'Sending request: {method} {url}\nParams: {params}\nData: {body}')
+    logger.debug(f'Successful response [200]: {response_data}')
+    logger.debug(f'✅ Successful API response: {parsed}')
+
+
+def lazy_tracing(tracer: RequestTracer, method: str, url: str, body: dict, params: dict, response_data, parsed):
+    tracer.begin()
+    tracer.event('prepare', service='RecordsService', method=method, endpoint=url)
+    tracer.event('request', method=method, url=url, attempt=1, params=params, data=body)
+    tracer.event('response', method=method, url=url, status=200, elapsed_ms=1.0, body=response_data)
+    tracer.event('parsed', endpoint=url, model='GetRecordsResponse', response=parsed)
+
+
+def measure(name: str, runs: int, call) -> float:
+    started = time.process_time()
+    for _ in range(runs):
+        call()
+    per_call_us = (time.process_time() - started) / runs * 1e6
+    print(f'{name:<44} {per_call_us:10.1f} µs CPU / request')
+    return per_call_us
+
+
+def main(items: int, runs: int):
+    logging.basicConfig(level=logging.INFO)
+    response_data = sample(GetRecordsResponse, items)
+    raw = orjson.dumps(response_data)
+    parsed = parse_response(GetRecordsResponse, raw)
+    body = {'page': 1, 'count': items, 'start_date': '2024-09-01', 'end_date': '2024-09-30'}
+    params = {'staff_id': 3353649, 'service_ids': [1, 2, 3]}
+    url = 'https://api.yclients.com/api/v1/records/12345'
+    tracer = RequestTracer()
+
+    print(f'response body: {len(raw)} bytes, DEBUG off\n')
+    eager = measure(
+        'eager f-strings (before)', runs, lambda: eager_logging('GET', url, body, params, response_data, parsed)
+    )
+    lazy = measure('lazy tracing (after)', runs, lambda: lazy_tracing(tracer, 'GET', url, body, params, raw, parsed))
+    print(f'\nsaved per request: {eager - lazy:.1f} µs CPU (x{eager / max(lazy, 1e-9):.0f})')
+
+    # С включённым DEBUG записи форматируются в /dev/null: видно цену превью с ограничением размера.
+    trace_logger = logging.getLogger('yclients.trace')
+    trace_logger.setLevel(logging.DEBUG)
+    trace_logger.propagate = False
+    trace_logger.addHandler(logging.StreamHandler(open(os.devnull, 'w')))
+    sampled = RequestTracer(sample_rate=0.1)
+    print()
+    measure(
+        'lazy tracing, DEBUG on, 10% sampled',
+        runs,
+        lambda: lazy_tracing(sampled, 'GET', url, body, params, raw, parsed),
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=50, help='Количество записей в ответе')
+    parser.add_argument('--runs', type=int, default=2000)
+    args = parser.parse_args()
+    main(args.items, args.runs)
@@ -5,8 +5,10 @@ from aiogram.enums import ParseMode
 
 from bot.handlers import register_handlers
 from bot.middlewares import YClientsMiddleware, DbMiddleware
-from yclients import YClients, YClientsManager
+from yclients.utils import get_yclients
 from database import initialize_database
+from database.retention import MessageRetention
+from database.records_mirror import RecordsMirror
 
 from config import settings
 
@@ -38,16 +40,38 @@ async def create_bot_and_dispatcher():
     if not hasattr(settings, 'YCLIENTS_COMPANY_ID') or not settings.YCLIENTS_COMPANY_ID:
         raise ValueError('YCLIENTS_COMPANY_ID is not set in settings.')
 
-    yclients_manager = YClientsManager(
-        api_url=settings.YCLIENTS_API_URL,
-        partner_token=settings.YCLIENTS_PARTNER_TOKEN,
-        user_token=settings.YCLIENTS_USER_TOKEN,
-        company_id=settings.YCLIENTS_COMPANY_ID,
-    )
-
-    yclients = YClients(yclients_manager)
+    # Единственный на процесс клиент YClients: его получают все обработчики (через middleware)
+    # и AssistantManager, поэтому сессия aiohttp и пул соединений общие.
+    yclients = get_yclients()
+    yclients.availability.start()
+    dp.shutdown.register(yclients.availability.stop)
     db = await initialize_database()
 
+    retention = MessageRetention(
+        db.pool,
+        archive_dir=settings.MESSAGES_ARCHIVE_DIR,
+        retention_days=settings.MESSAGES_RETENTION_DAYS,
+        batch_size=settings.MESSAGES_ARCHIVE_BATCH_SIZE,
+        interval=settings.MESSAGES_MAINTENANCE_INTERVAL,
+        compression=settings.MESSAGES_ARCHIVE_COMPRESSION,
+    )
+    retention.start()
+    dp.shutdown.register(retention.stop)
+
+    if settings.RECORDS_MIRROR_INTERVAL > 0:
+        records_mirror = RecordsMirror(
+            db.pool,
+            yclients.records,
+            interval=settings.RECORDS_MIRROR_INTERVAL,
+            full_sync_interval=settings.RECORDS_MIRROR_FULL_SYNC_INTERVAL,
+            history_days=settings.RECORDS_MIRROR_HISTORY_DAYS,
+            horizon_days=settings.RECORDS_MIRROR_HORIZON_DAYS,
+        )
+        # Записи, созданные через бота, попадают в зеркало сразу, не дожидаясь интервала синхронизации.
+        yclients.online_bookings.add_booking_listener(records_mirror.request_sync)
+        records_mirror.start()
+        dp.shutdown.register(records_mirror.stop)
+
     dp.message.middleware(DbMiddleware(db))
     dp.callback_query.middleware(DbMiddleware(db))
     dp.message.middleware(YClientsMiddleware(yclients))
@@ -5,6 +5,7 @@ from .registration import register_registration_handlers
 from .menu import register_menu_handlers
 from .services import register_services_handlers
 from .booking import register_booking_handlers
+from .my_records import register_my_records_handlers
 from .contacts import register_contacts_handlers
 from .prices import register_prices_handlers
 from .faq import register_faq_handlers
@@ -17,6 +18,7 @@ def register_handlers(dp: Dispatcher):
     register_menu_handlers(dp)
     register_services_handlers(dp)
     register_booking_handlers(dp)
+    register_my_records_handlers(dp)
     register_contacts_handlers(dp)
     register_prices_handlers(dp)
     register_faq_handlers(dp)
@@ -15,10 +15,6 @@ from database.database import Database
 
 from yclients import YClients
 from yclients.services.online_bookings_service.models import (
-    BookableDatesQueryParams,
-    BookableDatesRequest,
-    BookableTimesQueryParams,
-    BookableTimesRequest,
     BookRecordRequestBody,
     BookRecordRequest,
 )
@@ -51,13 +47,8 @@ async def choose_service(
     service_id = int(callback_query.data.removeprefix('book_service_'))  # type: ignore
     await state.update_data(selected_service_id=service_id)
 
-    request_model = BookableDatesRequest(
-        query=BookableDatesQueryParams(service_ids=[service_id]),
-    )
-
-    dates_response = await yclients.online_bookings.get_bookable_dates(request_model=request_model)
-    if dates_response and dates_response.success:
-        dates = dates_response.data.booking_dates
+    dates = await yclients.availability.get_dates(service_ids=[service_id])
+    if dates is not None:
         if dates:
             await callback_query.message.edit_text(  # type: ignore
                 messages.CHOOSE_DATE,
@@ -98,17 +89,8 @@ async def choose_date(
     data = await state.get_data()
     service_id = data.get('selected_service_id')
 
-    request_model = BookableTimesRequest(
-        query=BookableTimesQueryParams(service_ids=[service_id]),  # type: ignore
-    )
-
-    times_response = await yclients.online_bookings.get_bookable_times(
-        staff_id=STAFF_ID,
-        date=date,
-        request_model=request_model,  # type: ignore
-    )
-    if times_response and times_response.success:
-        times = times_response.data
+    times = await yclients.availability.get_times(service_ids=[service_id], staff_id=STAFF_ID, day=date)
+    if times is not None:
         if times:
             keyboard = times_keyboard(times)
             await callback_query.message.edit_text(  # type: ignore
@@ -157,6 +139,7 @@ async def choose_time(
         service_id=data.get('selected_service_id'),
     )
     service_name = response.data['booking_title']  # type: ignore
+    await state.update_data(selected_service_name=service_name)
 
     await callback_query.message.edit_text(  # type: ignore
         messages.CONFIRMATION_TEXT.format(
@@ -191,11 +174,14 @@ async def confirm_booking_yes(
     data = await state.get_data()
     user_data = await db.get_user_by_telegram_id(callback_query.from_user.id)
 
-    service_response = await yclients.services.get_services(
-        ServicesRequest(query=ServicesRequestQueryParams()),
-        service_id=data.get('selected_service_id'),
-    )
-    service_name = service_response.data['booking_title']  # type: ignore
+    # Название услуги сохранено при выборе времени; запрос к API — только для состояний, начатых до этого.
+    service_name = data.get('selected_service_name')
+    if service_name is None:
+        service_response = await yclients.services.get_services(
+            ServicesRequest(query=ServicesRequestQueryParams()),
+            service_id=data.get('selected_service_id'),
+        )
+        service_name = service_response.data['booking_title']  # type: ignore
 
     if user_data:
         appointment = Appointment(
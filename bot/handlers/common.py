@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from aiogram import Dispatcher, Router, types, F
 from aiogram.filters import Command, StateFilter
@@ -7,7 +6,7 @@ from bot.keyboards.inline_keyboards import main_menu_keyboard
 from bot import messages
 from bot.states.states import RegistrationStates
 from bot.handlers.registration import start_registration
-from bot.utils.md_utils import markdown_to_telegram_html
+from bot.utils.streaming import StreamingReply
 from yclients import YClients
 from bot.bot import Bot
 from database import Database
@@ -51,8 +50,7 @@ async def format_text(message: types.Message):
 async def user_text(message: types.Message, state: FSMContext, db: Database, bot: Bot, yclients: YClients):
     user_data = await db.get_user_by_telegram_id(message.from_user.id)  # type: ignore
     if user_data:
-        await bot.send_chat_action(message.chat.id, 'typing')
-        await asyncio.sleep(1)
+        reply = StreamingReply(bot, message.chat.id)
 
         assistant = await ai_registry.get_manager(
             db=db,
@@ -66,17 +64,23 @@ async def user_text(message: types.Message, state: FSMContext, db: Database, bot
         await db.add_message(user_data['id'], content, 'user')  # type: ignore
 
         answer = await assistant.add_message_to_thread_and_run(
-            role='user', content=content, message=message, bot=bot, user_data=user_data
+            role='user',
+            content=content,
+            message=message,
+            bot=bot,
+            user_data=user_data,
+            on_delta=reply.feed,
+            on_start=reply.start,
         )
+        if answer is None:
+            # Сообщение объединено с другими, пришедшими во время ответа: на них ответит другой обработчик.
+            return
 
-        html_answer = markdown_to_telegram_html(answer)
+        html_answer = await reply.finish(answer)
 
-        await db.add_message(0, html_answer, 'assistant')
+        await db.add_message(user_data['id'], html_answer, 'assistant')
         logging.info(html_answer)
 
-        # await message.answer(html_answer, reply_markup=main_menu_keyboard())
-        await message.answer(html_answer)
-
     else:
         await start_registration(message, state)
 
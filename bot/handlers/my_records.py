@@ -0,0 +1,70 @@
+from datetime import datetime as dt
+
+from aiogram import Router, Dispatcher, types, F
+from bot.keyboards.inline_keyboards import back_to_home_keyboard
+from bot.utils.format import format_date
+from bot import messages
+from database import Database
+
+router = Router()
+
+
+def format_records(records: list[dict]) -> str:
+    '''Форматирует записи из зеркала записей YClients в текст сообщения.
+
+    Args:
+        records (list[dict]): Записи (см. `Database.get_client_records`).
+
+    Returns:
+        str: Текст со списком записей.
+    '''
+    lines = []
+    for record in records:
+        when = dt.fromisoformat(record['datetime'])
+        lines.append(
+            messages.MY_RECORD.format(
+                date=format_date(when.date()),
+                time=when.strftime('%H:%M'),
+                services=', '.join(service['title'] for service in record['services']) or '—',
+                staff=record['staff_name'] or '—',
+            )
+        )
+    return messages.MY_RECORDS_INTRO + '\n'.join(lines)
+
+
+@router.callback_query(
+    F.data == 'menu_my_records',
+)
+async def show_my_records(callback_query: types.CallbackQuery, db: Database):
+    '''Показывает предстоящие записи пользователя из локального зеркала записей YClients.
+
+    Args:
+        callback_query (types.CallbackQuery): Callback-запрос от пользователя.
+        db (Database): Экземпляр базы данных.
+    '''
+    user_data = await db.get_user_by_telegram_id(callback_query.from_user.id)
+    if not user_data:
+        text = messages.USER_NOT_FOUND
+    else:
+        records = await db.get_client_records(client_id=user_data['yclients_id'], phone=user_data['phone'])
+        if records:
+            text = format_records(records)
+        elif await db.get_records_mirror_lag() is None:
+            text = messages.RECORDS_UNAVAILABLE
+        else:
+            text = messages.NO_UPCOMING_RECORDS
+
+    await callback_query.message.edit_text(  # type: ignore
+        text,
+        reply_markup=back_to_home_keyboard(),
+    )
+    await callback_query.answer()
+
+
+def register_my_records_handlers(dp: Dispatcher):
+    '''Регистрирует обработчики раздела «Мои записи» в диспетчере.
+
+    Args:
+        dp (Dispatcher): Диспетчер для регистрации обработчиков.
+    '''
+    dp.include_router(router)
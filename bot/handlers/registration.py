@@ -20,7 +20,7 @@ from yclients.services.clients_service.models import (
     CreateClientRequest,
 )
 
-from ai.manager import AssistantManager
+from ai.registry import registry as ai_registry
 
 router = Router()
 
@@ -196,7 +196,7 @@ async def complete_registration(
         await state.clear()
         return
 
-    assistant = AssistantManager(
+    assistant = await ai_registry.get_manager(
         db=db,
         yclients=yclients,
         user_id=message.from_user.id,  # type: ignore
@@ -9,8 +9,6 @@ from bot.keyboards.inline_keyboards import (
 from bot.states.states import ServiceDescriptionStates, BookingStates
 
 from yclients import YClients
-from yclients.utils import get_manager
-from yclients.services.online_bookings_service import OnlineBookingsService
 from yclients.services.online_bookings_service.models import (
     BookableServicesQueryParams,
     BookableServicesRequest,
@@ -32,13 +30,11 @@ async def send_services_list(
         state (FSMContext): Контекст состояния FSM.
         yclients (YClients): Клиент API YClients.
     '''
-    service = OnlineBookingsService(get_manager())
-
     request_model = BookableServicesRequest(
         query=BookableServicesQueryParams(),
     )
 
-    services_response = await service.get_bookable_services(request_model=request_model)
+    services_response = await yclients.online_bookings.get_bookable_services(request_model=request_model)
 
     if services_response and services_response.success:
         services = services_response.data.services
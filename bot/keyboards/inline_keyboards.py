@@ -67,6 +67,7 @@ def main_menu_keyboard():
     '''
     builder = InlineKeyboardBuilder()
     builder.button(text='💆 Услуги', callback_data='menu_services')
+    builder.button(text='📅 Мои записи', callback_data='menu_my_records')
     builder.button(text='💲 Цены', callback_data='menu_prices')
     builder.button(text='❓ Вопросы-ответы', callback_data='menu_faq')
     builder.button(text='📞 Контакты', callback_data='menu_contacts')
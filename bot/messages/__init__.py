@@ -23,6 +23,10 @@ from .messages import (
     BOOKING_SUCCESS,
     BOOK_NOT_CREATED,
     BOOKING_CANCELLED,
+    MY_RECORDS_INTRO,
+    MY_RECORD,
+    NO_UPCOMING_RECORDS,
+    RECORDS_UNAVAILABLE,
     FAQ_INTRO,
     FAQ_QUESTION,
     FAQ_ANSWERS,
@@ -34,6 +38,7 @@ from .messages import (
     CONTACTS,
     USER_NOT_FOUND,
     UNKNOWN_COMMAND,
+    REPLY_PLACEHOLDER,
     FORMAT_TEXT,
 )
 
@@ -62,6 +67,10 @@ __all__ = [
     'BOOKING_SUCCESS',
     'BOOK_NOT_CREATED',
     'BOOKING_CANCELLED',
+    'MY_RECORDS_INTRO',
+    'MY_RECORD',
+    'NO_UPCOMING_RECORDS',
+    'RECORDS_UNAVAILABLE',
     'FAQ_INTRO',
     'FAQ_QUESTION',
     'FAQ_ANSWERS',
@@ -73,5 +82,6 @@ __all__ = [
     'CONTACTS',
     'USER_NOT_FOUND',
     'UNKNOWN_COMMAND',
+    'REPLY_PLACEHOLDER',
     'FORMAT_TEXT',
 ]
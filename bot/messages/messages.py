@@ -179,6 +179,16 @@ BOOK_NOT_CREATED = 'Не удалось создать запись. Попро
 BOOKING_CANCELLED = '❌ Запись отменена.'
 # endregion
 
+# region My records
+MY_RECORDS_INTRO = '📅 <b>Ваши предстоящие записи:</b>\n\n'
+
+MY_RECORD = '• <b>{date}</b> в <b>{time}</b> — {services}\n  Мастер: {staff}\n'
+
+NO_UPCOMING_RECORDS = 'У вас нет предстоящих записей. Записаться можно в разделе «Услуги». 💆'
+
+RECORDS_UNAVAILABLE = 'Список записей пока недоступен. Попробуйте чуть позже, пожалуйста. 🙏'
+# endregion
+
 # region FAQ
 FAQ_INTRO = '❓ <b>Часто задаваемые вопросы:</b>\n\n'
 
@@ -413,6 +423,8 @@ USER_NOT_FOUND = 'Пользователь не найден. Пожалуйст
 
 UNKNOWN_COMMAND = '❌ Команда не распознана. Попробуйте ещё раз, пожалуйста. 😊'
 
+REPLY_PLACEHOLDER = '✨ Думаю над ответом...'
+
 # region Development
 FORMAT_TEXT = (
     '<b>bold</b>, <strong>bold</strong>\n'
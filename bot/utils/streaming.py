@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import re
+from collections import Counter
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from ai.metrics import LatencyHistogram
+from bot import messages
+from bot.utils.md_utils import markdown_to_telegram_html
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Максимальная длина текста сообщения Telegram.
+MESSAGE_LIMIT = 4096
+
+_CODE_SPAN = re.compile(r'`[^`\n]*`')
+_BULLET = re.compile(r'^[ \t]*\* ', re.MULTILINE)
+_EMPHASIS = re.compile(r'\*\*|__|\*')
+_TRAILING_LINK = re.compile(r'!?\[[^\]\n]*(\]\([^)\n]*)?$')
+
+
+def close_markdown(text: str) -> str:
+    '''Закрывает незавершённую разметку в конце частичного Markdown-текста, чтобы он конвертировался так же,
+    как будет выглядеть законченный: незакрытые блок кода, код, жирный и курсив закрываются, недописанная
+    ссылка отбрасывается.
+
+    Args:
+        text (str): Частичный текст в формате Markdown.
+
+    Returns:
+        str: Текст с закрытой разметкой.
+    '''
+    if text.count('```') % 2:
+        return text + '\n```'
+    text = _TRAILING_LINK.sub('', text)
+    if text.count('`') % 2:
+        text += '`'
+
+    # Маркеры внутри кода и маркеры списков не открывают выделение; длина строки сохраняется.
+    plain = _CODE_SPAN.sub(lambda match: ' ' * len(match.group()), text)
+    plain = _BULLET.sub(lambda match: ' ' * len(match.group()), plain)
+    opened = []
+    for match in _EMPHASIS.finditer(plain):
+        if opened and opened[-1] == match.group():
+            opened.pop()
+        else:
+            opened.append(match.group())
+
+    text = text.rstrip()
+    # Маркер в самом конце ещё ничего не выделяет.
+    while opened and text.endswith(opened[-1]):
+        text = text[: -len(opened.pop())].rstrip()
+    return text + ''.join(reversed(opened))
+
+
+class MarkdownStream:
+    '''Накопитель частичного Markdown-текста. Завершённые блоки (до пустой строки вне блока кода)
+    конвертируются в HTML один раз, при каждом показе заново конвертируется только незавершённый хвост.
+
+    Attributes:
+        text (str): Накопленный текст.
+    '''
+
+    def __init__(self):
+        self.text = ''
+        self._done = 0
+        self._done_html: list[str] = []
+
+    def append(self, delta: str):
+        '''Добавляет фрагмент текста.
+
+        Args:
+            delta (str): Фрагмент текста.
+        '''
+        self.text += delta
+
+    def _block_end(self) -> int:
+        end = self.text.rfind('\n\n')
+        while end > self._done and self.text.count('```', 0, end) % 2:
+            end = self.text.rfind('\n\n', 0, end)
+        return end + 2 if end > self._done else self._done
+
+    def render(self) -> str:
+        '''Возвращает HTML для Telegram по накопленному тексту.
+
+        Returns:
+            str: HTML с закрытыми тегами.
+        '''
+        end = self._block_end()
+        if end > self._done:
+            block_html = markdown_to_telegram_html(self.text[self._done : end])
+            if block_html:
+                self._done_html.append(block_html)
+            self._done = end
+        tail_html = markdown_to_telegram_html(close_markdown(self.text[self._done :]))
+        if not tail_html:
+            return '\n\n'.join(self._done_html)
+        return '\n\n'.join([*self._done_html, tail_html])
+
+
+class DeliveryMetrics:
+    '''Метрики доставки ответов ассистента в Telegram.
+
+    Attributes:
+        first_token (LatencyHistogram): Время от получения сообщения пользователя до первого видимого текста ответа.
+        reply (LatencyHistogram): Время от получения сообщения пользователя до итоговой правки.
+        counters (Counter): Количество правок, пауз по RetryAfter и отправок без разметки.
+    '''
+
+    def __init__(self):
+        self.first_token = LatencyHistogram()
+        self.reply = LatencyHistogram()
+        self.counters: Counter = Counter()
+
+    def stats(self) -> dict:
+        '''Возвращает метрики доставки.
+
+        Returns:
+            dict: Гистограммы времени до первого текста и до итогового ответа и счётчики.
+        '''
+        return {
+            'first_token': self.first_token.snapshot(),
+            'reply': self.reply.snapshot(),
+            **self.counters,
+        }
+
+
+delivery_metrics = DeliveryMetrics()
+
+
+class StreamingReply:
+    '''Постепенная доставка ответа ассистента: сначала заглушка, затем правки сообщения по мере поступления
+    текста и итоговая правка.
+
+    Первая правка идёт сразу после первого фрагмента, следующие (включая итоговую) — не чаще раза
+    в TELEGRAM_EDIT_INTERVAL секунд: промежуточные фрагменты за это время объединяются в одну правку.
+    После TelegramRetryAfter промежуточные правки пропускаются до конца паузы. Промежуточный текст длиннее
+    лимита Telegram не показывается до итоговой правки.
+
+    Attributes:
+        bot (Bot): Экземпляр бота.
+        chat_id (int): Идентификатор чата.
+        started (float): Момент получения сообщения пользователя (loop.time()).
+        interval (float): Минимальный интервал между правками (сек).
+        message_id (int | None): Идентификатор сообщения с ответом.
+        edits (int): Количество выполненных правок.
+    '''
+
+    def __init__(self, bot: Bot, chat_id: int, started: float | None = None, interval: float | None = None):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.loop = asyncio.get_running_loop()
+        self.started = self.loop.time() if started is None else started
+        self.interval = settings.TELEGRAM_EDIT_INTERVAL if interval is None else interval
+        self.message_id: int | None = None
+        self.edits = 0
+        self.markdown = MarkdownStream()
+        self._source: str | None = None
+        self._shown = ''
+        self._first_token_seen = False
+        self._next_edit = 0.0
+        self._changed = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    async def start(self):
+        '''Отправляет заглушку и запускает фоновые правки.'''
+        try:
+            sent = await self.bot.send_message(self.chat_id, messages.REPLY_PLACEHOLDER)
+        except Exception as e:
+            logger.warning(f"Failed to send reply placeholder to chat {self.chat_id}: {str(e)}")
+            return
+        self.message_id = sent.message_id
+        self._flusher = asyncio.create_task(self._run())
+
+    def feed(self, message_id: str, delta: str):
+        '''Принимает фрагмент текста ответа. Фрагменты нового сообщения ассистента заменяют показанный текст.
+
+        Args:
+            message_id (str): Идентификатор сообщения ассистента.
+            delta (str): Фрагмент текста.
+        '''
+        if message_id != self._source:
+            self._source = message_id
+            self.markdown = MarkdownStream()
+        self.markdown.append(delta)
+        self._changed.set()
+
+    async def _run(self):
+        while True:
+            await self._changed.wait()
+            await asyncio.sleep(max(0.0, self._next_edit - self.loop.time()))
+            self._changed.clear()
+            await self._edit(self.markdown.render())
+
+    async def _edit(self, text: str, final: bool = False) -> bool:
+        if not text or text == self._shown:
+            return True
+        if len(text) > MESSAGE_LIMIT and not final:
+            return True
+        while True:
+            try:
+                await self.bot.edit_message_text(text, chat_id=self.chat_id, message_id=self.message_id)
+                break
+            except TelegramRetryAfter as e:
+                delivery_metrics.counters['retry_after'] += 1
+                if not final:
+                    self._next_edit = self.loop.time() + e.retry_after
+                    self._changed.set()
+                    return True
+                await asyncio.sleep(e.retry_after)
+            except TelegramBadRequest as e:
+                if 'message is not modified' in e.message:
+                    break
+                logger.warning(f"Failed to edit reply in chat {self.chat_id}: {e.message}")
+                return False
+        self._shown = text
+        self.edits += 1
+        delivery_metrics.counters['edits'] += 1
+        self._next_edit = self.loop.time() + self.interval
+        self._observe_first_token()
+        return True
+
+    def _observe_first_token(self):
+        if not self._first_token_seen:
+            self._first_token_seen = True
+            delivery_metrics.first_token.observe(self.loop.time() - self.started)
+
+    async def finish(self, answer: str) -> str:
+        '''Останавливает промежуточные правки и показывает итоговый ответ.
+
+        Если итоговый HTML не удалось показать правкой (слишком длинный или не разобран Telegram),
+        заглушка удаляется, а ответ отправляется без разметки, при необходимости несколькими сообщениями.
+
+        Args:
+            answer (str): Итоговый ответ ассистента в формате Markdown.
+
+        Returns:
+            str: Итоговый ответ в HTML для Telegram.
+        '''
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        html_answer = markdown_to_telegram_html(answer)
+        await asyncio.sleep(max(0.0, self._next_edit - self.loop.time()))
+        if self.message_id is None:
+            await self.bot.send_message(self.chat_id, html_answer)
+            self._observe_first_token()
+        elif not await self._edit(html_answer, final=True):
+            await self._send_plain(answer)
+        delivery_metrics.reply.observe(self.loop.time() - self.started)
+        return html_answer
+
+    async def _send_plain(self, text: str):
+        delivery_metrics.counters['plain_fallbacks'] += 1
+        try:
+            await self.bot.delete_message(self.chat_id, self.message_id)  # type: ignore
+        except TelegramBadRequest as e:
+            logger.warning(f"Failed to delete reply placeholder in chat {self.chat_id}: {e.message}")
+        for start in range(0, len(text), MESSAGE_LIMIT):
+            await self.bot.send_message(self.chat_id, text[start : start + MESSAGE_LIMIT], parse_mode=None)
+        self._observe_first_token()
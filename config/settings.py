@@ -6,13 +6,65 @@ load_dotenv()
 
 class Settings:
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+    TELEGRAM_EDIT_INTERVAL = float(os.getenv('TELEGRAM_EDIT_INTERVAL', '1.0'))
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     OPENAI_ASSISTANT_ID = os.getenv('OPENAI_ASSISTANT_ID')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL')
+    ASSISTANT_TOOL_CONCURRENCY = int(os.getenv('ASSISTANT_TOOL_CONCURRENCY', '4'))
+    ASSISTANT_TOOL_TIMEOUT = float(os.getenv('ASSISTANT_TOOL_TIMEOUT', '20'))
+    ASSISTANT_STREAMING = os.getenv('ASSISTANT_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+    ASSISTANT_RUN_DEADLINE = float(os.getenv('ASSISTANT_RUN_DEADLINE', '120'))
+    ASSISTANT_POLL_INITIAL = float(os.getenv('ASSISTANT_POLL_INITIAL', '0.2'))
+    ASSISTANT_POLL_MAX = float(os.getenv('ASSISTANT_POLL_MAX', '2'))
+    ASSISTANT_INBOX_SIZE = int(os.getenv('ASSISTANT_INBOX_SIZE', '10'))
     YCLIENTS_API_URL = os.getenv('YCLIENTS_API_URL')
     YCLIENTS_PARTNER_TOKEN = os.getenv('YCLIENTS_PARTNER_TOKEN')
     YCLIENTS_USER_TOKEN = os.getenv('YCLIENTS_USER_TOKEN')
     YCLIENTS_COMPANY_ID = os.getenv('YCLIENTS_COMPANY_ID')
+    YCLIENTS_CONNECTOR_LIMIT = int(os.getenv('YCLIENTS_CONNECTOR_LIMIT', '100'))
+    YCLIENTS_CONNECTOR_LIMIT_PER_HOST = int(os.getenv('YCLIENTS_CONNECTOR_LIMIT_PER_HOST', '30'))
+    YCLIENTS_KEEPALIVE_TIMEOUT = float(os.getenv('YCLIENTS_KEEPALIVE_TIMEOUT', '30'))
+    YCLIENTS_DNS_CACHE_TTL = int(os.getenv('YCLIENTS_DNS_CACHE_TTL', '300'))
+    YCLIENTS_RETRY_MAX_ATTEMPTS = int(os.getenv('YCLIENTS_RETRY_MAX_ATTEMPTS', '3'))
+    YCLIENTS_RETRY_BASE_DELAY = float(os.getenv('YCLIENTS_RETRY_BASE_DELAY', '0.2'))
+    YCLIENTS_RETRY_MAX_DELAY = float(os.getenv('YCLIENTS_RETRY_MAX_DELAY', '5'))
+    YCLIENTS_RETRY_DEADLINE = float(os.getenv('YCLIENTS_RETRY_DEADLINE', '15'))
+    YCLIENTS_RATE_LIMIT = float(os.getenv('YCLIENTS_RATE_LIMIT', '5'))
+    YCLIENTS_RATE_BURST = int(os.getenv('YCLIENTS_RATE_BURST', '10'))
+    YCLIENTS_RATE_MAX_WAIT = float(os.getenv('YCLIENTS_RATE_MAX_WAIT', '10'))
+    YCLIENTS_ENDPOINT_RATE_LIMITS = os.getenv('YCLIENTS_ENDPOINT_RATE_LIMITS', '')
+    YCLIENTS_CACHE_BACKEND = os.getenv('YCLIENTS_CACHE_BACKEND', 'memory')
+    YCLIENTS_CACHE_DIR = os.getenv('YCLIENTS_CACHE_DIR', 'cache/yclients')
+    YCLIENTS_CACHE_MAX_ENTRIES = int(os.getenv('YCLIENTS_CACHE_MAX_ENTRIES', '1024'))
+    YCLIENTS_CACHE_POLICIES = os.getenv(
+        'YCLIENTS_CACHE_POLICIES', '/book_services=3600:86400,/company/services=3600:86400'
+    )
+    YCLIENTS_TRACE_SAMPLE_RATE = float(os.getenv('YCLIENTS_TRACE_SAMPLE_RATE', '1.0'))
+    YCLIENTS_TRACE_PREVIEW_LIMIT = int(os.getenv('YCLIENTS_TRACE_PREVIEW_LIMIT', '500'))
+    YCLIENTS_IMPORT_BATCH_SIZE = int(os.getenv('YCLIENTS_IMPORT_BATCH_SIZE', '200'))
+    YCLIENTS_IMPORT_CONCURRENCY = int(os.getenv('YCLIENTS_IMPORT_CONCURRENCY', '2'))
+    YCLIENTS_IMPORT_WORKERS = int(os.getenv('YCLIENTS_IMPORT_WORKERS', '2'))
+    AVAILABILITY_WINDOW_DAYS = int(os.getenv('AVAILABILITY_WINDOW_DAYS', '14'))
+    AVAILABILITY_REFRESH_INTERVAL = float(os.getenv('AVAILABILITY_REFRESH_INTERVAL', '300'))
+    AVAILABILITY_MAX_AGE = float(os.getenv('AVAILABILITY_MAX_AGE', '600'))
+    AVAILABILITY_SLOT_STEP = int(os.getenv('AVAILABILITY_SLOT_STEP', '900'))
+    RECORDS_MIRROR_INTERVAL = float(os.getenv('RECORDS_MIRROR_INTERVAL', '60'))
+    RECORDS_MIRROR_FULL_SYNC_INTERVAL = float(os.getenv('RECORDS_MIRROR_FULL_SYNC_INTERVAL', '21600'))
+    RECORDS_MIRROR_HISTORY_DAYS = int(os.getenv('RECORDS_MIRROR_HISTORY_DAYS', '30'))
+    RECORDS_MIRROR_HORIZON_DAYS = int(os.getenv('RECORDS_MIRROR_HORIZON_DAYS', '90'))
+    DB_PATH = os.getenv('DB_PATH', 'db.sqlite')
+    DB_READ_POOL_SIZE = int(os.getenv('DB_READ_POOL_SIZE', '3'))
+    DB_MESSAGE_BATCH_SIZE = int(os.getenv('DB_MESSAGE_BATCH_SIZE', '100'))
+    DB_MESSAGE_FLUSH_INTERVAL = float(os.getenv('DB_MESSAGE_FLUSH_INTERVAL', '1.0'))
+    DB_MESSAGE_BUFFER_SIZE = int(os.getenv('DB_MESSAGE_BUFFER_SIZE', '1000'))
+    DB_MESSAGE_DURABILITY = os.getenv('DB_MESSAGE_DURABILITY', 'buffered')
+    DB_USER_CACHE_SIZE = int(os.getenv('DB_USER_CACHE_SIZE', '1024'))
+    DB_USER_CACHE_TTL = float(os.getenv('DB_USER_CACHE_TTL', '300'))
+    MESSAGES_RETENTION_DAYS = int(os.getenv('MESSAGES_RETENTION_DAYS', '90'))
+    MESSAGES_ARCHIVE_DIR = os.getenv('MESSAGES_ARCHIVE_DIR', 'archive')
+    MESSAGES_ARCHIVE_COMPRESSION = os.getenv('MESSAGES_ARCHIVE_COMPRESSION', 'gzip')
+    MESSAGES_ARCHIVE_BATCH_SIZE = int(os.getenv('MESSAGES_ARCHIVE_BATCH_SIZE', '500'))
+    MESSAGES_MAINTENANCE_INTERVAL = float(os.getenv('MESSAGES_MAINTENANCE_INTERVAL', '3600'))
 
 
 settings = Settings()
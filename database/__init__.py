@@ -1,8 +1,19 @@
 from database.database import Database
+from database.message_log import Durability
+from config import settings
 
 
 async def initialize_database():
-    db = Database(db_path='db.sqlite')
+    db = Database(
+        db_path=settings.DB_PATH,
+        read_pool_size=settings.DB_READ_POOL_SIZE,
+        message_batch_size=settings.DB_MESSAGE_BATCH_SIZE,
+        message_flush_interval=settings.DB_MESSAGE_FLUSH_INTERVAL,
+        message_buffer_size=settings.DB_MESSAGE_BUFFER_SIZE,
+        message_durability=Durability(settings.DB_MESSAGE_DURABILITY),
+        user_cache_size=settings.DB_USER_CACHE_SIZE,
+        user_cache_ttl=settings.DB_USER_CACHE_TTL,
+    )
     await db.connect()
     await db.create_tables()
     return db
@@ -1,6 +1,17 @@
-import aiosqlite
 from datetime import datetime
 import logging
+import re
+
+from database.pool import ConnectionPool
+from database.message_log import MessageLog, Durability
+from database.user_cache import UserCache
+from database.records_mirror import SYNC_STATE_NAME, normalize_phone
+from database.migrations import (
+    MIGRATIONS,
+    get_schema_version,
+    apply_migration,
+    explain_query_plan,
+)
 
 
 class Database:
@@ -8,63 +19,86 @@ class Database:
     Класс для работы с базой данных SQLite с использованием aiosqlite.
     '''
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        read_pool_size: int = 3,
+        message_batch_size: int = 100,
+        message_flush_interval: float = 1.0,
+        message_buffer_size: int = 1000,
+        message_durability: Durability = Durability.BUFFERED,
+        user_cache_size: int = 1024,
+        user_cache_ttl: float = 300.0,
+    ):
         '''
         Инициализирует класс Database с указанным путём к файлу базы данных.
 
         Args:
             db_path (str): Путь к файлу базы данных SQLite.
+            read_pool_size (int): Количество долгоживущих соединений на чтение.
+            message_batch_size (int): Размер пачки при записи сообщений.
+            message_flush_interval (float): Максимальный интервал (в секундах) между сбросами сообщений.
+            message_buffer_size (int): Ёмкость буфера сообщений, ожидающих записи.
+            message_durability (Durability): Режим надёжности журнала сообщений.
+            user_cache_size (int): Максимальное количество профилей в кэше пользователей.
+            user_cache_ttl (float): Время жизни профиля в кэше пользователей (в секундах).
         '''
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, readers=read_pool_size)
+        self.message_log = MessageLog(
+            self.pool,
+            batch_size=message_batch_size,
+            flush_interval=message_flush_interval,
+            max_buffer=message_buffer_size,
+            durability=message_durability,
+        )
+        self.user_cache = UserCache(max_size=user_cache_size, ttl=user_cache_ttl)
         self.logger = logging.getLogger(__name__)
 
     async def connect(self):
         '''
-        Метод-заглушка для соответствия интерфейсу. В текущей реализации не требуется.
+        Открывает пул долгоживущих соединений и применяет PRAGMA (WAL и др.).
         '''
+        await self.pool.open()
+        self.message_log.start()
         self.logger.info('Connected to the SQLite database.')
 
     async def close(self):
         '''
-        Метод-заглушка для соответствия интерфейсу. В текущей реализации не требуется.
+        Сбрасывает на диск буфер сообщений и закрывает все соединения с базой данных.
         '''
+        await self.message_log.stop()
+        await self.pool.close()
         self.logger.info('Database connection closed.')
 
     async def create_tables(self):
         '''
-        Создаёт таблицы `users` и `messages` в базе данных, если они не существуют.
-        '''
-        async with aiosqlite.connect(self.db_path) as conn:
-            await conn.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    telegram_id INTEGER UNIQUE NOT NULL,
-                    yclients_id INTEGER,
-                    thread_id INTEGER,
-                    name TEXT NOT NULL,
-                    patronymic TEXT,
-                    surname TEXT NOT NULL,
-                    phone TEXT NOT NULL,
-                    registered_at TIMESTAMP NOT NULL,
-                    last_active TIMESTAMP NOT NULL
-                );
-                '''
-            )
-            await conn.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    message TEXT NOT NULL,
-                    sender TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-                );
-                '''
-            )
-            await conn.commit()
-            self.logger.info('Database tables created or verified.')
+        Приводит схему базы данных к актуальной версии, последовательно применяя недостающие миграции.
+        '''
+        async with self.pool.writer() as conn:
+            version = await get_schema_version(conn)
+
+        for migration in MIGRATIONS:
+            if migration.version <= version:
+                continue
+            async with self.pool.writer() as conn:
+                await apply_migration(conn, migration)
+
+        self.logger.info('Database tables created or verified.')
+
+    async def explain(self, query: str, params: tuple = ()) -> list[str]:
+        '''
+        Возвращает план выполнения запроса (EXPLAIN QUERY PLAN).
+
+        Args:
+            query (str): SQL-запрос.
+            params (tuple): Параметры запроса.
+
+        Returns:
+            list[str]: Строки плана.
+        '''
+        async with self.pool.writer() as conn:
+            return await explain_query_plan(conn, query, params)
 
     async def add_user(
         self,
@@ -74,7 +108,7 @@ class Database:
         surname: str,
         phone: str,
         yclients_id: int,
-        thread_id: int,
+        thread_id: str,
     ):
         '''
         Добавляет нового пользователя в таблицу `users`.
@@ -86,10 +120,10 @@ class Database:
             surname (str): Фамилия пользователя.
             phone (str): Номер телефона пользователя.
             yclients_id (int): Идентификатор пользователя в системе YClients.
-            thread_id (int): Идентификатор потока для асинхронной обработки.
+            thread_id (str): Идентификатор потока (thread) ассистента OpenAI.
         '''
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
+            async with self.pool.writer() as conn:
                 await conn.execute(
                     '''
                     INSERT OR IGNORE INTO users (
@@ -110,14 +144,14 @@ class Database:
                         datetime.utcnow(),
                     ),
                 )
-                await conn.commit()
+            self.user_cache.invalidate(telegram_id)
             self.logger.info(f'User {telegram_id} added to the database.')
         except Exception as e:
             self.logger.error(f'Error adding user {telegram_id}: {e}')
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> dict | None:
         '''
-        Получает пользователя из базы данных по его Telegram ID.
+        Получает пользователя по его Telegram ID: сначала из кэша пользователей, затем из базы данных.
 
         Args:
             telegram_id (int): Идентификатор пользователя в Telegram.
@@ -125,9 +159,13 @@ class Database:
         Returns:
             dict | None: Словарь с данными пользователя или None, если пользователь не найден.
         '''
+        cached = self.user_cache.get(telegram_id)
+        if cached is not None:
+            return cached
+
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                conn.row_factory = aiosqlite.Row
+            token = self.user_cache.begin_read()
+            async with self.pool.reader() as conn:
                 async with conn.execute(
                     '''
                     SELECT * FROM users WHERE telegram_id = ?;
@@ -137,6 +175,7 @@ class Database:
                     user = await cursor.fetchone()
                     if user:
                         user_dict = dict(user)
+                        self.user_cache.put(telegram_id, user_dict, token)
                         self.logger.info(f'User {telegram_id} retrieved from the database.')
                         return user_dict
                     self.logger.warning(f'User {telegram_id} not found in the database.')
@@ -145,31 +184,31 @@ class Database:
             self.logger.error(f'Error retrieving user {telegram_id}: {e}')
             return None
 
-    async def update_user_thread_id(self, telegram_id: int, thread_id: int) -> bool:
+    async def update_user_thread_id(self, telegram_id: int, thread_id: str) -> bool:
         '''
         Обновляет `thread_id` для пользователя.
 
         Args:
             telegram_id (int): Идентификатор пользователя в Telegram.
-            thread_id (int): Новый идентификатор потока.
+            thread_id (str): Новый идентификатор потока.
 
         Returns:
             bool: True, если обновление прошло успешно, иначе False.
         '''
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
+            async with self.pool.writer() as conn:
                 result = await conn.execute(
                     '''
                     UPDATE users SET thread_id = ?, last_active = ? WHERE telegram_id = ?;
                     ''',
                     (thread_id, datetime.utcnow(), telegram_id),
                 )
-                await conn.commit()
-                if result.rowcount > 0:
-                    self.logger.info(f'User {telegram_id} thread_id updated to {thread_id}.')
-                    return True
-                self.logger.warning(f'User {telegram_id} thread_id update failed.')
-                return False
+            self.user_cache.invalidate(telegram_id)
+            if result.rowcount > 0:
+                self.logger.info(f'User {telegram_id} thread_id updated to {thread_id}.')
+                return True
+            self.logger.warning(f'User {telegram_id} thread_id update failed.')
+            return False
         except Exception as e:
             self.logger.error(f'Error updating thread_id for user {telegram_id}: {e}')
             return False
@@ -185,7 +224,7 @@ class Database:
             surname (str): Новая фамилия пользователя.
         '''
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
+            async with self.pool.writer() as conn:
                 await conn.execute(
                     '''
                     UPDATE users SET name = ?, patronymic = ?, surname = ?, last_active = ?
@@ -193,7 +232,7 @@ class Database:
                     ''',
                     (name, patronymic, surname, datetime.utcnow(), telegram_id),
                 )
-                await conn.commit()
+            self.user_cache.invalidate(telegram_id)
             self.logger.info(f'User {telegram_id} data updated.')
         except Exception as e:
             self.logger.error(f'Error updating data for user {telegram_id}: {e}')
@@ -207,21 +246,116 @@ class Database:
             phone (str): Новый номер телефона пользователя.
         '''
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
+            async with self.pool.writer() as conn:
                 await conn.execute(
                     '''
                     UPDATE users SET phone = ?, last_active = ? WHERE telegram_id = ?;
                     ''',
                     (phone, datetime.utcnow(), telegram_id),
                 )
-                await conn.commit()
+            self.user_cache.invalidate(telegram_id)
             self.logger.info(f'User {telegram_id} phone updated to {phone}.')
         except Exception as e:
             self.logger.error(f'Error updating phone for user {telegram_id}: {e}')
 
+    async def get_user_messages(self, user_id: int, limit: int = 20) -> list[dict]:
+        '''
+        Получает последние сообщения пользователя, от новых к старым.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            limit (int): Максимальное количество сообщений.
+
+        Returns:
+            list[dict]: Список сообщений.
+        '''
+        try:
+            async with self.pool.reader() as conn:
+                async with conn.execute(
+                    '''
+                    SELECT * FROM messages WHERE user_id = ? ORDER BY created_at DESC LIMIT ?;
+                    ''',
+                    (user_id, limit),
+                ) as cursor:
+                    return [dict(row) for row in await cursor.fetchall()]
+        except Exception as e:
+            self.logger.error(f'Error retrieving messages for user {user_id}: {e}')
+            return []
+
+    @staticmethod
+    def _fts_query(query: str) -> str | None:
+        '''
+        Преобразует произвольный текст в запрос FTS5: каждое слово ищется по префиксу, слова объединяются через AND.
+        Служебный синтаксис FTS5 из пользовательского ввода не интерпретируется.
+
+        Args:
+            query (str): Текст запроса.
+
+        Returns:
+            str | None: Запрос FTS5 или None, если в тексте нет слов.
+        '''
+        words = re.findall(r'\w+', query)
+        if not words:
+            return None
+        return ' '.join(f'"{word}"*' for word in words)
+
+    async def search_messages(
+        self,
+        query: str,
+        user_id: int | None = None,
+        since: datetime | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        '''
+        Полнотекстовый поиск по истории сообщений, отсортированный по релевантности (bm25).
+
+        Args:
+            query (str): Текст запроса.
+            user_id (int | None): Искать только в сообщениях этого пользователя.
+            since (datetime | None): Искать только в сообщениях не старше этой даты (UTC).
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            list[dict]: Найденные сообщения с полями `snippet` (фрагмент с подсветкой) и `rank`.
+        '''
+        fts_query = self._fts_query(query)
+        if fts_query is None:
+            return []
+
+        conditions = ['messages_fts MATCH ?']
+        params: list = [fts_query]
+        if user_id is not None:
+            conditions.append('m.user_id = ?')
+            params.append(user_id)
+        if since is not None:
+            conditions.append('m.created_at >= ?')
+            params.append(since.isoformat(sep=' '))
+        params.append(limit)
+
+        try:
+            async with self.pool.reader() as conn:
+                async with conn.execute(
+                    f'''
+                    SELECT
+                        m.id, m.user_id, m.message, m.sender, m.created_at,
+                        snippet(messages_fts, 0, '<b>', '</b>', '…', 12) AS snippet,
+                        bm25(messages_fts) AS rank
+                    FROM messages_fts
+                    JOIN messages AS m ON m.id = messages_fts.rowid
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY rank
+                    LIMIT ?;
+                    ''',
+                    params,
+                ) as cursor:
+                    return [dict(row) for row in await cursor.fetchall()]
+        except Exception as e:
+            self.logger.error(f'Error searching messages for {query!r}: {e}')
+            return []
+
     async def add_message(self, user_id: int, message: str, sender: str):
         '''
-        Добавляет сообщение в таблицу `messages`.
+        Добавляет сообщение в таблицу `messages` через журнал с отложенной пакетной записью.
 
         Args:
             user_id (int): Идентификатор пользователя.
@@ -229,15 +363,107 @@ class Database:
             sender (str): Отправитель сообщения.
         '''
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                await conn.execute(
-                    '''
-                    INSERT INTO messages (user_id, message, sender, created_at)
-                    VALUES (?, ?, ?, ?);
-                    ''',
-                    (user_id, message, sender, datetime.utcnow()),
-                )
-                await conn.commit()
-            self.logger.info(f'Message added for user {user_id}.')
+            await self.message_log.add(user_id, message, sender)
+            self.logger.debug(f'Message queued for user {user_id}.')
         except Exception as e:
             self.logger.error(f'Error adding message for user {user_id}: {e}')
+
+    async def flush_messages(self):
+        '''
+        Дожидается записи в базу всех сообщений, поставленных в очередь.
+        '''
+        await self.message_log.flush()
+
+    async def get_client_records(
+        self,
+        client_id: int | None = None,
+        phone: str | None = None,
+        since: datetime | None = None,
+        limit: int = 10,
+    ) -> list[dict]:
+        '''
+        Получает записи клиента из локального зеркала записей YClients (см. `RecordsMirror`), от ближайших
+        к дальним. Клиент ищется по ID в YClients, а если его нет — по номеру телефона.
+
+        Args:
+            client_id (int | None): Идентификатор клиента в YClients.
+            phone (str | None): Номер телефона клиента.
+            since (datetime | None): Только записи не раньше этого момента (местное время филиала).
+                По умолчанию - текущее время, то есть предстоящие записи.
+            limit (int): Максимальное количество записей.
+
+        Returns:
+            list[dict]: Записи с полями зеркала и списком услуг `services`.
+        '''
+        since = since or datetime.now()
+        try:
+            async with self.pool.reader() as conn:
+                client_ids = [client_id] if client_id else []
+                if not client_ids and normalize_phone(phone):
+                    async with conn.execute(
+                        'SELECT id FROM yclients_clients WHERE phone = ?;',
+                        (normalize_phone(phone),),
+                    ) as cursor:
+                        client_ids = [row[0] for row in await cursor.fetchall()]
+                if not client_ids:
+                    return []
+
+                async with conn.execute(
+                    f'''
+                    SELECT * FROM yclients_records
+                    WHERE client_id IN ({', '.join('?' * len(client_ids))}) AND datetime >= ? AND deleted = 0
+                    ORDER BY datetime LIMIT ?;
+                    ''',
+                    (*client_ids, since.isoformat(sep=' ', timespec='seconds'), limit),
+                ) as cursor:
+                    records = [dict(row) for row in await cursor.fetchall()]
+                if not records:
+                    return []
+
+                services: dict[int, list[dict]] = {record['id']: [] for record in records}
+                async with conn.execute(
+                    f'''
+                    SELECT * FROM yclients_record_services
+                    WHERE record_id IN ({', '.join('?' * len(records))});
+                    ''',
+                    list(services),
+                ) as cursor:
+                    for row in await cursor.fetchall():
+                        services[row['record_id']].append(dict(row))
+            for record in records:
+                record['services'] = services[record['id']]
+            return records
+        except Exception as e:
+            self.logger.error(f'Error retrieving mirrored records for client {client_id or phone}: {e}')
+            return []
+
+    async def get_records_mirror_lag(self) -> float | None:
+        '''
+        Возвращает отставание зеркала записей YClients: сколько секунд прошло с начала последней
+        успешной синхронизации.
+
+        Returns:
+            float | None: Отставание в секундах или None, если зеркало ещё не загружалось или произошла ошибка.
+        '''
+        try:
+            async with self.pool.reader() as conn:
+                async with conn.execute(
+                    'SELECT last_sync_at FROM yclients_sync_state WHERE name = ?;',
+                    (SYNC_STATE_NAME,),
+                ) as cursor:
+                    row = await cursor.fetchone()
+            if not row or not row[0]:
+                return None
+            return (datetime.utcnow() - datetime.fromisoformat(row[0])).total_seconds()
+        except Exception as e:
+            self.logger.error(f'Error retrieving records mirror lag: {e}')
+            return None
+
+    def user_cache_stats(self) -> dict[str, int | float]:
+        '''
+        Возвращает статистику кэша пользователей: сколько обращений к базе он сэкономил.
+
+        Returns:
+            dict[str, int | float]: Счётчики попаданий, промахов, вытеснений и инвалидаций.
+        '''
+        return self.user_cache.stats()
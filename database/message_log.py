@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from datetime import datetime
+from enum import Enum
+
+from database.pool import ConnectionPool
+
+
+class Durability(str, Enum):
+    '''
+    Режим надёжности журнала сообщений.
+
+    - BUFFERED: add() возвращается сразу после постановки в буфер; при падении процесса
+      может быть потеряно не более одного окна сброса.
+    - SYNC: add() ждёт фиксации пачки, в которую попало сообщение (групповой коммит).
+    '''
+
+    BUFFERED = 'buffered'
+    SYNC = 'sync'
+
+
+class MessageLog:
+    '''
+    Журнал сообщений с отложенной пакетной записью (write-behind) в таблицу `messages`.
+
+    Сообщения накапливаются в ограниченном буфере и записываются фоновой задачей через `executemany`
+    пачками по достижении `batch_size` или по истечении `flush_interval`. Когда буфер заполнен,
+    add() ожидает освобождения места (backpressure).
+    '''
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_buffer: int = 1000,
+        durability: Durability = Durability.BUFFERED,
+    ):
+        '''
+        Инициализирует журнал сообщений.
+
+        Args:
+            pool (ConnectionPool): Пул соединений с базой данных.
+            batch_size (int): Максимальный размер пачки для одной транзакции.
+            flush_interval (float): Максимальное время (в секундах) ожидания наполнения пачки.
+            max_buffer (int): Ёмкость буфера, при превышении которой add() ожидает.
+            durability (Durability): Режим надёжности.
+        '''
+        self.pool = pool
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.durability = Durability(durability)
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_buffer))
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        '''Запущена ли фоновая задача записи.'''
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        '''Количество сообщений и служебных меток в буфере.'''
+        return self._queue.qsize()
+
+    def start(self):
+        '''Запускает фоновую задачу записи.'''
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run(), name='message-log-writer')
+
+    async def stop(self):
+        '''Записывает всё накопленное в буфере и останавливает фоновую задачу.'''
+        if not self.is_running:
+            return
+        await self._queue.put(None)
+        await self._task  # type: ignore
+        self._task = None
+
+    async def add(self, user_id: int, message: str, sender: str):
+        '''
+        Ставит сообщение в очередь на запись.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            message (str): Текст сообщения.
+            sender (str): Отправитель сообщения.
+
+        Raises:
+            RuntimeError: Если журнал не запущен.
+            Exception: В режиме SYNC — ошибка записи пачки.
+        '''
+        if not self.is_running:
+            raise RuntimeError('Message log is not running.')
+
+        done = asyncio.get_running_loop().create_future() if self.durability is Durability.SYNC else None
+        await self._queue.put(((user_id, message, sender, datetime.utcnow()), done))
+        if done is not None:
+            await done
+
+    async def flush(self):
+        '''Дожидается записи всех сообщений, поставленных в очередь до вызова.'''
+        if not self.is_running:
+            return
+        marker = asyncio.get_running_loop().create_future()
+        await self._queue.put(marker)
+        await marker
+
+    async def _collect(self, first) -> tuple[list, list[asyncio.Future], bool]:
+        '''
+        Собирает пачку, начиная с первого полученного элемента очереди.
+
+        Args:
+            first: Первый элемент пачки.
+
+        Returns:
+            tuple: Строки для записи, фьючерсы ожидающих и признак остановки.
+        '''
+        rows: list = []
+        waiters: list[asyncio.Future] = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        item = first
+
+        while True:
+            if item is None:
+                return rows, waiters, True
+            if isinstance(item, asyncio.Future):
+                # Метка flush(): пишем то, что уже собрано, не дожидаясь окна.
+                waiters.append(item)
+                return rows, waiters, False
+
+            row, done = item
+            rows.append(row)
+            if done is not None:
+                waiters.append(done)
+            if len(rows) >= self.batch_size:
+                return rows, waiters, False
+
+            if self.durability is Durability.SYNC:
+                # Групповой коммит: забираем уже ожидающие сообщения, но не ждём новых.
+                if self._queue.empty():
+                    return rows, waiters, False
+                item = self._queue.get_nowait()
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return rows, waiters, False
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return rows, waiters, False
+
+    async def _write(self, rows: list):
+        '''
+        Записывает пачку сообщений одной транзакцией.
+
+        Args:
+            rows (list): Строки для вставки.
+        '''
+        async with self.pool.writer() as conn:
+            await conn.executemany(
+                '''
+                INSERT INTO messages (user_id, message, sender, created_at)
+                VALUES (?, ?, ?, ?);
+                ''',
+                rows,
+            )
+        self.logger.info(f'Flushed {len(rows)} messages to the database.')
+
+    async def _run(self):
+        '''Цикл фоновой записи.'''
+        stopping = False
+        while not stopping:
+            rows, waiters, stopping = await self._collect(await self._queue.get())
+            error: Exception | None = None
+            if rows:
+                try:
+                    await self._write(rows)
+                except Exception as e:
+                    error = e
+                    self.logger.error(f'Error flushing {len(rows)} messages: {e}')
+
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if error is not None:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(None)
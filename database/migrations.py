@@ -0,0 +1,296 @@
+import logging
+from datetime import datetime
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+
+class Migration:
+    '''
+    Шаг миграции схемы базы данных.
+
+    Attributes:
+        version (int): Номер версии схемы, к которой приводит шаг.
+        name (str): Краткое описание шага.
+        statements (list[str]): SQL-выражения, выполняемые в одной транзакции.
+        transactional (bool): Выполнять ли шаг в транзакции. False нужен для выражений вроде VACUUM,
+            которые SQLite не разрешает выполнять внутри транзакции.
+    '''
+
+    def __init__(self, version: int, name: str, statements: list[str], transactional: bool = True):
+        self.version = version
+        self.name = name
+        self.statements = statements
+        self.transactional = transactional
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(
+        version=1,
+        name='initial schema',
+        statements=[
+            '''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                telegram_id INTEGER UNIQUE NOT NULL,
+                yclients_id INTEGER,
+                thread_id INTEGER,
+                name TEXT NOT NULL,
+                patronymic TEXT,
+                surname TEXT NOT NULL,
+                phone TEXT NOT NULL,
+                registered_at TIMESTAMP NOT NULL,
+                last_active TIMESTAMP NOT NULL
+            );
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                sender TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+            );
+            ''',
+        ],
+    ),
+    Migration(
+        version=2,
+        name='users.thread_id stores OpenAI thread ids as TEXT',
+        statements=[
+            '''
+            CREATE TABLE users_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                telegram_id INTEGER UNIQUE NOT NULL,
+                yclients_id INTEGER,
+                thread_id TEXT,
+                name TEXT NOT NULL,
+                patronymic TEXT,
+                surname TEXT NOT NULL,
+                phone TEXT NOT NULL,
+                registered_at TIMESTAMP NOT NULL,
+                last_active TIMESTAMP NOT NULL
+            );
+            ''',
+            '''
+            INSERT INTO users_new (
+                id, telegram_id, yclients_id, thread_id,
+                name, patronymic, surname, phone, registered_at, last_active
+            )
+            SELECT
+                id, telegram_id, yclients_id, NULLIF(CAST(thread_id AS TEXT), '0'),
+                name, patronymic, surname, phone, registered_at, last_active
+            FROM users;
+            ''',
+            'DROP TABLE users;',
+            'ALTER TABLE users_new RENAME TO users;',
+        ],
+    ),
+    Migration(
+        version=3,
+        name='messages indexes for history lookups and retention',
+        statements=[
+            'CREATE INDEX IF NOT EXISTS idx_messages_user_id_created_at ON messages (user_id, created_at);',
+            'CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages (created_at);',
+        ],
+    ),
+    Migration(
+        version=4,
+        name='incremental auto_vacuum for messages retention',
+        statements=[
+            'PRAGMA auto_vacuum = INCREMENTAL;',
+            'VACUUM;',
+        ],
+        transactional=False,
+    ),
+    Migration(
+        version=5,
+        name='full-text search over messages (FTS5)',
+        statements=[
+            '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                message,
+                content='messages',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            );
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts (rowid, message) VALUES (new.id, new.message);
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF message ON messages BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, message) VALUES ('delete', old.id, old.message);
+                INSERT INTO messages_fts (rowid, message) VALUES (new.id, new.message);
+            END;
+            ''',
+            "INSERT INTO messages_fts (messages_fts) VALUES ('rebuild');",
+        ],
+    ),
+    Migration(
+        version=6,
+        name='local mirror of YClients records',
+        statements=[
+            '''
+            CREATE TABLE IF NOT EXISTS yclients_records (
+                id INTEGER PRIMARY KEY,
+                company_id INTEGER NOT NULL,
+                staff_id INTEGER NOT NULL,
+                staff_name TEXT,
+                client_id INTEGER,
+                datetime TEXT NOT NULL,
+                seance_length INTEGER,
+                attendance INTEGER,
+                confirmed INTEGER,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                comment TEXT,
+                last_change_date TEXT,
+                generation INTEGER NOT NULL,
+                synced_at TIMESTAMP NOT NULL
+            );
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS yclients_record_services (
+                record_id INTEGER NOT NULL,
+                service_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                cost REAL NOT NULL,
+                amount INTEGER,
+                PRIMARY KEY (record_id, service_id)
+            ) WITHOUT ROWID;
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS yclients_clients (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                surname TEXT,
+                patronymic TEXT,
+                phone TEXT,
+                email TEXT,
+                synced_at TIMESTAMP NOT NULL
+            );
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS yclients_sync_state (
+                name TEXT PRIMARY KEY,
+                cursor TEXT,
+                generation INTEGER NOT NULL DEFAULT 0,
+                last_sync_at TEXT,
+                last_full_sync_at TEXT
+            );
+            ''',
+            'CREATE INDEX IF NOT EXISTS idx_yclients_records_client_datetime ON yclients_records (client_id, datetime);',
+            'CREATE INDEX IF NOT EXISTS idx_yclients_records_staff_datetime ON yclients_records (staff_id, datetime);',
+            'CREATE INDEX IF NOT EXISTS idx_yclients_records_datetime ON yclients_records (datetime);',
+            'CREATE INDEX IF NOT EXISTS idx_yclients_clients_phone ON yclients_clients (phone);',
+        ],
+    ),
+]
+
+
+# Запросы горячего пути и параметры для EXPLAIN QUERY PLAN. Ни один из них не должен сканировать таблицу целиком.
+HOT_QUERIES: dict[str, tuple[str, tuple]] = {
+    'get_user_by_telegram_id': ('SELECT * FROM users WHERE telegram_id = ?;', (0,)),
+    'get_user_messages': (
+        'SELECT * FROM messages WHERE user_id = ? ORDER BY created_at DESC LIMIT ?;',
+        (0, 1),
+    ),
+    'messages_older_than': ('SELECT id FROM messages WHERE created_at < ? ORDER BY created_at LIMIT ?;', ('', 1)),
+    'get_client_records': (
+        '''
+        SELECT * FROM yclients_records
+        WHERE client_id IN (?) AND datetime >= ? AND deleted = 0
+        ORDER BY datetime LIMIT ?;
+        ''',
+        (0, '', 1),
+    ),
+    'get_clients_by_phone': ('SELECT id FROM yclients_clients WHERE phone = ?;', ('',)),
+}
+
+
+async def get_schema_version(conn: aiosqlite.Connection) -> int:
+    '''
+    Возвращает текущую версию схемы.
+
+    Args:
+        conn (aiosqlite.Connection): Соединение с базой данных.
+
+    Returns:
+        int: Номер последней применённой миграции или 0.
+    '''
+    await conn.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL
+        );
+        '''
+    )
+    async with conn.execute('SELECT MAX(version) FROM schema_version;') as cursor:
+        row = await cursor.fetchone()
+    return row[0] or 0  # type: ignore
+
+
+async def apply_migration(conn: aiosqlite.Connection, migration: Migration):
+    '''
+    Выполняет шаг миграции и записывает его в `schema_version`. Фиксация транзакции — на вызывающей стороне.
+
+    Args:
+        conn (aiosqlite.Connection): Соединение с базой данных.
+        migration (Migration): Шаг миграции.
+    '''
+    # Модуль sqlite3 не открывает транзакцию перед DDL, поэтому открываем её явно, чтобы шаг был атомарным.
+    if migration.transactional and not conn.in_transaction:
+        await conn.execute('BEGIN;')
+    for statement in migration.statements:
+        await conn.execute(statement)
+    await conn.execute(
+        'INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?);',
+        (migration.version, migration.name, datetime.utcnow()),
+    )
+    logger.info(f'Applied migration {migration.version}: {migration.name}.')
+
+
+async def explain_query_plan(conn: aiosqlite.Connection, query: str, params: tuple = ()) -> list[str]:
+    '''
+    Возвращает план выполнения запроса.
+
+    Args:
+        conn (aiosqlite.Connection): Соединение с базой данных.
+        query (str): SQL-запрос.
+        params (tuple): Параметры запроса.
+
+    Returns:
+        list[str]: Строки плана (поле `detail` из EXPLAIN QUERY PLAN).
+    '''
+    async with conn.execute(f'EXPLAIN QUERY PLAN {query}', params) as cursor:
+        return [row[3] for row in await cursor.fetchall()]
+
+
+async def check_query_plans(conn: aiosqlite.Connection) -> dict[str, list[str]]:
+    '''
+    Проверяет, что запросы горячего пути используют индексы, а не полный просмотр таблиц
+    или временное B-дерево для сортировки.
+
+    Args:
+        conn (aiosqlite.Connection): Соединение с базой данных.
+
+    Returns:
+        dict[str, list[str]]: Планы запросов, не прошедших проверку (пустой словарь, если всё в порядке).
+    '''
+    regressions = {}
+    for name, (query, params) in HOT_QUERIES.items():
+        plan = await explain_query_plan(conn, query, params)
+        if any(detail.startswith('SCAN') or 'TEMP B-TREE' in detail for detail in plan):
+            regressions[name] = plan
+    return regressions
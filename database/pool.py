@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import aiosqlite
+
+DEFAULT_PRAGMAS: dict[str, str | int] = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -8000,
+    'temp_store': 'MEMORY',
+}
+
+
+class ConnectionPool:
+    '''
+    Пул долгоживущих соединений aiosqlite: несколько соединений на чтение и одно сериализованное на запись.
+
+    SQLite допускает только одного писателя одновременно, поэтому все операции записи проходят через
+    единственное соединение под asyncio.Lock. Чтение в режиме WAL не блокируется писателем и
+    распределяется по небольшому пулу соединений.
+
+    При закрытии пула свободные соединения на чтение закрываются сразу, а выданные — при возврате: каждое
+    закрытие увеличивает поколение пула, и соединение прошлого поколения в очередь не возвращается.
+    Ожидающие соединения на чтение получают RuntimeError.
+    '''
+
+    def __init__(self, db_path: str, readers: int = 3, pragmas: dict[str, str | int] | None = None):
+        '''
+        Инициализирует пул соединений.
+
+        Args:
+            db_path (str): Путь к файлу базы данных SQLite.
+            readers (int): Количество соединений на чтение.
+            pragmas (dict[str, str | int] | None): PRAGMA, применяемые к каждому соединению при открытии.
+        '''
+        self.db_path = db_path
+        self.readers_count = max(1, readers)
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self.logger = logging.getLogger(__name__)
+
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        # None в очереди — признак закрытого пула для ожидающих соединения.
+        self._readers: asyncio.Queue[aiosqlite.Connection | None] = asyncio.Queue()
+        self._generation = 0
+
+    @property
+    def is_open(self) -> bool:
+        '''Открыт ли пул.'''
+        return self._writer is not None
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        '''
+        Открывает соединение и применяет к нему PRAGMA.
+
+        Returns:
+            aiosqlite.Connection: Открытое соединение.
+        '''
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        for name, value in self.pragmas.items():
+            await conn.execute(f'PRAGMA {name} = {value};')
+        return conn
+
+    async def open(self):
+        '''Открывает соединение на запись и пул соединений на чтение.'''
+        if self.is_open:
+            return
+
+        # Писатель открывается первым: именно он переводит файл базы в режим WAL.
+        self._writer = await self._open_connection()
+        while not self._readers.empty():
+            self._readers.get_nowait()
+        for _ in range(self.readers_count):
+            self._readers.put_nowait(await self._open_connection())
+        self.logger.info(f'SQLite pool opened: 1 writer, {self.readers_count} readers ({self.db_path}).')
+
+    async def close(self):
+        '''Закрывает соединение на запись и свободные соединения на чтение; выданные закрываются при возврате.'''
+        if not self.is_open:
+            return
+
+        async with self._write_lock:
+            self._generation += 1
+            while not self._readers.empty():
+                conn = self._readers.get_nowait()
+                if conn is not None:
+                    await conn.close()
+            self._readers.put_nowait(None)
+
+            await self._writer.close()  # type: ignore
+            self._writer = None
+        self.logger.info('SQLite pool closed.')
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        '''
+        Выдаёт соединение на чтение из пула и возвращает его обратно после использования. Соединение,
+        возвращённое после закрытия пула, закрывается.
+
+        Yields:
+            aiosqlite.Connection: Соединение на чтение.
+
+        Raises:
+            RuntimeError: Если пул не открыт или закрыт во время ожидания соединения.
+        '''
+        if not self.is_open:
+            raise RuntimeError('Connection pool is not open.')
+
+        conn = await self._readers.get()
+        if conn is None:
+            # Признак закрытия остаётся в очереди для остальных ожидающих.
+            self._readers.put_nowait(None)
+            raise RuntimeError('Connection pool is closed.')
+        generation = self._generation
+        try:
+            yield conn
+        finally:
+            if generation == self._generation:
+                self._readers.put_nowait(conn)
+            else:
+                await conn.close()
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        '''
+        Выдаёт единственное соединение на запись. Транзакция фиксируется при выходе из блока
+        и откатывается при исключении.
+
+        Yields:
+            aiosqlite.Connection: Соединение на запись.
+        '''
+        if not self.is_open:
+            raise RuntimeError('Connection pool is not open.')
+
+        async with self._write_lock:
+            conn = self._writer
+            try:
+                yield conn  # type: ignore
+                await conn.commit()  # type: ignore
+            except BaseException:
+                await conn.rollback()  # type: ignore
+                raise
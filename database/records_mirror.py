@@ -0,0 +1,415 @@
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as t
+
+from database.pool import ConnectionPool
+from yclients.services.records_service import RecordsService
+from yclients.services.records_service.models import GetRecordsQueryParams, GetRecordsRequest
+from yclients.services.records_service.models._additional import Record
+
+SYNC_STATE_NAME = 'records'
+
+
+def normalize_phone(phone: str | None) -> str | None:
+    '''
+    Приводит номер телефона к виду для поиска в зеркале: только цифры, российские номера — с 7 в начале.
+
+    Args:
+        phone (str | None): Номер телефона в произвольном формате.
+
+    Returns:
+        str | None: Нормализованный номер или None.
+    '''
+    if not phone:
+        return None
+    digits = re.sub(r'\D', '', phone)
+    if len(digits) == 11 and digits.startswith('8'):
+        digits = '7' + digits[1:]
+    return digits or None
+
+
+def record_datetime(record: Record) -> str:
+    '''
+    Возвращает время записи для хранения в зеркале: местное время филиала без часового пояса в формате ISO,
+    чтобы строки сравнивались и сортировались как время.
+
+    Args:
+        record (Record): Запись YClients.
+
+    Returns:
+        str: Время записи ('YYYY-MM-DD HH:MM:SS').
+    '''
+    when = record.datetime or datetime.combine(record.date, t())
+    return when.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
+
+
+class RecordsMirror:
+    '''
+    Фоновая синхронизация локального зеркала записей YClients в SQLite.
+
+    Зеркало — таблицы `yclients_records`, `yclients_record_services` и `yclients_clients`. Первая синхронизация
+    (и далее раз в `full_sync_interval`) — полная: все записи в окне от `history_days` дней назад
+    до `horizon_days` дней вперёд загружаются постранично, а записи окна, которых не оказалось в ответе
+    (удалённые в YClients), удаляются из зеркала. Между полными синхронизациями каждые `interval` секунд
+    запрашиваются только записи, изменённые после курсора (с запасом `overlap`). Курсор — наибольшее
+    `last_change_date` среди полученных записей, то есть время по часам YClients, а не по часам бота.
+    Записи сохраняются пачками через upsert, писатель между пачками освобождается.
+
+    Чтение зеркала — методы `Database.get_client_records` и `Database.get_records_mirror_lag`.
+    '''
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        records: RecordsService,
+        interval: float = 60.0,
+        full_sync_interval: float = 21600.0,
+        history_days: int = 30,
+        horizon_days: int = 90,
+        overlap: float = 300.0,
+        page_size: int = 200,
+    ):
+        '''
+        Инициализирует синхронизацию.
+
+        Args:
+            pool (ConnectionPool): Пул соединений с базой данных.
+            records (RecordsService): Сервис записей YClients.
+            interval (float): Интервал между инкрементальными синхронизациями (в секундах).
+            full_sync_interval (float): Интервал между полными синхронизациями (в секундах).
+            history_days (int): Сколько дней прошлых записей хранить в зеркале.
+            horizon_days (int): На сколько дней вперёд хранить записи в зеркале.
+            overlap (float): Запас по времени изменения при инкрементальной синхронизации (в секундах).
+            page_size (int): Размер страницы API и пачки записи в базу.
+        '''
+        self.pool = pool
+        self.records = records
+        self.interval = interval
+        self.full_sync_interval = full_sync_interval
+        self.history_days = history_days
+        self.horizon_days = horizon_days
+        self.overlap = overlap
+        self.page_size = max(1, page_size)
+        self.logger = logging.getLogger(__name__)
+
+        self._stats: Counter = Counter()
+        self._last_sync_at: datetime | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        '''Запускает периодическую синхронизацию в фоне.'''
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='records-mirror')
+
+    async def stop(self):
+        '''Останавливает фоновую синхронизацию.'''
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def request_sync(self, *_):
+        '''
+        Запрашивает внеочередную инкрементальную синхронизацию. Подходит как обработчик
+        `OnlineBookingsService.add_booking_listener`: новая запись попадает в зеркало, не дожидаясь интервала.
+        '''
+        self._wakeup.set()
+
+    async def _run(self):
+        '''Цикл периодической синхронизации.'''
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._stats['errors'] += 1
+                self.logger.error(f'Error syncing records mirror: {e}')
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _load_state(self) -> dict | None:
+        '''Возвращает состояние синхронизации или None, если зеркало ещё не загружалось.'''
+        async with self.pool.reader() as conn:
+            async with conn.execute(
+                'SELECT * FROM yclients_sync_state WHERE name = ?;',
+                (SYNC_STATE_NAME,),
+            ) as cursor:
+                row = await cursor.fetchone()
+        return dict(row) if row else None
+
+    async def _save_state(self, cursor: datetime, synced_at: datetime, generation: int, full: bool):
+        '''Сохраняет курсор инкрементальной синхронизации и время начала успешной синхронизации (UTC).'''
+        synced = synced_at.isoformat(sep=' ')
+        async with self.pool.writer() as conn:
+            await conn.execute(
+                '''
+                INSERT INTO yclients_sync_state (name, cursor, generation, last_sync_at, last_full_sync_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    cursor = excluded.cursor,
+                    generation = excluded.generation,
+                    last_sync_at = excluded.last_sync_at,
+                    last_full_sync_at = COALESCE(excluded.last_full_sync_at, last_full_sync_at);
+                ''',
+                (
+                    SYNC_STATE_NAME,
+                    cursor.isoformat(timespec='seconds'),
+                    generation,
+                    synced,
+                    synced if full else None,
+                ),
+            )
+
+    @staticmethod
+    def _next_cursor(state: dict | None, latest: datetime | None) -> datetime:
+        '''
+        Возвращает курсор следующей инкрементальной синхронизации: время последнего изменения среди полученных
+        записей. Если записей не было, курсор не меняется; первый курсор без записей — текущее время в UTC.
+        '''
+        if latest is not None:
+            return latest
+        if state and state['cursor']:
+            return datetime.fromisoformat(state['cursor'])
+        return datetime.now(timezone.utc)
+
+    async def run_once(self) -> dict[str, int | str]:
+        '''
+        Выполняет полную или инкрементальную синхронизацию в зависимости от состояния зеркала.
+
+        Returns:
+            dict[str, int | str]: Вид синхронизации, количество полученных и удалённых записей.
+
+        Raises:
+            APIError: Если произошла ошибка при запросе записей.
+        '''
+        state = await self._load_state()
+        if state is None or state['last_full_sync_at'] is None:
+            return await self.full_sync(state)
+        last_full = datetime.fromisoformat(state['last_full_sync_at'])
+        if datetime.utcnow() - last_full >= timedelta(seconds=self.full_sync_interval):
+            return await self.full_sync(state)
+        return await self.incremental_sync(state)
+
+    async def full_sync(self, state: dict | None = None) -> dict[str, int | str]:
+        '''
+        Загружает все записи окна зеркала и удаляет из окна записи, которых больше нет в YClients.
+
+        Args:
+            state (dict | None): Текущее состояние синхронизации.
+
+        Returns:
+            dict[str, int | str]: Вид синхронизации, количество полученных и удалённых записей.
+        '''
+        started = time.perf_counter()
+        synced_at = datetime.utcnow()
+        generation = (state['generation'] if state else 0) + 1
+        window_start = date.today() - timedelta(days=self.history_days)
+        window_end = date.today() + timedelta(days=self.horizon_days)
+
+        fetched, latest = await self._pull(
+            GetRecordsQueryParams(start_date=window_start.isoformat(), end_date=window_end.isoformat()),
+            generation,
+        )
+
+        async with self.pool.writer() as conn:
+            missing = await conn.execute(
+                '''
+                DELETE FROM yclients_records
+                WHERE generation < ? AND datetime >= ? AND datetime < ?;
+                ''',
+                (generation, window_start.isoformat(), (window_end + timedelta(days=1)).isoformat()),
+            )
+            # Записи, ушедшие из окна в прошлое, больше не обновляются и удаляются вместе с окном.
+            expired = await conn.execute(
+                'DELETE FROM yclients_records WHERE datetime < ?;', (window_start.isoformat(),)
+            )
+            removed = missing.rowcount + expired.rowcount
+            if removed:
+                await conn.execute(
+                    'DELETE FROM yclients_record_services WHERE record_id NOT IN (SELECT id FROM yclients_records);'
+                )
+        await self._save_state(self._next_cursor(state, latest), synced_at, generation, full=True)
+        return self._finish('full', fetched, removed, started, synced_at)
+
+    async def incremental_sync(self, state: dict) -> dict[str, int | str]:
+        '''
+        Загружает записи, изменённые после предыдущей синхронизации.
+
+        Args:
+            state (dict): Текущее состояние синхронизации.
+
+        Returns:
+            dict[str, int | str]: Вид синхронизации, количество полученных и удалённых записей.
+        '''
+        started = time.perf_counter()
+        synced_at = datetime.utcnow()
+        changed_after = datetime.fromisoformat(state['cursor']) - timedelta(seconds=self.overlap)
+        fetched, latest = await self._pull(
+            GetRecordsQueryParams(changed_after=changed_after.isoformat(timespec='seconds')),
+            state['generation'],
+        )
+        await self._save_state(self._next_cursor(state, latest), synced_at, state['generation'], full=False)
+        return self._finish('incremental', fetched, 0, started, synced_at)
+
+    def _finish(
+        self, kind: str, fetched: int, removed: int, started: float, synced_at: datetime
+    ) -> dict[str, int | str]:
+        '''Обновляет статистику после успешной синхронизации.'''
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        self._last_sync_at = synced_at
+        self._stats[f'{kind}_syncs'] += 1
+        self._stats['records_fetched'] += fetched
+        self._stats['records_removed'] += removed
+        self._stats['last_sync_ms'] = elapsed_ms
+        self.logger.info(f'Records mirror {kind} sync: {fetched} records fetched, {removed} removed, {elapsed_ms} ms.')
+        return {'kind': kind, 'fetched': fetched, 'removed': removed}
+
+    async def _pull(self, query: GetRecordsQueryParams, generation: int) -> tuple[int, datetime | None]:
+        '''
+        Постранично загружает записи по фильтру и сохраняет их в зеркало пачками.
+
+        Returns:
+            tuple[int, datetime | None]: Количество полученных записей и наибольшее время их изменения.
+        '''
+        query.count = self.page_size
+        fetched = 0
+        latest: datetime | None = None
+        batch: list[Record] = []
+        async for record in self.records.iter_records(GetRecordsRequest(query=query)):
+            if record.last_change_date and (latest is None or record.last_change_date > latest):
+                latest = record.last_change_date
+            batch.append(record)
+            if len(batch) >= self.page_size:
+                await self._upsert(batch, generation)
+                fetched += len(batch)
+                batch = []
+        if batch:
+            await self._upsert(batch, generation)
+            fetched += len(batch)
+        return fetched, latest
+
+    async def _upsert(self, records: list[Record], generation: int):
+        '''Сохраняет пачку записей, их услуги и клиентов в одной транзакции.'''
+        synced_at = datetime.utcnow()
+        record_rows = []
+        service_rows = []
+        client_rows = []
+        for record in records:
+            client = record.client
+            record_rows.append(
+                (
+                    record.id,
+                    record.company_id,
+                    record.staff_id or record.staff.id,
+                    record.staff.name,
+                    client.id if client else None,
+                    record_datetime(record),
+                    record.seance_length,
+                    record.attendance,
+                    record.confirmed,
+                    int(bool(record.deleted)),
+                    record.comment,
+                    record.last_change_date.isoformat() if record.last_change_date else None,
+                    generation,
+                    synced_at,
+                )
+            )
+            service_rows.extend(
+                (record.id, service.id, service.title, service.cost, service.amount) for service in record.services
+            )
+            if client:
+                client_rows.append(
+                    (
+                        client.id,
+                        client.name,
+                        client.surname,
+                        client.patronymic,
+                        normalize_phone(client.phone),
+                        client.email,
+                        synced_at,
+                    )
+                )
+
+        async with self.pool.writer() as conn:
+            await conn.executemany(
+                '''
+                INSERT INTO yclients_records (
+                    id, company_id, staff_id, staff_name, client_id, datetime, seance_length,
+                    attendance, confirmed, deleted, comment, last_change_date, generation, synced_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    company_id = excluded.company_id,
+                    staff_id = excluded.staff_id,
+                    staff_name = excluded.staff_name,
+                    client_id = excluded.client_id,
+                    datetime = excluded.datetime,
+                    seance_length = excluded.seance_length,
+                    attendance = excluded.attendance,
+                    confirmed = excluded.confirmed,
+                    deleted = excluded.deleted,
+                    comment = excluded.comment,
+                    last_change_date = excluded.last_change_date,
+                    generation = excluded.generation,
+                    synced_at = excluded.synced_at;
+                ''',
+                record_rows,
+            )
+            await conn.executemany(
+                'DELETE FROM yclients_record_services WHERE record_id = ?;',
+                [(record.id,) for record in records],
+            )
+            await conn.executemany(
+                '''
+                INSERT OR REPLACE INTO yclients_record_services (record_id, service_id, title, cost, amount)
+                VALUES (?, ?, ?, ?, ?);
+                ''',
+                service_rows,
+            )
+            await conn.executemany(
+                '''
+                INSERT INTO yclients_clients (id, name, surname, patronymic, phone, email, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    name = excluded.name,
+                    surname = excluded.surname,
+                    patronymic = excluded.patronymic,
+                    phone = COALESCE(excluded.phone, phone),
+                    email = COALESCE(excluded.email, email),
+                    synced_at = excluded.synced_at;
+                ''',
+                client_rows,
+            )
+
+    def lag(self) -> float | None:
+        '''
+        Возвращает отставание зеркала: сколько секунд прошло с начала последней успешной синхронизации
+        в этом процессе.
+
+        Returns:
+            float | None: Отставание в секундах или None, если синхронизаций ещё не было.
+        '''
+        if self._last_sync_at is None:
+            return None
+        return (datetime.utcnow() - self._last_sync_at).total_seconds()
+
+    def stats(self) -> dict[str, float | int | None]:
+        '''
+        Возвращает статистику синхронизации.
+
+        Returns:
+            dict[str, float | int | None]: Количество полных и инкрементальных синхронизаций, полученных
+            и удалённых записей, ошибок, длительность последней синхронизации и отставание зеркала `lag`.
+        '''
+        return {**self._stats, 'lag': self.lag()}
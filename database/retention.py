@@ -0,0 +1,196 @@
+import asyncio
+import gzip
+import logging
+import os
+from datetime import datetime, timedelta
+
+import orjson
+
+from database.pool import ConnectionPool
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd необязателен
+    zstandard = None
+
+
+class MessageRetention:
+    '''
+    Фоновое обслуживание таблицы `messages`: архивирование, удаление старых сообщений и инкрементальный VACUUM.
+
+    Сообщения старше горизонта хранения выгружаются в сжатые JSONL-сегменты (gzip или zstd) и удаляются
+    из базы пачками ограниченного размера. Между пачками писатель освобождается, поэтому обычная запись
+    сообщений не блокируется на время обслуживания. После удаления освобождённые страницы возвращаются
+    файловой системе через `PRAGMA incremental_vacuum`.
+    '''
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        archive_dir: str,
+        retention_days: int = 90,
+        batch_size: int = 500,
+        interval: float = 3600.0,
+        compression: str = 'gzip',
+        batch_pause: float = 0.05,
+    ):
+        '''
+        Инициализирует задачу обслуживания.
+
+        Args:
+            pool (ConnectionPool): Пул соединений с базой данных.
+            archive_dir (str): Каталог для архивных сегментов.
+            retention_days (int): Горизонт хранения сообщений в базе (в днях).
+            batch_size (int): Количество сообщений в одной пачке архивирования и удаления.
+            interval (float): Интервал между запусками обслуживания (в секундах).
+            compression (str): Формат сжатия архива: 'gzip' или 'zstd'.
+            batch_pause (float): Пауза между пачками (в секундах), чтобы пропустить других писателей.
+        '''
+        if compression not in ('gzip', 'zstd'):
+            raise ValueError(f'Unsupported archive compression: {compression}')
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError('zstd compression requires the "zstandard" package.')
+
+        self.pool = pool
+        self.archive_dir = archive_dir
+        self.retention_days = retention_days
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.compression = compression
+        self.batch_pause = batch_pause
+        self.logger = logging.getLogger(__name__)
+
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        '''Запускает периодическое обслуживание в фоне.'''
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='messages-retention')
+
+    async def stop(self):
+        '''Останавливает фоновое обслуживание.'''
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        '''Цикл периодического обслуживания.'''
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.logger.error(f'Error during messages maintenance: {e}')
+            await asyncio.sleep(self.interval)
+
+    def _segment_path(self, started_at: datetime) -> str:
+        '''
+        Возвращает путь к архивному сегменту для текущего запуска.
+
+        Args:
+            started_at (datetime): Время начала запуска.
+
+        Returns:
+            str: Путь к файлу сегмента.
+        '''
+        extension = 'jsonl.gz' if self.compression == 'gzip' else 'jsonl.zst'
+        return os.path.join(self.archive_dir, f'messages-{started_at:%Y%m%dT%H%M%S}.{extension}')
+
+    def _append_to_segment(self, path: str, rows: list[dict]):
+        '''
+        Дописывает пачку сообщений в архивный сегмент и сбрасывает её на диск.
+
+        Каждая пачка записывается отдельным gzip-членом (или zstd-фреймом), поэтому сегмент остаётся
+        корректным файлом, даже если запуск прервётся между пачками.
+
+        Args:
+            path (str): Путь к файлу сегмента.
+            rows (list[dict]): Сообщения для архивирования.
+        '''
+        payload = b''.join(orjson.dumps(row) + b'\n' for row in rows)
+        if self.compression == 'gzip':
+            payload = gzip.compress(payload)
+        else:
+            payload = zstandard.ZstdCompressor().compress(payload)  # type: ignore
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with open(path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _database_size(self) -> int:
+        '''
+        Возвращает размер файла базы данных в байтах, включая свободные страницы.
+
+        Returns:
+            int: page_count * page_size.
+        '''
+        async with self.pool.reader() as conn:
+            async with conn.execute('PRAGMA page_count;') as cursor:
+                page_count = (await cursor.fetchone())[0]  # type: ignore
+            async with conn.execute('PRAGMA page_size;') as cursor:
+                page_size = (await cursor.fetchone())[0]  # type: ignore
+        return page_count * page_size
+
+    async def run_once(self) -> dict[str, int | str | None]:
+        '''
+        Архивирует и удаляет сообщения старше горизонта хранения, затем выполняет инкрементальный VACUUM.
+
+        Returns:
+            dict[str, int | str | None]: Количество архивированных сообщений, путь к сегменту
+            и количество освобождённых байт.
+        '''
+        started_at = datetime.utcnow()
+        cutoff = (started_at - timedelta(days=self.retention_days)).isoformat(sep=' ')
+        segment = self._segment_path(started_at)
+        archived = 0
+        size_before = await self._database_size()
+
+        while True:
+            async with self.pool.reader() as conn:
+                async with conn.execute(
+                    '''
+                    SELECT id, user_id, message, sender, created_at FROM messages
+                    WHERE created_at < ?
+                    ORDER BY created_at
+                    LIMIT ?;
+                    ''',
+                    (cutoff, self.batch_size),
+                ) as cursor:
+                    rows = [dict(row) for row in await cursor.fetchall()]
+            if not rows:
+                break
+
+            # Сначала архив на диск, потом удаление: при сбое сообщения могут продублироваться в архиве,
+            # но не потеряются.
+            await asyncio.to_thread(self._append_to_segment, segment, rows)
+            async with self.pool.writer() as conn:
+                await conn.executemany('DELETE FROM messages WHERE id = ?;', [(row['id'],) for row in rows])
+            archived += len(rows)
+
+            if len(rows) < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_pause)
+
+        if archived:
+            async with self.pool.writer() as conn:
+                # Через execute() модуль sqlite3 делает лишь один шаг прагмы и освобождает одну страницу,
+                # executescript() выполняет её до конца.
+                await conn.executescript('PRAGMA incremental_vacuum;')
+
+        size_after = await self._database_size()
+        report = {
+            'archived': archived,
+            'archive_file': segment if archived else None,
+            'bytes_reclaimed': max(0, size_before - size_after),
+        }
+        self.logger.info(
+            f'Messages maintenance: archived {archived} messages older than {cutoff}, '
+            f'reclaimed {report["bytes_reclaimed"]} bytes.'
+        )
+        return report
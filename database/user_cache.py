@@ -0,0 +1,121 @@
+import time
+from collections import OrderedDict
+
+
+class UserCache:
+    '''
+    Кэш профилей пользователей в памяти процесса с ограничением по времени жизни (TTL) и размеру (LRU).
+
+    Ключ — Telegram ID пользователя. Чтобы запись, прочитанная до изменения пользователя, не попала в кэш
+    после инвалидации, put() принимает токен, полученный через begin_read(): если между чтением и записью
+    в кэш произошла инвалидация, значение отбрасывается.
+    '''
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        '''
+        Инициализирует кэш.
+
+        Args:
+            max_size (int): Максимальное количество записей.
+            ttl (float): Время жизни записи в секундах.
+        '''
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, telegram_id: int) -> dict | None:
+        '''
+        Возвращает копию профиля пользователя из кэша.
+
+        Args:
+            telegram_id (int): Идентификатор пользователя в Telegram.
+
+        Returns:
+            dict | None: Профиль пользователя или None, если записи нет или она устарела.
+        '''
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[telegram_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(telegram_id)
+        self.hits += 1
+        return dict(user)
+
+    def begin_read(self) -> int:
+        '''
+        Возвращает токен, который нужно передать в put() после чтения из базы.
+
+        Returns:
+            int: Текущее количество инвалидаций.
+        '''
+        return self.invalidations
+
+    def put(self, telegram_id: int, user: dict, token: int):
+        '''
+        Сохраняет профиль пользователя в кэш.
+
+        Args:
+            telegram_id (int): Идентификатор пользователя в Telegram.
+            user (dict): Профиль пользователя.
+            token (int): Токен, полученный через begin_read() до чтения из базы.
+        '''
+        if token != self.invalidations:
+            return
+
+        self._entries[telegram_id] = (time.monotonic() + self.ttl, dict(user))
+        self._entries.move_to_end(telegram_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, telegram_id: int):
+        '''
+        Удаляет профиль пользователя из кэша.
+
+        Args:
+            telegram_id (int): Идентификатор пользователя в Telegram.
+        '''
+        self.invalidations += 1
+        self._entries.pop(telegram_id, None)
+
+    def clear(self):
+        '''Очищает кэш.'''
+        self.invalidations += 1
+        self._entries.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        '''Доля попаданий в кэш.'''
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        '''
+        Возвращает статистику работы кэша.
+
+        Returns:
+            dict[str, int | float]: Счётчики попаданий, промахов, вытеснений и инвалидаций.
+        '''
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_ratio': self.hit_ratio,
+        }
@@ -30,9 +30,10 @@ async def main():
     finally:
         logger.info('Бот завершает работу...')
 
+        # База закрывается первой: close() сбрасывает на диск буфер журнала сообщений.
+        await db.close()
         await bot.session.close()
         await yclients_manager.close()
-        await db.close()
 
         logger.info('Бот успешно завершил работу.')
 
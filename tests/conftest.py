@@ -0,0 +1,38 @@
+import pytest_asyncio
+from openai import AsyncOpenAI
+
+from ai.manager import AssistantManager
+from tests.fakes.openai import FakeOpenAI
+
+
+@pytest_asyncio.fixture
+async def openai_server():
+    '''Фейковый сервер Assistants API на свободном порту: запуск «думает» 0,05 с и отвечает без инструментов.'''
+    server = FakeOpenAI(think=0.05, tool_rounds=0, port=0)
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def openai_client(openai_server):
+    client = AsyncOpenAI(base_url=openai_server.url, api_key='fake', max_retries=0)
+    yield client
+    await client.close()
+
+
+@pytest_asyncio.fixture
+async def assistant(openai_client):
+    '''Менеджер ассистента с готовым потоком и инструментом get_bookable_dates, записывающим вызовы.'''
+    manager = AssistantManager(None, None, 1)  # type: ignore[arg-type]
+    manager.client = openai_client
+    manager.assistant_id = 'asst_fake'
+    manager.thread_id = 'thread_test'
+    manager.tool_calls = []  # type: ignore[attr-defined]
+
+    async def get_bookable_dates(params):
+        manager.tool_calls.append(params)  # type: ignore[attr-defined]
+        return {'dates': ['2024-10-21']}
+
+    manager.get_bookable_dates = get_bookable_dates  # type: ignore[method-assign]
+    return manager
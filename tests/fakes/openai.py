@@ -0,0 +1,267 @@
+'''
+Фейковый сервер Assistants API OpenAI для тестов и бенчмарков: запуски «думают» заданное время, при
+необходимости один раз запрашивают вызов инструмента и отвечают текстом. Поддерживаются опрос статуса запуска
+и потоковый режим (SSE). Удалённые потоки отвечают 404. Сервер считает запросы по видам.
+'''
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+
+import orjson
+from aiohttp import web
+
+TOOL_CALL = {
+    'id': 'call_1',
+    'type': 'function',
+    'function': {'name': 'get_bookable_dates', 'arguments': '{"service_ids": [1]}'},
+}
+
+
+class FakeRun:
+    '''
+    Запуск: фаза «размышления» длится `think` секунд, затем запуск либо ждёт результатов инструмента
+    (если `tool_rounds` не исчерпаны), либо завершается ответом `reply`.
+    '''
+
+    def __init__(self, run_id: str, thread_id: str, think: float, tool_rounds: int, reply: str):
+        self.id = run_id
+        self.thread_id = thread_id
+        self.think = think
+        self.tool_rounds = tool_rounds
+        self.reply = reply
+        self.phase_started = time.monotonic()
+        self.cancelled = False
+
+    @property
+    def status(self) -> str:
+        if self.cancelled:
+            return 'cancelled'
+        if time.monotonic() - self.phase_started < self.think:
+            return 'in_progress'
+        return 'requires_action' if self.tool_rounds else 'completed'
+
+    def payload(self) -> dict:
+        status = self.status
+        return {
+            'id': self.id,
+            'object': 'thread.run',
+            'thread_id': self.thread_id,
+            'assistant_id': 'asst_fake',
+            'status': status,
+            'required_action': (
+                {'type': 'submit_tool_outputs', 'submit_tool_outputs': {'tool_calls': [TOOL_CALL]}}
+                if status == 'requires_action'
+                else None
+            ),
+        }
+
+    def message(self) -> dict:
+        return {
+            'id': f'msg_{self.id}',
+            'object': 'thread.message',
+            'thread_id': self.thread_id,
+            'run_id': self.id,
+            'role': 'assistant',
+            'status': 'completed',
+            'content': [{'type': 'text', 'text': {'value': self.reply, 'annotations': []}}],
+        }
+
+
+class FakeOpenAI:
+    '''
+    Фейковый сервер Assistants API.
+
+    Attributes:
+        think (float): Длительность фазы «размышления» запуска (сек).
+        tool_rounds (int): Сколько раз запуск запрашивает вызов инструмента.
+        reply (str): Текст ответа ассистента.
+        chunk_size (int): Размер фрагмента текста в событиях thread.message.delta.
+        chunk_delay (float): Пауза между фрагментами текста в потоковом режиме (сек).
+        hits (Counter): Количество запросов по видам.
+        deleted_threads (set[str]): Потоки, на запросы к которым сервер отвечает 404.
+        cut_streams (int): Сколько следующих потоков событий оборвать сразу после создания запуска.
+        port (int): Порт сервера; 0 — любой свободный (известен после `start`).
+    '''
+
+    def __init__(
+        self,
+        think: float = 0.8,
+        tool_rounds: int = 1,
+        reply: str = 'Готово! Свободные даты: 21, 22 и 24 октября.',
+        chunk_size: int = 8,
+        chunk_delay: float = 0.0,
+        port: int = 8766,
+    ):
+        self.think = think
+        self.tool_rounds = tool_rounds
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.port = port
+        self.hits: Counter = Counter()
+        self.deleted_threads: set[str] = set()
+        self.cut_streams = 0
+        self.runs: dict[str, FakeRun] = {}
+        self._ids = itertools.count(1)
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}/v1'
+
+    def _not_found(self, thread_id: str) -> web.Response | None:
+        if thread_id not in self.deleted_threads:
+            return None
+        return web.json_response(
+            {'error': {'message': f"No thread found with id '{thread_id}'.", 'type': 'invalid_request_error'}},
+            status=404,
+        )
+
+    async def retrieve_assistant(self, request: web.Request) -> web.Response:
+        self.hits['assistants.retrieve'] += 1
+        return web.json_response(
+            {
+                'id': request.match_info['assistant_id'],
+                'object': 'assistant',
+                'created_at': 0,
+                'model': 'gpt-4o',
+                'tools': [],
+            }
+        )
+
+    async def create_thread(self, request: web.Request) -> web.Response:
+        self.hits['threads.create'] += 1
+        return web.json_response({'id': f'thread_{next(self._ids)}', 'object': 'thread', 'created_at': 0})
+
+    async def retrieve_thread(self, request: web.Request) -> web.Response:
+        self.hits['threads.retrieve'] += 1
+        thread_id = request.match_info['thread_id']
+        return self._not_found(thread_id) or web.json_response({'id': thread_id, 'object': 'thread', 'created_at': 0})
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        self.hits['messages.create'] += 1
+        body = await request.json()
+        thread_id = request.match_info['thread_id']
+        not_found = self._not_found(thread_id)
+        if not_found:
+            return not_found
+        return web.json_response(
+            {
+                'id': f'msg_{next(self._ids)}',
+                'object': 'thread.message',
+                'thread_id': thread_id,
+                'role': body.get('role', 'user'),
+                'content': [{'type': 'text', 'text': {'value': body.get('content', ''), 'annotations': []}}],
+            }
+        )
+
+    async def list_messages(self, request: web.Request) -> web.Response:
+        self.hits['messages.list'] += 1
+        thread_id = request.match_info['thread_id']
+        runs = [run for run in self.runs.values() if run.thread_id == thread_id and run.status == 'completed']
+        data = [runs[-1].message()] if runs else []
+        return web.json_response({'object': 'list', 'data': data, 'has_more': False})
+
+    async def list_runs(self, request: web.Request) -> web.Response:
+        self.hits['runs.list'] += 1
+        thread_id = request.match_info['thread_id']
+        not_found = self._not_found(thread_id)
+        if not_found:
+            return not_found
+        data = [run.payload() for run in self.runs.values() if run.thread_id == thread_id]
+        return web.json_response({'object': 'list', 'data': data, 'has_more': False})
+
+    async def create_run(self, request: web.Request) -> web.StreamResponse:
+        self.hits['runs.create'] += 1
+        body = await request.json()
+        thread_id = request.match_info['thread_id']
+        run = FakeRun(f'run_{next(self._ids)}', thread_id, self.think, self.tool_rounds, self.reply)
+        self.runs[run.id] = run
+        if body.get('stream'):
+            return await self._stream(request, run, created=True)
+        return web.json_response(run.payload())
+
+    async def retrieve_run(self, request: web.Request) -> web.Response:
+        self.hits['runs.retrieve'] += 1
+        return web.json_response(self.runs[request.match_info['run_id']].payload())
+
+    async def cancel_run(self, request: web.Request) -> web.Response:
+        self.hits['runs.cancel'] += 1
+        run = self.runs[request.match_info['run_id']]
+        run.cancelled = True
+        return web.json_response(run.payload())
+
+    async def submit_tool_outputs(self, request: web.Request) -> web.StreamResponse:
+        self.hits['runs.submit_tool_outputs'] += 1
+        body = await request.json()
+        run = self.runs[request.match_info['run_id']]
+        run.tool_rounds -= 1
+        run.phase_started = time.monotonic()
+        if body.get('stream'):
+            return await self._stream(request, run, created=False)
+        return web.json_response(run.payload())
+
+    async def _stream(self, request: web.Request, run: FakeRun, created: bool) -> web.StreamResponse:
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+
+        async def send(event: str, data: dict | str):
+            payload = data if isinstance(data, str) else orjson.dumps(data).decode()
+            await response.write(f'event: {event}\ndata: {payload}\n\n'.encode())
+
+        try:
+            await self._events(run, created, send)
+            await response.write_eof()
+        except ConnectionResetError:
+            # Клиент закрыл поток раньше (например, по сроку ответа).
+            pass
+        return response
+
+    async def _events(self, run: FakeRun, created: bool, send):
+        if created:
+            await send('thread.run.created', run.payload())
+        if self.cut_streams:
+            self.cut_streams -= 1
+            return
+        await asyncio.sleep(max(0.0, run.think - (time.monotonic() - run.phase_started)))
+        if run.status == 'requires_action':
+            await send('thread.run.requires_action', run.payload())
+        else:
+            message = run.message()
+            for start in range(0, len(run.reply), self.chunk_size):
+                chunk = run.reply[start : start + self.chunk_size]
+                await send(
+                    'thread.message.delta',
+                    {
+                        'id': message['id'],
+                        'object': 'thread.message.delta',
+                        'delta': {'content': [{'index': 0, 'type': 'text', 'text': {'value': chunk}}]},
+                    },
+                )
+                await asyncio.sleep(self.chunk_delay)
+            await send('thread.message.completed', message)
+            await send('thread.run.completed', run.payload())
+        await send('done', '[DONE]')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/v1/assistants/{assistant_id}', self.retrieve_assistant)
+        app.router.add_post('/v1/threads', self.create_thread)
+        app.router.add_get('/v1/threads/{thread_id}', self.retrieve_thread)
+        app.router.add_post('/v1/threads/{thread_id}/messages', self.create_message)
+        app.router.add_get('/v1/threads/{thread_id}/messages', self.list_messages)
+        app.router.add_get('/v1/threads/{thread_id}/runs', self.list_runs)
+        app.router.add_post('/v1/threads/{thread_id}/runs', self.create_run)
+        app.router.add_get('/v1/threads/{thread_id}/runs/{run_id}', self.retrieve_run)
+        app.router.add_post('/v1/threads/{thread_id}/runs/{run_id}/cancel', self.cancel_run)
+        app.router.add_post('/v1/threads/{thread_id}/runs/{run_id}/submit_tool_outputs', self.submit_tool_outputs)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, '127.0.0.1', self.port).start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
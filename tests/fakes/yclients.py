@@ -0,0 +1,274 @@
+'''
+Фейковый сервер API YClients для тестов и бенчмарков: отвечает фиксированными данными с заданной задержкой
+и считает запросы по конечным точкам.
+'''
+
+import asyncio
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from aiohttp import web
+
+SERVICES = {
+    'success': True,
+    'data': {
+        'services': [
+            {
+                'id': service_id,
+                'title': f'Услуга {service_id}',
+                'category_id': 1,
+                'weight': 1,
+                'price_min': 1000,
+                'price_max': 5000,
+                'discount': 0,
+                'comment': '',
+                'active': 1,
+                'prepaid': 'forbidden',
+                'sex': 0,
+                'seance_length': 3600,
+                'image': '',
+            }
+            for service_id in range(1, 41)
+        ],
+        'category': [{'id': 1, 'title': 'Косметология', 'sex': 0, 'weight': 1, 'api_id': 0}],
+    },
+    'meta': [],
+}
+
+
+def bookable_dates(days: int = 30) -> dict:
+    dates = [(date.today() + timedelta(days=i)).isoformat() for i in range(days)]
+    return {
+        'success': True,
+        'data': {'booking_days': {}, 'booking_dates': dates, 'working_days': {}, 'working_dates': dates},
+        'meta': [],
+    }
+
+
+def bookable_times(day: str) -> dict:
+    return {
+        'success': True,
+        'data': [
+            {'time': f'{hour:02d}:00', 'seance_length': 3600, 'datetime': f'{day}T{hour:02d}:00:00+03:00'}
+            for hour in range(10, 20)
+        ],
+        'meta': [],
+    }
+
+
+def record(record_id: int, clients: int = 500, changed: str = '2024-01-01T00:00:00') -> dict:
+    client_id = record_id % clients + 1
+    when = date.today() + timedelta(days=record_id % 60 - 10)
+    hour = 10 + record_id % 9
+    return {
+        'id': record_id,
+        'company_id': 1,
+        'staff_id': record_id % 5 + 1,
+        'staff': {'id': record_id % 5 + 1, 'name': f'Мастер {record_id % 5 + 1}', 'company_id': 1, 'show_rating': True},
+        'client': {'id': client_id, 'name': f'Клиент {client_id}', 'phone': f'+7 900 {client_id:07d}'},
+        'services': [{'id': 16404847, 'title': 'Консультация косметолога', 'cost': 2000, 'amount': 1}],
+        'date': when.isoformat(),
+        'datetime': f'{when.isoformat()}T{hour:02d}:00:00+03:00',
+        'seance_length': 3600,
+        'attendance': 0,
+        'confirmed': 1,
+        'last_change_date': changed,
+        'deleted': False,
+    }
+
+
+def hhmm(minutes: int) -> str:
+    return f'{minutes // 60:02d}:{minutes % 60:02d}:00'
+
+
+def staff_schedule(staff_id: int, day: date, rng: random.Random) -> dict:
+    # Рабочий день с перерывом и случайными записями, начинающимися и заканчивающимися на границе 5 минут.
+    slots = [(10 * 60, 14 * 60), (15 * 60, 20 * 60)]
+    busy = []
+    for _ in range(rng.randint(0, 6)):
+        start = rng.randrange(9 * 60, 20 * 60, 5)
+        busy.append((start, start + rng.choice([30, 45, 60, 90])))
+    return {
+        'staff_id': staff_id,
+        'date': day.isoformat(),
+        'slots': [{'from_time': hhmm(start), 'to_time': hhmm(end)} for start, end in slots],
+        'busy_intervals': [
+            {'entity_type': 'record', 'entity_id': i + 1, 'from_time': hhmm(start), 'to_time': hhmm(end)}
+            for i, (start, end) in enumerate(busy)
+        ],
+    }
+
+
+def free_times(schedule: dict, length: int, step: int = 15) -> list[str]:
+    # Эталон для сверки: поминутная карта занятости дня вместо интервалов.
+    def minutes(value: str) -> int:
+        return int(value[:2]) * 60 + int(value[3:5])
+
+    free = [False] * (24 * 60 + 1)
+    for slot in schedule['slots']:
+        for minute in range(minutes(slot['from_time']), minutes(slot['to_time'])):
+            free[minute] = True
+    for interval in schedule['busy_intervals']:
+        for minute in range(minutes(interval['from_time']), minutes(interval['to_time'])):
+            free[minute] = False
+    now = datetime.now()
+    not_before = now.hour * 60 + now.minute if schedule['date'] == now.date().isoformat() else 0
+    times = []
+    for slot in schedule['slots']:
+        for start in range(minutes(slot['from_time']), minutes(slot['to_time']), step):
+            if start >= not_before and all(free[start : start + length]) and start + length <= 24 * 60:
+                times.append(f'{start // 60:02d}:{start % 60:02d}')
+    return times
+
+
+class FakeYClients:
+    '''
+    Фейковый сервер API YClients.
+
+    Attributes:
+        latency (float): Задержка ответа (сек).
+        hits (Counter): Количество запросов по первому сегменту пути.
+        records (dict[int, dict]): Записи, которые отдаёт список записей, по ID.
+        schedules (dict[tuple[int, str], dict]): Графики работы по сотруднику и дате. Если графики заданы,
+            свободные сеансы рассчитываются по ним, а не отдаются фиксированным списком.
+        service_lengths (dict[int, dict[int, int]]): Длительности услуг (сек) по ID услуги и сотрудника.
+    '''
+
+    def __init__(self, latency: float = 0.05, port: int = 8765):
+        self.latency = latency
+        self.port = port
+        self.hits: Counter = Counter()
+        self.records: dict[int, dict] = {}
+        self.schedules: dict[tuple[int, str], dict] = {}
+        self.service_lengths: dict[int, dict[int, int]] = {}
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    async def _reply(self, request: web.Request, payload: dict) -> web.Response:
+        self.hits['/' + request.path.strip('/').split('/')[0]] += 1
+        await asyncio.sleep(self.latency)
+        return web.json_response(payload)
+
+    async def book_services(self, request: web.Request) -> web.Response:
+        return await self._reply(request, SERVICES)
+
+    async def book_dates(self, request: web.Request) -> web.Response:
+        return await self._reply(request, bookable_dates())
+
+    async def book_times(self, request: web.Request) -> web.Response:
+        day = request.match_info['date']
+        schedule = self.schedules.get((int(request.match_info['staff_id']), day))
+        if not self.schedules:
+            return await self._reply(request, bookable_times(day))
+        if schedule is None:
+            return await self._reply(request, {'success': True, 'data': [], 'meta': []})
+        staff_id = schedule['staff_id']
+        service_ids = [int(service_id) for service_id in request.query.getall('service_ids', [])]
+        if any(staff_id not in self.service_lengths.get(service_id, {}) for service_id in service_ids):
+            return await self._reply(request, {'success': True, 'data': [], 'meta': []})
+        length = sum(self.service_lengths[service_id][staff_id] for service_id in service_ids) or 3600
+        data = [
+            {'time': time, 'seance_length': length, 'datetime': f'{day}T{time}:00+03:00'}
+            for time in free_times(schedule, length // 60)
+        ]
+        return await self._reply(request, {'success': True, 'data': data, 'meta': []})
+
+    async def journal_seances(self, request: web.Request) -> web.Response:
+        # Сетка журнала — те же начала сеансов, что перебирает эталон free_times: каждые 15 минут от начала
+        # рабочего интервала.
+        schedule = self.schedules.get((int(request.match_info['staff_id']), request.match_info['date']))
+        data = [
+            {'time': f'{start // 60:02d}:{start % 60:02d}', 'is_free': True}
+            for slot in (schedule or {'slots': []})['slots']
+            for start in range(
+                int(slot['from_time'][:2]) * 60 + int(slot['from_time'][3:5]),
+                int(slot['to_time'][:2]) * 60 + int(slot['to_time'][3:5]),
+                15,
+            )
+        ]
+        return await self._reply(request, {'success': True, 'data': data, 'meta': None})
+
+    async def staff_schedule(self, request: web.Request) -> web.Response:
+        start, end = request.query['start_date'], request.query['end_date']
+        data = [schedule for (_, day), schedule in sorted(self.schedules.items()) if start <= day <= end]
+        return await self._reply(request, {'success': True, 'data': data, 'meta': {'count': len(data)}})
+
+    async def company_services(self, request: web.Request) -> web.Response:
+        data = [
+            {
+                'id': service_id,
+                'title': f'Услуга {service_id}',
+                'category_id': 1,
+                'price_min': 1000,
+                'price_max': 5000,
+                'discount': 0,
+                'comment': '',
+                'weight': 1,
+                'active': 1,
+                'api_id': None,
+                'staff': [{'id': staff_id, 'seance_length': length} for staff_id, length in lengths.items()],
+                'image_group': None,
+            }
+            for service_id, lengths in self.service_lengths.items()
+        ]
+        return await self._reply(request, {'success': True, 'data': data, 'meta': {'total_count': len(data)}})
+
+    async def book_record(self, request: web.Request) -> web.Response:
+        return await self._reply(
+            request, {'success': True, 'data': [{'id': 1, 'record_id': 1, 'record_hash': 'hash'}], 'meta': []}
+        )
+
+    async def bulk_clients(self, request: web.Request) -> web.Response:
+        # Клиенты с телефоном на «00» отклоняются как дубликаты.
+        created, errors = [], []
+        for client in await request.json():
+            if client['phone'].endswith('00'):
+                errors.append({**client, 'error': 'Клиент с таким телефоном уже существует'})
+            else:
+                created.append(
+                    {
+                        **client,
+                        'id': len(created) + 1,
+                        'sex': 'Неизвестен',
+                        'importance': 'Без класса важности',
+                        'visits': 0,
+                        'last_change_date': '2024-01-01T00:00:00+03:00',
+                        'custom_fields': {},
+                    }
+                )
+        return await self._reply(request, {'success': True, 'data': {'created': created, 'errors': errors}, 'meta': []})
+
+    async def get_records(self, request: web.Request) -> web.Response:
+        page = int(request.query.get('page', 1))
+        count = int(request.query.get('count', 25))
+        changed_after = request.query.get('changed_after')
+        records = sorted(self.records.values(), key=lambda item: item['id'])
+        if changed_after:
+            records = [item for item in records if item['last_change_date'] > changed_after]
+        chunk = records[(page - 1) * count : page * count]
+        return await self._reply(
+            request, {'success': True, 'data': chunk, 'meta': {'page': page, 'total_count': len(records)}}
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/book_services/{company_id}', self.book_services)
+        app.router.add_get('/book_dates/{company_id}', self.book_dates)
+        app.router.add_get('/book_times/{company_id}/{staff_id}/{date}', self.book_times)
+        app.router.add_post('/book_record/{company_id}', self.book_record)
+        app.router.add_post('/clients/{company_id}/bulk', self.bulk_clients)
+        app.router.add_post('/records/{company_id}', self.get_records)
+        app.router.add_get('/company/{company_id}/staff/schedule', self.staff_schedule)
+        app.router.add_post('/timetable/seances/{company_id}/{staff_id}/{date}', self.journal_seances)
+        app.router.add_get('/company/{company_id}/services', self.company_services)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, '127.0.0.1', self.port).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
@@ -0,0 +1,129 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ai.manager import AssistantManager
+from config.settings import settings
+
+TIMEOUT_REPLY = 'Не удалось получить ответ вовремя. Попробуйте, пожалуйста, ещё раз.'
+
+
+class FakeBot:
+    async def send_chat_action(self, chat_id: int, action: str):
+        pass
+
+
+def ask(manager: AssistantManager, text: str = 'Когда можно записаться?'):
+    message = SimpleNamespace(chat=SimpleNamespace(id=manager.user_id))
+    return manager.add_message_to_thread_and_run('user', text, message, FakeBot(), None)
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    monkeypatch.setattr(settings, 'ASSISTANT_STREAMING', True)
+    monkeypatch.setattr(settings, 'ASSISTANT_POLL_INITIAL', 0.02)
+    monkeypatch.setattr(settings, 'ASSISTANT_POLL_MAX', 0.1)
+
+
+@pytest.fixture
+def polling(monkeypatch):
+    monkeypatch.setattr(settings, 'ASSISTANT_STREAMING', False)
+    monkeypatch.setattr(settings, 'ASSISTANT_POLL_INITIAL', 0.05)
+    monkeypatch.setattr(settings, 'ASSISTANT_POLL_MAX', 0.2)
+
+
+@pytest.mark.asyncio
+async def test_stream_submits_tool_outputs_inside_stream(streaming, openai_server, assistant):
+    openai_server.tool_rounds = 1
+    deltas = []
+
+    message = SimpleNamespace(chat=SimpleNamespace(id=assistant.user_id))
+    answer = await assistant.add_message_to_thread_and_run(
+        'user', 'Когда можно записаться?', message, FakeBot(), None, on_delta=lambda _, delta: deltas.append(delta)
+    )
+
+    assert answer == openai_server.reply
+    assert ''.join(deltas) == openai_server.reply
+    assert assistant.tool_calls == [{'service_ids': [1]}]
+    assert openai_server.hits['runs.submit_tool_outputs'] == 1
+    # Результаты инструмента отправлены в потоке: опрос запуска не понадобился.
+    assert openai_server.hits['runs.retrieve'] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_ended_early_falls_back_to_polling(streaming, openai_server, assistant):
+    openai_server.cut_streams = 1
+
+    assert await ask(assistant) == openai_server.reply
+    assert openai_server.hits['runs.retrieve'] >= 1
+    assert openai_server.hits['messages.list'] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_past_deadline_cancels_run(streaming, monkeypatch, openai_server, assistant):
+    monkeypatch.setattr(settings, 'ASSISTANT_RUN_DEADLINE', 0.2)
+    openai_server.think = 1
+
+    assert await ask(assistant) == TIMEOUT_REPLY
+    assert openai_server.hits['runs.cancel'] == 1
+    assert [run.cancelled for run in openai_server.runs.values()] == [True]
+
+
+@pytest.mark.asyncio
+async def test_poll_interval_backs_off(polling, openai_server, assistant):
+    openai_server.think = 0.6
+
+    assert await ask(assistant) == openai_server.reply
+    # Паузы 0,05 + 0,1 + 0,2 + 0,2 + 0,2 с: запуск готов к пятому опросу; с постоянной паузой 0,05 с — к двенадцатому.
+    assert 4 <= openai_server.hits['runs.retrieve'] <= 6
+
+
+@pytest.mark.asyncio
+async def test_poll_interval_restarts_after_tool_outputs(polling, openai_server, assistant):
+    openai_server.think = 0.3
+    openai_server.tool_rounds = 1
+
+    assert await ask(assistant) == openai_server.reply
+    assert assistant.tool_calls == [{'service_ids': [1]}]
+    # По 4 опроса на каждую фазу «размышления» (0,05 + 0,1 + 0,2 с); без сброса хватило бы одного после инструмента.
+    assert openai_server.hits['runs.retrieve'] >= 6
+
+
+@pytest.mark.asyncio
+async def test_poll_past_deadline_cancels_run(polling, monkeypatch, openai_server, assistant):
+    monkeypatch.setattr(settings, 'ASSISTANT_RUN_DEADLINE', 0.3)
+    openai_server.think = 1
+
+    assert await ask(assistant) == TIMEOUT_REPLY
+    assert openai_server.hits['runs.cancel'] == 1
+    assert [run.cancelled for run in openai_server.runs.values()] == [True]
+    # Последняя пауза (0,2 с) вышла бы за срок: запуск отменяется, не дожидаясь её.
+    assert openai_server.hits['runs.retrieve'] == 2
+
+
+@pytest.mark.asyncio
+async def test_inbox_outlives_cancelled_leader(monkeypatch, assistant):
+    sent = []
+
+    async def run_message(role, content, *args):
+        sent.append(content)
+        return 'ответ'
+
+    monkeypatch.setattr(assistant, 'run_message', run_message)
+    await assistant.lock.acquire()
+    leader = asyncio.create_task(ask(assistant, 'первое'))
+    await asyncio.sleep(0)
+    assert await ask(assistant, 'второе') is None
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    # Очередь не потеряна: следующее сообщение отправляет её вместе с собой и получает ответ.
+    pending = asyncio.create_task(ask(assistant, 'третье'))
+    await asyncio.sleep(0)
+    assistant.lock.release()
+    assert await pending == 'ответ'
+    assert sent == ['первое\n\nвторое\n\nтретье']
+    assert assistant.inbox is None and not assistant.inbox_led
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from yclients.availability import AvailabilityIndex
+
+DAY = date(2024, 10, 21)
+
+
+class FakeOnlineBookings:
+    '''Сервис онлайн-записи, ответы которого задерживаются до `release`; каждый ответ помечен номером запроса.'''
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.requests = 0
+
+    def add_booking_listener(self, listener):
+        pass
+
+    async def _respond(self, data):
+        self.requests += 1
+        number = self.requests
+        await self.release.wait()
+        return SimpleNamespace(success=True, data=data(number))
+
+    async def get_bookable_dates(self, request_model):
+        return await self._respond(lambda number: SimpleNamespace(booking_dates=[DAY] * number))
+
+    async def get_bookable_times(self, staff_id, date, request_model):
+        return await self._respond(lambda number: [f'seance {number}'])
+
+
+@pytest.fixture
+def online_bookings():
+    return FakeOnlineBookings()
+
+
+@pytest.mark.asyncio
+async def test_times_fetched_before_invalidate_are_not_stored(online_bookings):
+    index = AvailabilityIndex(online_bookings)  # type: ignore[arg-type]
+    pending = asyncio.create_task(index.get_times([1], 7, DAY))
+    await asyncio.sleep(0)
+    index.invalidate(7, DAY)
+    online_bookings.release.set()
+
+    # Вызвавший получает ответ, но в индекс он не попадает: следующее обращение идёт в API.
+    assert await pending == ['seance 1']
+    assert await index.get_times([1], 7, DAY) == ['seance 2']
+    assert await index.get_times([1], 7, DAY) == ['seance 2']
+    assert index.stats()['discarded'] == 1
+
+
+@pytest.mark.asyncio
+async def test_dates_for_any_staff_are_discarded_by_any_invalidate(online_bookings):
+    index = AvailabilityIndex(online_bookings)  # type: ignore[arg-type]
+    pending = asyncio.create_task(index.get_dates([1]))
+    await asyncio.sleep(0)
+    index.invalidate(7)
+    online_bookings.release.set()
+
+    assert await pending == [DAY]
+    assert await index.get_dates([1]) == [DAY, DAY]
+    assert index.stats()['discarded'] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_of_other_staff_keeps_fetch(online_bookings):
+    index = AvailabilityIndex(online_bookings)  # type: ignore[arg-type]
+    pending = asyncio.create_task(index.get_times([1], 7, DAY))
+    await asyncio.sleep(0)
+    index.invalidate(8, DAY)
+    online_bookings.release.set()
+
+    assert await pending == ['seance 1']
+    assert await index.get_times([1], 7, DAY) == ['seance 1']
+    assert index.stats().get('discarded', 0) == 0
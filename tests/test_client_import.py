@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from yclients.client_import import ERROR_FIELD, RAW_FIELD, ROW_FIELD, ClientImporter, read_rows
+
+
+class FakeClients:
+    '''Сервис клиентов, который добавляет всех клиентов из запроса.'''
+
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def bulk_add_clients(self, request_model):
+        phones = [client.phone for client in request_model.body.clients]
+        self.sent.extend(phones)
+        return SimpleNamespace(data=SimpleNamespace(created=phones, errors=[]))
+
+
+class RejectingClients(FakeClients):
+    '''Сервис клиентов, который возвращает заданные ошибки с телефонами в своём формате.'''
+
+    def __init__(self, phones: list[str | None]):
+        super().__init__()
+        self.phones = phones
+
+    async def bulk_add_clients(self, request_model):
+        errors = [
+            SimpleNamespace(
+                phone=phone,
+                error='Клиент с таким телефоном уже существует',
+                model_dump=lambda phone=phone, **_: {'phone': phone},
+            )
+            for phone in self.phones
+        ]
+        return SimpleNamespace(data=SimpleNamespace(created=[], errors=errors))
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'clients.jsonl'
+    path.write_bytes(
+        b'{"name": "\xd0\x90\xd0\xbd\xd0\xbd\xd0\xb0", "phone": "79000000001"}\n'
+        b'{"name": "broken", "phone": \n'
+        b'\n'
+        b'["not", "an", "object"]\n'
+        b'{"name": "Olga", "phone": "79000000002"}\n'
+    )
+    return path
+
+
+def test_read_rows_keeps_malformed_lines(source):
+    rows = list(read_rows(str(source)))
+
+    assert [row_number for row_number, _ in rows] == [1, 2, 3, 4]
+    assert rows[1][1][RAW_FIELD] == '{"name": "broken", "phone":'
+    assert rows[1][1][ERROR_FIELD].startswith('Invalid JSON')
+    assert rows[2][1] == {RAW_FIELD: '["not", "an", "object"]', ERROR_FIELD: 'Expected a JSON object, got list'}
+
+
+@pytest.mark.asyncio
+async def test_malformed_lines_go_to_retry_file(source, tmp_path):
+    retry_path = tmp_path / 'clients.retry.jsonl'
+    clients = FakeClients()
+    importer = ClientImporter(clients, workers=0, retry_path=str(retry_path))  # type: ignore[arg-type]
+
+    stats = await importer.run(str(source))
+
+    # Импорт не прерывается на битой строке: остальные клиенты отправлены.
+    assert clients.sent == ['79000000001', '79000000002']
+    assert (stats['rows'], stats['created'], stats['invalid'], stats['failed']) == (4, 2, 2, 2)
+    failures = [orjson.loads(line) for line in retry_path.read_bytes().splitlines()]
+    assert [(row[ROW_FIELD], row[RAW_FIELD]) for row in failures] == [
+        (2, '{"name": "broken", "phone":'),
+        (3, '["not", "an", "object"]'),
+    ]
+    assert all(row[ERROR_FIELD] for row in failures)
+
+
+@pytest.mark.asyncio
+async def test_retry_file_keeps_raw_line_on_reimport(source, tmp_path):
+    retry_path = tmp_path / 'clients.retry.jsonl'
+    await ClientImporter(FakeClients(), workers=0, retry_path=str(retry_path)).run(str(source))  # type: ignore
+
+    second_retry = tmp_path / 'second.retry.jsonl'
+    stats = await ClientImporter(FakeClients(), workers=0, retry_path=str(second_retry)).run(  # type: ignore
+        str(retry_path)
+    )
+
+    assert stats['invalid'] == 2
+    assert [orjson.loads(line)[RAW_FIELD] for line in second_retry.read_bytes().splitlines()] == [
+        '{"name": "broken", "phone":',
+        '["not", "an", "object"]',
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'phones, expected',
+    [
+        # Телефон из ответа сопоставлен с нормализованным телефоном строки, а не с первой строкой порции.
+        (['+7 (900) 000-00-02'], [(4, '+7 (900) 000-00-02')]),
+        (['8 900 000 00 02', '+7 900 000 00 01'], [(4, '8 900 000 00 02'), (1, '+7 900 000 00 01')]),
+        # Ошибка без телефона относится к следующей строке порции.
+        ([None, '79000000002'], [(1, None), (4, '79000000002')]),
+    ],
+)
+async def test_rejected_clients_keep_source_row_numbers(source, tmp_path, phones, expected):
+    retry_path = tmp_path / 'clients.retry.jsonl'
+    clients = RejectingClients(phones)
+    await ClientImporter(clients, workers=0, retry_path=str(retry_path)).run(str(source))  # type: ignore[arg-type]
+
+    failures = [orjson.loads(line) for line in retry_path.read_bytes().splitlines()]
+    assert [(row[ROW_FIELD], row.get('phone')) for row in failures if RAW_FIELD not in row] == expected
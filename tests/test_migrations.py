@@ -0,0 +1,62 @@
+import aiosqlite
+import pytest
+import pytest_asyncio
+
+from database.migrations import (
+    HOT_QUERIES,
+    MIGRATIONS,
+    apply_migration,
+    check_query_plans,
+    explain_query_plan,
+    get_schema_version,
+)
+
+# Индекс, которым должен пользоваться каждый запрос горячего пути.
+EXPECTED_INDEXES = {
+    'get_user_by_telegram_id': 'sqlite_autoindex_users_1',
+    'get_user_messages': 'idx_messages_user_id_created_at',
+    'messages_older_than': 'idx_messages_created_at',
+    'get_client_records': 'idx_yclients_records_client_datetime',
+    'get_clients_by_phone': 'idx_yclients_clients_phone',
+}
+
+
+@pytest_asyncio.fixture
+async def conn():
+    async with aiosqlite.connect(':memory:') as conn:
+        await get_schema_version(conn)
+        for migration in MIGRATIONS:
+            await apply_migration(conn, migration)
+            await conn.commit()
+        yield conn
+
+
+@pytest.mark.asyncio
+async def test_migrations_reach_latest_version(conn):
+    assert await get_schema_version(conn) == MIGRATIONS[-1].version
+
+
+def test_every_hot_query_has_expected_index():
+    assert set(EXPECTED_INDEXES) == set(HOT_QUERIES)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+async def test_hot_query_uses_index(conn, name):
+    query, params = HOT_QUERIES[name]
+    plan = await explain_query_plan(conn, query, params)
+
+    assert any(EXPECTED_INDEXES[name] in detail for detail in plan), plan
+    assert not any(detail.startswith('SCAN') or 'TEMP B-TREE' in detail for detail in plan), plan
+
+
+@pytest.mark.asyncio
+async def test_check_query_plans_reports_no_regressions(conn):
+    assert await check_query_plans(conn) == {}
+
+
+@pytest.mark.asyncio
+async def test_check_query_plans_reports_dropped_index(conn):
+    await conn.execute('DROP INDEX idx_messages_created_at;')
+
+    assert 'messages_older_than' in await check_query_plans(conn)
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from database.pool import ConnectionPool
+
+
+@pytest_asyncio.fixture
+async def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), readers=1)
+    await pool.open()
+    yield pool
+    await pool.close()
+
+
+async def select_one(pool: ConnectionPool) -> int:
+    async with pool.reader() as conn:
+        async with conn.execute('SELECT 1;') as cursor:
+            return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+async def test_reader_borrowed_during_close_is_not_reused(pool):
+    async with pool.reader() as borrowed:
+        await pool.close()
+        await pool.open()
+
+    # Соединение прошлого поколения закрыто при возврате, а не выдано снова после повторного открытия.
+    async with pool.reader() as conn:
+        assert conn is not borrowed
+    assert await select_one(pool) == 1
+    with pytest.raises(ValueError):
+        await borrowed.execute('SELECT 1;')
+
+
+@pytest.mark.asyncio
+async def test_close_wakes_readers_waiting_for_connection(pool):
+    async with pool.reader():
+        waiters = [asyncio.create_task(select_one(pool)) for _ in range(3)]
+        await asyncio.sleep(0)
+        await pool.close()
+        results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=1)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    await pool.open()
+    assert await select_one(pool) == 1
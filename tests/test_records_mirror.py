@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from database.database import Database
+from database.records_mirror import RecordsMirror
+from tests.fakes.yclients import record
+from yclients.services.records_service.models._additional import Record
+
+
+class FakeRecords:
+    '''Сервис записей в памяти: фильтрует по времени изменения и запоминает запросы.'''
+
+    def __init__(self, records: list[dict]):
+        self.records = [Record.model_validate(item) for item in records]
+        self.queries = []
+
+    async def iter_records(self, request_model):
+        query = request_model.query
+        self.queries.append(query)
+        for item in self.records:
+            if query.changed_after and item.last_change_date <= datetime.fromisoformat(query.changed_after):
+                continue
+            yield item
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    db = Database(str(tmp_path / 'bot.db'))
+    await db.connect()
+    await db.create_tables()
+    yield db
+    await db.close()
+
+
+async def saved_cursor(db: Database) -> str:
+    async with db.pool.reader() as conn:
+        async with conn.execute('SELECT cursor FROM yclients_sync_state;') as cursor:
+            return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+async def test_cursor_follows_server_change_dates(db):
+    # Часы YClients не совпадают с часами бота: курсор берётся из полученных записей.
+    records = FakeRecords(
+        [record(1, changed='2030-01-01T10:00:00+03:00'), record(2, changed='2030-01-01T10:30:00+03:00')]
+    )
+    mirror = RecordsMirror(db.pool, records, overlap=60)
+
+    assert (await mirror.run_once())['kind'] == 'full'
+    assert await saved_cursor(db) == '2030-01-01T10:30:00+03:00'
+
+    result = await mirror.run_once()
+    assert result == {'kind': 'incremental', 'fetched': 1, 'removed': 0}
+    assert records.queries[-1].changed_after == '2030-01-01T10:29:00+03:00'
+
+    records.records.append(Record.model_validate(record(3, changed='2030-01-01T11:00:00+03:00')))
+    # Запись 2 попадает в запас overlap до курсора и приходит повторно.
+    assert (await mirror.run_once())['fetched'] == 2
+    assert await saved_cursor(db) == '2030-01-01T11:00:00+03:00'
+
+
+@pytest.mark.asyncio
+async def test_cursor_is_kept_when_nothing_changed(db):
+    records = FakeRecords([])
+    mirror = RecordsMirror(db.pool, records)
+
+    before = datetime.now(timezone.utc)
+    await mirror.run_once()
+    first = datetime.fromisoformat(await saved_cursor(db))
+    assert first.tzinfo is not None
+    assert before - timedelta(seconds=1) <= first <= datetime.now(timezone.utc)
+
+    await mirror.run_once()
+    assert datetime.fromisoformat(await saved_cursor(db)) == first
+
+
+@pytest.mark.asyncio
+async def test_mirror_lag(db):
+    assert await db.get_records_mirror_lag() is None
+    await RecordsMirror(db.pool, FakeRecords([])).run_once()
+    assert 0 <= await db.get_records_mirror_lag() < 5
+
+
+@pytest.mark.asyncio
+async def test_mirror_lag_returns_none_on_error(tmp_path):
+    db = Database(str(tmp_path / 'empty.db'))
+    await db.connect()
+    try:
+        # Таблиц ещё нет: ошибка чтения не выходит за пределы метода.
+        assert await db.get_records_mirror_lag() is None
+    finally:
+        await db.close()
@@ -0,0 +1,82 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from yclients.errors import APIError
+from yclients.manager import YClientsManager
+from yclients.retry import RetryPolicy
+from yclients.services.common.enums import HTTPMethod
+
+
+@pytest_asyncio.fixture
+async def flaky_server():
+    '''Сервер, который отвечает 503 на первые `failures` запросов и затем успехом.'''
+    state = {'failures': 1, 'requests': 0}
+
+    async def handle(request: web.Request) -> web.Response:
+        state['requests'] += 1
+        if state['requests'] <= state['failures']:
+            return web.json_response({'success': False, 'meta': {'message': 'unavailable'}}, status=503)
+        return web.json_response({'success': True, 'data': [], 'meta': []})
+
+    app = web.Application()
+    app.router.add_post('/records/1', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    state['url'] = f'http://127.0.0.1:{runner.addresses[0][1]}'
+    yield state
+    await runner.cleanup()
+
+
+def manager_for(url: str, policy: RetryPolicy) -> YClientsManager:
+    return YClientsManager(
+        api_url=url, partner_token='partner', user_token='user', company_id='1', retry_policy=policy, tracer=None
+    )
+
+
+def test_read_only_keeps_policy_settings():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=2.0, deadline=7.0, statuses=frozenset({502}))
+    read_only = policy.read_only()
+
+    assert read_only.methods == frozenset(HTTPMethod)
+    assert (read_only.max_attempts, read_only.base_delay, read_only.max_delay, read_only.deadline) == (5, 0.5, 2.0, 7.0)
+    assert read_only.statuses == frozenset({502})
+    assert not policy.allows(HTTPMethod.POST)
+
+
+@pytest.mark.asyncio
+async def test_read_only_post_is_retried_by_manager_policy(flaky_server):
+    manager = manager_for(flaky_server['url'], RetryPolicy(max_attempts=2, base_delay=0.0))
+    try:
+        assert await manager._make_request(HTTPMethod.POST, '/records/1', data={}, retry_read_only=True) == {
+            'success': True,
+            'data': [],
+            'meta': [],
+        }
+    finally:
+        await manager.close()
+    assert flaky_server['requests'] == 2
+
+
+@pytest.mark.asyncio
+async def test_read_only_post_follows_disabled_retries(flaky_server):
+    # YCLIENTS_RETRY_MAX_ATTEMPTS=1 отключает повторы и для запросов, которые только читают данные.
+    manager = manager_for(flaky_server['url'], RetryPolicy(max_attempts=1))
+    try:
+        with pytest.raises(APIError):
+            await manager._make_request(HTTPMethod.POST, '/records/1', data={}, retry_read_only=True)
+    finally:
+        await manager.close()
+    assert flaky_server['requests'] == 1
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried_by_default(flaky_server):
+    manager = manager_for(flaky_server['url'], RetryPolicy(max_attempts=3, base_delay=0.0))
+    try:
+        with pytest.raises(APIError):
+            await manager._make_request(HTTPMethod.POST, '/records/1', data={})
+    finally:
+        await manager.close()
+    assert flaky_server['requests'] == 1
@@ -0,0 +1,199 @@
+import asyncio
+from datetime import date, datetime
+from pathlib import Path
+
+import orjson
+import pytest
+
+from yclients.services.journal_service.models import JournalSeancesResponse
+from yclients.services.online_bookings_service.models import BookableTimesResponse
+from yclients.services.online_bookings_service.models._additional import StaffSeance
+from yclients.services.services_service.models import ServicesResponse
+from yclients.services.staff_schedule_service.models import GetStaffScheduleResponse
+from yclients.slots import SlotEngine, compare_seances
+
+# Ответы API в формате `python -m benchmarks.yclients_slots --record`: графики с занятыми интервалами,
+# услуги с разной длительностью у сотрудников, сетка журнала и get_bookable_times по наборам услуг.
+FIXTURES = Path(__file__).parent / 'fixtures' / 'yclients_slots.json'
+
+
+@pytest.fixture(scope='module')
+def fixtures() -> dict:
+    return orjson.loads(FIXTURES.read_bytes())
+
+
+def build_engine(fixtures: dict, journal: bool = True) -> SlotEngine:
+    engine = SlotEngine(None, None)  # type: ignore[arg-type]
+    engine.add_schedules(GetStaffScheduleResponse.model_validate(fixtures['schedule']).data)
+    engine.add_services(ServicesResponse.model_validate(fixtures['services']).data)
+    if journal:
+        for key, payload in fixtures['journal'].items():
+            staff_id, day = key.split('/')
+            engine.set_journal(
+                int(staff_id), date.fromisoformat(day), JournalSeancesResponse.model_validate(payload).data
+            )
+    return engine
+
+
+def api_seances(fixtures: dict, group: str) -> list[StaffSeance]:
+    seances = []
+    for key, payload in fixtures['book_times'][group].items():
+        staff_id = int(key.split('/')[0])
+        response = BookableTimesResponse.model_validate(payload)
+        seances.extend(StaffSeance(**seance.model_dump(), staff_id=staff_id) for seance in response.data)
+    return seances
+
+
+def compute(engine: SlotEngine, fixtures: dict, group: str, now: datetime | None = None) -> list[StaffSeance]:
+    days = sorted({schedule['date'] for schedule in fixtures['schedule']['data']})
+    start = date.fromisoformat(days[0])
+    return engine.compute(
+        [int(service_id) for service_id in group.split(',')],
+        start,
+        (date.fromisoformat(days[-1]) - start).days + 1,
+        now=now or datetime.fromisoformat(fixtures['recorded_at']),
+    )
+
+
+@pytest.mark.parametrize('group', ['1', '1,2'])
+def test_engine_matches_recorded_bookable_times(fixtures, group):
+    remote = api_seances(fixtures, group)
+    assert remote
+    assert compare_seances(compute(build_engine(fixtures), fixtures, group), remote) == {'missing': [], 'extra': []}
+
+
+def test_busy_interval_is_excluded(fixtures):
+    times = {seance.time for seance in compute(build_engine(fixtures), fixtures, '1') if seance.staff_id == 1}
+    # Запись 15:30–16:15: сеанс в 15:00 на час в неё не помещается, следующий начинается сразу после неё.
+    assert '15:00' not in times
+    assert '16:15' in times
+
+
+def test_journal_grid_sets_seance_starts(fixtures):
+    remote = api_seances(fixtures, '1')
+    assert compare_seances(compute(build_engine(fixtures), fixtures, '1'), remote)['extra'] == []
+
+    # Без сетки журнала сеансы начинаются с шагом от начала рабочего интервала и расходятся с API.
+    diff = compare_seances(compute(build_engine(fixtures, journal=False), fixtures, '1'), remote)
+    assert diff['missing'] == []
+    assert (2, '2024-10-22', '10:15') in diff['extra']
+
+
+def test_seances_before_now_are_skipped(fixtures):
+    engine = build_engine(fixtures)
+    remote = api_seances(fixtures, '1')
+    assert min(seance.datetime.time() for seance in remote if seance.datetime.date() == date(2024, 10, 21)).hour == 12
+
+    # Расчёт на начало дня возвращает и утренние сеансы, которых API в момент записи уже не отдавал.
+    diff = compare_seances(compute(engine, fixtures, '1', now=datetime(2024, 10, 21)), remote)
+    assert diff['missing'] == []
+    assert (1, '2024-10-21', '10:00') in diff['extra']
+
+
+def test_multi_service_duration_is_summed_per_staff(fixtures):
+    engine = build_engine(fixtures)
+    # Услуга 2 есть только у сотрудника 1: у него сеанс длится 1 ч + 30 мин.
+    assert engine.durations([1, 2]) == {1: 5400}
+    seances = compute(engine, fixtures, '1,2')
+    assert {seance.staff_id for seance in seances} == {1}
+    assert {seance.seance_length for seance in seances} == {5400}
+    assert '13:00' not in {seance.time for seance in seances if seance.datetime.date() == date(2024, 10, 21)}
+
+
+class FakeStaffSchedule:
+    '''Сервис графиков, отвечающий записанными графиками после `release`.'''
+
+    def __init__(self, fixtures: dict):
+        self.response = GetStaffScheduleResponse.model_validate(fixtures['schedule'])
+        self.release = asyncio.Event()
+
+    async def get_staff_schedule(self, request_model):
+        await self.release.wait()
+        return self.response
+
+
+@pytest.mark.asyncio
+async def test_schedules_loaded_during_invalidate_are_discarded(fixtures):
+    staff_schedule = FakeStaffSchedule(fixtures)
+    engine = SlotEngine(staff_schedule, None)  # type: ignore[arg-type]
+    pending = asyncio.create_task(engine.load_schedules(date(2024, 10, 21), date(2024, 10, 22)))
+    await asyncio.sleep(0)
+    engine.invalidate(2, date(2024, 10, 22))
+    staff_schedule.release.set()
+    await pending
+
+    # График сотрудника 2 из ответа, запрошенного до сброса, не сохранён, а его день будет загружен заново.
+    assert engine.stats()['discarded'] == 1
+    assert (2, date(2024, 10, 22)) not in engine._days
+    assert (1, date(2024, 10, 22)) in engine._days
+    assert date(2024, 10, 21) in engine._loaded
+    assert date(2024, 10, 22) not in engine._loaded
+
+
+class FakeServices:
+    def __init__(self, fixtures: dict):
+        self.response = ServicesResponse.model_validate(fixtures['services'])
+
+    async def get_services(self, request_model):
+        return self.response
+
+
+class FakeJournal:
+    '''Сервис журнала, отвечающий записанной сеткой; дни без записи — пустой сеткой.'''
+
+    def __init__(self, fixtures: dict):
+        self.responses = {key: JournalSeancesResponse.model_validate(item) for key, item in fixtures['journal'].items()}
+        self.requests: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def get_journal_seances(self, request_model, staff_id, date):
+        key = f'{staff_id}/{date.isoformat()}'
+        self.requests.append(key)
+        await self.release.wait()
+        return self.responses.get(key) or JournalSeancesResponse(success=True, data=[], meta=None)
+
+
+def engine_with_services(fixtures: dict) -> tuple[SlotEngine, FakeStaffSchedule, FakeJournal]:
+    staff_schedule, journal = FakeStaffSchedule(fixtures), FakeJournal(fixtures)
+    staff_schedule.release.set()
+    engine = SlotEngine(staff_schedule, FakeServices(fixtures), journal=journal)  # type: ignore[arg-type]
+    return engine, staff_schedule, journal
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('group', ['1', '1,2'])
+async def test_free_slots_loads_journal_and_matches_api(fixtures, group):
+    engine, _, journal = engine_with_services(fixtures)
+    service_ids = [int(service_id) for service_id in group.split(',')]
+    now = datetime.fromisoformat(fixtures['recorded_at'])
+
+    local = await engine.free_slots(service_ids, start=date(2024, 10, 21), days=2, now=now)
+
+    assert compare_seances(local, api_seances(fixtures, group)) == {'missing': [], 'extra': []}
+    # Сетка загружается только для дней сотрудников, которые оказывают все услуги.
+    expected = {'1/2024-10-21', '1/2024-10-22'} | ({'2/2024-10-22'} if group == '1' else set())
+    assert set(journal.requests) == expected
+
+    await engine.free_slots(service_ids, start=date(2024, 10, 21), days=2, now=now)
+    assert len(journal.requests) == len(expected)
+
+
+@pytest.mark.asyncio
+async def test_journal_loaded_during_invalidate_is_discarded(fixtures):
+    engine, _, journal = engine_with_services(fixtures)
+    now = datetime.fromisoformat(fixtures['recorded_at'])
+    await engine.free_slots([1], start=date(2024, 10, 21), days=2, now=now)
+
+    engine.invalidate(2, date(2024, 10, 22))
+    journal.release.clear()
+    pending = asyncio.create_task(engine.load_journal(2, date(2024, 10, 22)))
+    await asyncio.sleep(0)
+    engine.invalidate(2)
+    await engine.load_schedules(date(2024, 10, 21), date(2024, 10, 22))
+    journal.release.set()
+    await pending
+
+    # День заново загружен после сброса: сетка из запроса, начатого до сброса, к нему не применяется.
+    assert engine._days[(2, date(2024, 10, 22))].grid is None
+    assert engine.stats()['discarded'] == 1
@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from .services.online_bookings_service import OnlineBookingsService
+from .services.online_bookings_service.models import (
+    BookableDatesQueryParams,
+    BookableDatesRequest,
+    BookableTimesQueryParams,
+    BookableTimesRequest,
+)
+from .services.online_bookings_service.models._additional import Seance
+
+logger = logging.getLogger(__name__)
+
+DatesKey = tuple[tuple[int, ...], int | None]
+TimesKey = tuple[tuple[int, ...], int, date]
+
+
+class AvailabilityIndex:
+    '''
+    Индекс свободного времени для онлайн-записи в памяти.
+
+    Хранит доступные даты по ключу (услуги, сотрудник) и свободные сеансы по ключу (услуги, сотрудник, дата).
+    Ключи, которые запрашивали пользователи, фоновая задача заранее обновляет на `window_days` дней вперёд,
+    поэтому сценарий записи и инструменты ассистента отвечают из памяти. Записи старше `max_age` считаются
+    устаревшими и запрашиваются у API при обращении. После успешного создания или переноса записи
+    затронутые даты сотрудника удаляются из индекса (см. `OnlineBookingsService.add_booking_listener`).
+
+    Чтобы ответ API, запрошенный до инвалидации, не вернул в индекс устаревшие данные, у каждого сотрудника
+    есть поколение, которое увеличивает `invalidate`: ответ сохраняется, только если поколение сотрудника
+    (для дат без сотрудника — общее число инвалидаций) не изменилось за время запроса.
+    '''
+
+    def __init__(
+        self,
+        online_bookings: OnlineBookingsService,
+        window_days: int = 14,
+        refresh_interval: float = 300.0,
+        max_age: float = 600.0,
+        idle_ttl: float = 3600.0,
+        concurrency: int = 4,
+    ):
+        '''
+        Инициализирует индекс.
+
+        Args:
+            online_bookings (OnlineBookingsService): Сервис онлайн-записи.
+            window_days (int): Глубина окна предзагрузки (в днях, начиная с сегодняшнего).
+            refresh_interval (float): Интервал фонового обновления (сек).
+            max_age (float): Максимальный возраст записи индекса, после которого она запрашивается заново (сек).
+            idle_ttl (float): Время, после которого не запрашиваемый пользователями ключ перестаёт
+                обновляться в фоне (сек).
+            concurrency (int): Максимальное число одновременных запросов при фоновом обновлении.
+        '''
+        self.online_bookings = online_bookings
+        self.window_days = window_days
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.idle_ttl = idle_ttl
+        self.concurrency = max(1, concurrency)
+
+        self._dates: dict[DatesKey, tuple[float, list[date]]] = {}
+        self._times: dict[TimesKey, tuple[float, list[Seance]]] = {}
+        self._tracked: dict[DatesKey, float] = {}
+        self._generations: Counter = Counter()
+        self._stats: Counter = Counter()
+        self._task: asyncio.Task | None = None
+
+        online_bookings.add_booking_listener(self.invalidate)
+
+    def start(self):
+        '''Запускает фоновое обновление индекса.'''
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='availability-prefetch')
+
+    async def stop(self):
+        '''Останавливает фоновое обновление индекса.'''
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        '''Цикл фонового обновления.'''
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f'Error refreshing availability index: {e}')
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.monotonic() - fetched_at < self.max_age
+
+    def _generation(self, staff_id: int | None) -> int:
+        # Даты по любому сотруднику зависят от расписаний всех сотрудников.
+        return self._stats['invalidations'] if staff_id is None else self._generations[staff_id]
+
+    async def get_dates(self, service_ids: list[int], staff_id: int | None = None) -> list[date] | None:
+        '''
+        Возвращает даты, на которые есть свободное время.
+
+        Args:
+            service_ids (list[int]): ID услуг.
+            staff_id (int | None): ID сотрудника или None для любого сотрудника.
+
+        Returns:
+            list[date] | None: Доступные даты или None, если API сообщил об ошибке.
+
+        Raises:
+            APIError: Если произошла ошибка при выполнении запроса и в индексе нет даже устаревших данных.
+        '''
+        key = (tuple(sorted(service_ids)), staff_id)
+        self._tracked[key] = time.monotonic()
+        entry = self._dates.get(key)
+        if entry is not None and self._is_fresh(entry[0]):
+            self._stats['hits'] += 1
+            return entry[1]
+
+        self._stats['misses'] += 1
+        try:
+            return await self._fetch_dates(key)
+        except Exception:
+            if entry is None:
+                raise
+            self._stats['stale_served'] += 1
+            logger.warning(f'Serving stale bookable dates for {key}', exc_info=True)
+            return entry[1]
+
+    async def get_times(self, service_ids: list[int], staff_id: int, day: date) -> list[Seance] | None:
+        '''
+        Возвращает свободные сеансы сотрудника на дату.
+
+        Args:
+            service_ids (list[int]): ID услуг.
+            staff_id (int): ID сотрудника.
+            day (date): Дата.
+
+        Returns:
+            list[Seance] | None: Свободные сеансы или None, если API сообщил об ошибке.
+
+        Raises:
+            APIError: Если произошла ошибка при выполнении запроса и в индексе нет даже устаревших данных.
+        '''
+        services = tuple(sorted(service_ids))
+        self._tracked[(services, staff_id)] = time.monotonic()
+        key = (services, staff_id, day)
+        entry = self._times.get(key)
+        if entry is not None and self._is_fresh(entry[0]):
+            self._stats['hits'] += 1
+            return entry[1]
+
+        self._stats['misses'] += 1
+        try:
+            return await self._fetch_times(key)
+        except Exception:
+            if entry is None:
+                raise
+            self._stats['stale_served'] += 1
+            logger.warning(f'Serving stale bookable times for {key}', exc_info=True)
+            return entry[1]
+
+    async def _fetch_dates(self, key: DatesKey) -> list[date] | None:
+        '''Запрашивает доступные даты у API и сохраняет их в индекс, если за время запроса не было инвалидации.'''
+        service_ids, staff_id = key
+        generation = self._generation(staff_id)
+        query = BookableDatesQueryParams(service_ids=list(service_ids))
+        if staff_id is not None:
+            query.staff_id = staff_id
+        response = await self.online_bookings.get_bookable_dates(BookableDatesRequest(query=query))
+        if not response.success:
+            return None
+        if self._generation(staff_id) != generation:
+            self._stats['discarded'] += 1
+        else:
+            self._dates[key] = (time.monotonic(), response.data.booking_dates)
+        return response.data.booking_dates
+
+    async def _fetch_times(self, key: TimesKey) -> list[Seance] | None:
+        '''Запрашивает свободные сеансы у API и сохраняет их в индекс, если за время запроса не было инвалидации.'''
+        service_ids, staff_id, day = key
+        generation = self._generation(staff_id)
+        response = await self.online_bookings.get_bookable_times(
+            staff_id=staff_id,
+            date=day,
+            request_model=BookableTimesRequest(query=BookableTimesQueryParams(service_ids=list(service_ids))),
+        )
+        if not response.success:
+            return None
+        if self._generation(staff_id) != generation:
+            self._stats['discarded'] += 1
+        else:
+            self._times[key] = (time.monotonic(), response.data)
+        return response.data
+
+    async def refresh(self):
+        '''
+        Обновляет индекс для ключей, которые недавно запрашивали пользователи: доступные даты и свободные
+        сеансы на каждую доступную дату в пределах окна. Удаляет прошедшие даты и давно не запрашиваемые ключи.
+        '''
+        started = time.monotonic()
+        today = date.today()
+        horizon = today + timedelta(days=self.window_days)
+
+        for key, last_used in list(self._tracked.items()):
+            if started - last_used > self.idle_ttl:
+                del self._tracked[key]
+        self._dates = {key: entry for key, entry in self._dates.items() if key in self._tracked}
+        self._times = {
+            key: entry for key, entry in self._times.items() if key[2] >= today and (key[0], key[1]) in self._tracked
+        }
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_key(key: DatesKey):
+            async with semaphore:
+                dates = await self._fetch_dates(key)
+            service_ids, staff_id = key
+            if staff_id is None or not dates:
+                return
+            await asyncio.gather(*(refresh_times((service_ids, staff_id, day)) for day in dates if day < horizon))
+
+        async def refresh_times(key: TimesKey):
+            async with semaphore:
+                await self._fetch_times(key)
+
+        results = await asyncio.gather(*(refresh_key(key) for key in self._tracked), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logger.warning(f'Availability refresh: {len(errors)} of {len(results)} keys failed: {errors[0]}')
+
+        self._stats['refreshes'] += 1
+        self._stats['last_refresh_ms'] = int((time.monotonic() - started) * 1000)
+
+    def invalidate(self, staff_id: int, day: date | None = None):
+        '''
+        Удаляет из индекса свободное время сотрудника на дату (или на все даты) и доступные даты,
+        которые от него зависят. Ответы на запросы, начатые до вызова, в индекс не попадут.
+
+        Args:
+            staff_id (int): ID сотрудника.
+            day (date | None): Дата или None для всех дат.
+        '''
+        self._times = {
+            key: entry
+            for key, entry in self._times.items()
+            if not (key[1] == staff_id and (day is None or key[2] == day))
+        }
+        self._dates = {key: entry for key, entry in self._dates.items() if key[1] not in (staff_id, None)}
+        self._generations[staff_id] += 1
+        self._stats['invalidations'] += 1
+
+    def stats(self) -> dict[str, float | int]:
+        '''
+        Возвращает статистику индекса.
+
+        Returns:
+            dict[str, float | int]: Размер индекса, число отслеживаемых ключей, попадания, промахи,
+            отданные устаревшие данные, обновления, инвалидации и ответы, отброшенные из-за инвалидации.
+        '''
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            **self._stats,
+            'tracked': len(self._tracked),
+            'dates_entries': len(self._dates),
+            'times_entries': len(self._times),
+            'hit_ratio': self._stats['hits'] / lookups if lookups else 0.0,
+        }
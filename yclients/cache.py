@@ -0,0 +1,303 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class CachePolicy:
+    '''
+    Политика кэширования класса конечных точек.
+
+    Attributes:
+        ttl (float): Время, в течение которого ответ считается свежим (сек).
+        stale_ttl (float): Время после истечения `ttl`, в течение которого устаревший ответ ещё отдаётся
+            сразу, а в фоне запрашивается новый (stale-while-revalidate).
+    '''
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+
+class CacheBackend:
+    '''
+    Хранилище кэша ответов. Записи — пары (время сохранения по time.time(), ответ API): тело JSON-ответа
+    в байтах или JSON-совместимый словарь.
+
+    Ключ записи начинается с класса конечной точки и пробела, что позволяет удалять записи класса целиком.
+    '''
+
+    async def get(self, key: str) -> tuple[float, Any] | None:
+        '''Возвращает запись (время сохранения, ответ) или None.'''
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, stored_at: float):
+        '''Сохраняет запись.'''
+        raise NotImplementedError
+
+    async def delete_prefix(self, prefix: str):
+        '''Удаляет записи, ключ которых начинается с `prefix` (класс конечной точки и пробел).'''
+        raise NotImplementedError
+
+    async def clear(self):
+        '''Удаляет все записи.'''
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    '''Кэш в памяти процесса с вытеснением давно не использованных записей (LRU).'''
+
+    def __init__(self, max_entries: int = 1024):
+        '''
+        Инициализирует кэш в памяти.
+
+        Args:
+            max_entries (int): Максимальное количество записей.
+        '''
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> tuple[float, Any] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, value: Any, stored_at: float):
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete_prefix(self, prefix: str):
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    async def clear(self):
+        self._entries.clear()
+
+
+class DiskCacheBackend(CacheBackend):
+    '''
+    Кэш на диске: запись — отдельный JSON-файл. Переживает перезапуск процесса.
+
+    Имя файла состоит из хэшей класса конечной точки и ключа, поэтому записи класса удаляются по маске
+    без чтения файлов.
+    '''
+
+    def __init__(self, directory: str):
+        '''
+        Инициализирует кэш на диске.
+
+        Args:
+            directory (str): Каталог для файлов кэша.
+        '''
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha1(value.encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, key: str) -> str:
+        prefix = key.split(' ', 1)[0]
+        return os.path.join(self.directory, f'{self._digest(prefix)}-{self._digest(key)}.json')
+
+    def _read(self, key: str) -> tuple[float, Any] | None:
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+        if entry.get('key') != key:
+            return None
+        value = entry['value']
+        return entry['stored_at'], value.encode('utf-8') if entry.get('raw') else value
+
+    def _write(self, key: str, value: Any, stored_at: float):
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            raw = isinstance(value, bytes)
+            entry = {'key': key, 'stored_at': stored_at, 'value': value.decode('utf-8') if raw else value, 'raw': raw}
+            f.write(orjson.dumps(entry))
+        os.replace(tmp_path, path)
+
+    def _delete(self, file_prefix: str):
+        for name in os.listdir(self.directory):
+            if name.startswith(file_prefix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    async def get(self, key: str) -> tuple[float, Any] | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: Any, stored_at: float):
+        await asyncio.to_thread(self._write, key, value, stored_at)
+
+    async def delete_prefix(self, prefix: str):
+        await asyncio.to_thread(self._delete, f'{self._digest(prefix.rstrip())}-')
+
+    async def clear(self):
+        await asyncio.to_thread(self._delete, '')
+
+
+class ResponseCache:
+    '''
+    Кэш ответов API YClients для конечных точек только для чтения.
+
+    Кэшируются только классы конечных точек, для которых задана политика (см. `endpoint_class`
+    в yclients.manager). Свежий ответ отдаётся из кэша; устаревший, но укладывающийся в `stale_ttl`, —
+    тоже из кэша, а новый запрашивается в фоне; иначе запрос выполняется сразу.
+    '''
+
+    def __init__(self, backend: CacheBackend, policies: dict[str, CachePolicy]):
+        '''
+        Инициализирует кэш ответов.
+
+        Args:
+            backend (CacheBackend): Хранилище записей.
+            policies (dict[str, CachePolicy]): Политики по классам конечных точек.
+        '''
+        self.backend = backend
+        self.policies = policies
+        self._stats: defaultdict[str, Counter] = defaultdict(Counter)
+        self._revalidating: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def parse_policies(value: str | None) -> dict[str, CachePolicy]:
+        '''
+        Разбирает политики кэширования из строки настроек.
+
+        Формат: '/book_services=3600:86400,/company/services=3600' — класс, TTL и (необязательно)
+        время отдачи устаревшего ответа, в секундах.
+
+        Args:
+            value (str | None): Строка настроек.
+
+        Returns:
+            dict[str, CachePolicy]: Политики по классам конечных точек.
+
+        Raises:
+            ValueError: Если строка имеет неверный формат.
+        '''
+        policies = {}
+        for item in filter(None, (part.strip() for part in (value or '').split(','))):
+            try:
+                prefix, limits = item.split('=', 1)
+                ttl, _, stale_ttl = limits.partition(':')
+                policies[prefix.strip().rstrip('/')] = CachePolicy(float(ttl), float(stale_ttl or 0))
+            except ValueError as e:
+                raise ValueError(f'Invalid cache policy "{item}", expected "/endpoint=ttl[:stale_ttl]".') from e
+        return policies
+
+    def policy_for(self, endpoint: str) -> CachePolicy | None:
+        '''
+        Возвращает политику для класса конечной точки.
+
+        Args:
+            endpoint (str): Класс конечной точки.
+
+        Returns:
+            CachePolicy | None: Политика или None, если класс не кэшируется.
+        '''
+        return self.policies.get(endpoint)
+
+    async def get_or_fetch(
+        self,
+        endpoint: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        '''
+        Возвращает ответ из кэша или запрашивает его.
+
+        Args:
+            endpoint (str): Класс конечной точки (должна быть задана политика).
+            key (str): Ключ запроса внутри класса.
+            fetch (Callable[[], Awaitable[Any]]): Фабрика корутины запроса к API.
+
+        Returns:
+            Any: Ответ API.
+        '''
+        policy = self.policies[endpoint]
+        stats = self._stats[endpoint]
+        full_key = f'{endpoint} {key}'
+        entry = await self.backend.get(full_key)
+
+        if entry is not None:
+            stored_at, value = entry
+            age = time.time() - stored_at
+            if age < policy.ttl:
+                stats['hits'] += 1
+                return value
+            if age < policy.ttl + policy.stale_ttl:
+                stats['stale_hits'] += 1
+                self._revalidate(endpoint, full_key, fetch)
+                return value
+
+        stats['misses'] += 1
+        value = await fetch()
+        await self.backend.set(full_key, value, time.time())
+        return value
+
+    def _revalidate(self, endpoint: str, full_key: str, fetch: Callable[[], Awaitable[Any]]):
+        '''Запускает фоновое обновление записи, если оно ещё не идёт.'''
+        if full_key in self._revalidating:
+            return
+
+        async def refresh():
+            try:
+                value = await fetch()
+                await self.backend.set(full_key, value, time.time())
+                self._stats[endpoint]['revalidations'] += 1
+            except Exception as e:
+                self._stats[endpoint]['revalidation_errors'] += 1
+                logger.warning(f'Failed to revalidate cached response {full_key}: {e}')
+            finally:
+                self._revalidating.pop(full_key, None)
+
+        self._revalidating[full_key] = asyncio.create_task(refresh())
+
+    async def invalidate(self, *endpoints: str):
+        '''
+        Удаляет из кэша ответы классов конечных точек (все ответы, если классы не заданы).
+
+        Args:
+            *endpoints (str): Классы конечных точек.
+        '''
+        if not endpoints:
+            await self.backend.clear()
+            for endpoint in self.policies:
+                self._stats[endpoint]['invalidations'] += 1
+            return
+        for endpoint in endpoints:
+            if endpoint in self.policies:
+                await self.backend.delete_prefix(f'{endpoint} ')
+                self._stats[endpoint]['invalidations'] += 1
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        '''
+        Возвращает статистику кэша по классам конечных точек.
+
+        Returns:
+            dict[str, dict[str, float | int]]: Счётчики попаданий (свежих и устаревших), промахов,
+            фоновых обновлений и инвалидаций, а также доля попаданий `hit_ratio`.
+        '''
+        report = {}
+        for endpoint, counters in self._stats.items():
+            hits = counters['hits'] + counters['stale_hits']
+            total = hits + counters['misses']
+            report[endpoint] = {**counters, 'hit_ratio': hits / total if total else 0.0}
+        return report
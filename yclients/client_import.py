@@ -0,0 +1,413 @@
+'''
+Потоковый импорт клиентов в YClients из CSV или JSONL через массовое добавление клиентов.
+
+Запуск:
+    python -m yclients.client_import clients.csv [--checkpoint clients.csv.checkpoint]
+        [--retry-file clients.csv.retry.jsonl] [--batch-size 200] [--concurrency 2] [--workers 2]
+
+Строки, которые не прошли валидацию или были отклонены API, пишутся в файл повторов (JSONL). Файл повторов
+сам является корректным источником импорта: после исправления строк его можно импортировать повторно.
+Строки JSONL, которые не удалось разобрать, попадают в файл повторов как есть (поле `_raw`).
+'''
+
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Any
+
+import orjson
+from pydantic import ValidationError
+
+from .errors import APIError
+from .services.clients_service import ClientsService
+from .services.clients_service.models import (
+    BulkCreateClientsRequest,
+    BulkCreateClientsRequestBody,
+    CreateClientsRequestBody,
+)
+from .services.clients_service.models._additional import ClientRequestData
+
+logger = logging.getLogger(__name__)
+
+# Служебные поля строки в файле повторов: номер строки в исходном файле, причина ошибки и исходный текст
+# строки JSONL, которую не удалось разобрать.
+ROW_FIELD = '_row'
+ERROR_FIELD = '_error'
+RAW_FIELD = '_raw'
+
+Row = tuple[int, dict[str, Any]]
+
+
+def read_rows(path: str, skip: int = 0) -> Iterator[Row]:
+    '''
+    Построчно читает клиентов из CSV (с заголовком) или JSONL.
+
+    Пустые значения CSV пропускаются, значения-массивы и объекты (categories, custom_fields) записываются
+    в CSV как JSON. Строка JSONL, которая не является JSON-объектом, возвращается как исходный текст
+    в поле RAW_FIELD с причиной в ERROR_FIELD: импорт продолжается, а строка попадает в файл повторов.
+
+    Args:
+        path (str): Путь к файлу (.csv или .jsonl).
+        skip (int): Сколько первых строк пропустить (уже импортированные по контрольной точке).
+
+    Yields:
+        Row: Номер строки (с 1, без заголовка) и данные клиента.
+
+    Raises:
+        ValueError: Если формат файла не поддерживается.
+    '''
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row_number, row in enumerate(csv.DictReader(f), start=1):
+                if row_number > skip:
+                    yield row_number, {key: _csv_value(value) for key, value in row.items() if value}
+    elif path.endswith(('.jsonl', '.ndjson')):
+        with open(path, 'rb') as f:
+            for row_number, line in enumerate(filter(bytes.strip, f), start=1):
+                if row_number > skip:
+                    yield row_number, _json_row(line)
+    else:
+        raise ValueError(f'Unsupported import file format: {path}. Expected .csv or .jsonl.')
+
+
+def _json_row(line: bytes) -> dict[str, Any]:
+    '''Разбирает строку JSONL; строку, которая не является JSON-объектом, возвращает как исходный текст.'''
+    try:
+        row = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        error = f'Invalid JSON: {e}'
+    else:
+        if isinstance(row, dict):
+            return row
+        error = f'Expected a JSON object, got {type(row).__name__}'
+    return {RAW_FIELD: line.decode('utf-8', errors='replace').strip(), ERROR_FIELD: error}
+
+
+def _csv_value(value: str) -> Any:
+    '''Разбирает значение-массив или объект, записанное в ячейке CSV как JSON.'''
+    if value[:1] in '[{':
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            pass
+    return value
+
+
+def validate_rows(rows: list[Row]) -> tuple[list[Row], list[Row]]:
+    '''
+    Валидирует строки моделью CreateClientsRequestBody. Выполняется в пуле процессов.
+
+    Args:
+        rows (list[Row]): Строки (номер, данные).
+
+    Returns:
+        tuple[list[Row], list[Row]]: Данные клиентов, прошедших валидацию, и строки файла повторов
+        для не прошедших её.
+    '''
+    valid, invalid = [], []
+    for row_number, row in rows:
+        if RAW_FIELD in row:
+            invalid.append((row_number, _retry_row(row_number, row, row.get(ERROR_FIELD) or 'Invalid JSON')))
+            continue
+        try:
+            client = CreateClientsRequestBody.model_validate(row)
+        except ValidationError as e:
+            invalid.append((row_number, _retry_row(row_number, row, _validation_message(e))))
+        else:
+            valid.append((row_number, client.model_dump(exclude_none=True)))
+    return valid, invalid
+
+
+def _validation_message(error: ValidationError) -> str:
+    return '; '.join(f'{".".join(map(str, item["loc"]))}: {item["msg"]}' for item in error.errors())
+
+
+def _retry_row(row_number: int | None, row: dict[str, Any], error: str) -> dict[str, Any]:
+    '''Формирует строку файла повторов: исходные данные клиента (или исходный текст строки) и служебные поля.'''
+    data = {key: value for key, value in row.items() if not key.startswith('_') or key == RAW_FIELD}
+    return {**data, ROW_FIELD: row_number, ERROR_FIELD: error}
+
+
+def _phone_key(phone: str | None) -> str | None:
+    '''Приводит телефон к цифрам (российские номера — с 7 в начале), чтобы сопоставить ошибку API со строкой.'''
+    if not phone:
+        return None
+    digits = re.sub(r'\D', '', phone)
+    if len(digits) == 11 and digits.startswith('8'):
+        digits = '7' + digits[1:]
+    return digits or None
+
+
+def _rejected_rows(batch: list[Row], errors: list[Any]) -> list[int | None]:
+    '''
+    Находит номера строк порции для ошибок массового добавления.
+
+    API может вернуть телефон в другом формате, поэтому строки сопоставляются по нормализованному телефону.
+    Ошибка, телефон которой не найден, относится к следующей ещё не сопоставленной строке: ошибки идут
+    в порядке клиентов запроса.
+
+    Args:
+        batch (list[Row]): Отправленная порция строк.
+        errors (list[Any]): Ошибки из ответа API.
+
+    Returns:
+        list[int | None]: Номер строки для каждой ошибки; None, если строк не осталось.
+    '''
+    positions: dict[str, list[int]] = {}
+    for position, (_, client) in enumerate(batch):
+        key = _phone_key(client.get('phone'))
+        if key is not None:
+            positions.setdefault(key, []).append(position)
+    matched: set[int] = set()
+    cursor = 0
+    row_numbers: list[int | None] = []
+    for error in errors:
+        candidates = chain(positions.get(_phone_key(error.phone) or '', []), range(cursor, len(batch)))
+        position = next((candidate for candidate in candidates if candidate not in matched), None)
+        if position is None:
+            row_numbers.append(None)
+            continue
+        matched.add(position)
+        cursor = position + 1
+        row_numbers.append(batch[position][0])
+    return row_numbers
+
+
+class ClientImporter:
+    '''
+    Потоковый импорт клиентов через `ClientsService.bulk_add_clients`.
+
+    Файл читается порциями по `batch_size` строк; порции валидируются в пуле процессов и отправляются
+    не более чем `concurrency` запросами одновременно, поэтому в памяти держится не больше `concurrency`
+    порций, а не весь файл. После обработки каждой порции (и всех предыдущих) номер последней обработанной
+    строки сохраняется в контрольную точку; повторный запуск продолжает импорт с неё. Порции, запросы которых
+    были прерваны, отправляются повторно (дубликаты по телефону API отклоняет). Строки, не прошедшие
+    валидацию, отклонённые API или из запросов, завершившихся ошибкой, пишутся в файл повторов.
+    '''
+
+    def __init__(
+        self,
+        clients: ClientsService,
+        batch_size: int = 200,
+        concurrency: int = 2,
+        workers: int = 2,
+        checkpoint_path: str | None = None,
+        retry_path: str | None = None,
+    ):
+        '''
+        Инициализирует импорт.
+
+        Args:
+            clients (ClientsService): Сервис клиентов.
+            batch_size (int): Максимальное количество клиентов в одном запросе массового добавления.
+            concurrency (int): Максимальное количество одновременных запросов.
+            workers (int): Количество процессов валидации (0 - валидация в текущем процессе).
+            checkpoint_path (str | None): Файл контрольной точки (None - без контрольной точки).
+            retry_path (str | None): Файл повторов (None - только лог).
+        '''
+        self.clients = clients
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.workers = max(0, workers)
+        self.checkpoint_path = checkpoint_path
+        self.retry_path = retry_path
+
+        self._stats: Counter = Counter()
+        self._started: float | None = None
+        self._completed: dict[int, int] = {}
+        self._offset = 0
+
+    def _load_checkpoint(self, source: str) -> int:
+        '''Возвращает количество уже обработанных строк источника по контрольной точке.'''
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, 'rb') as f:
+            checkpoint = orjson.loads(f.read())
+        if checkpoint.get('source') != os.path.abspath(source):
+            logger.warning(f'Checkpoint {self.checkpoint_path} belongs to {checkpoint.get("source")}, ignoring it')
+            return 0
+        return int(checkpoint['offset'])
+
+    def _save_checkpoint(self, source: str):
+        '''Атомарно сохраняет контрольную точку.'''
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps({'source': os.path.abspath(source), 'offset': self._offset, 'stats': self.stats()}))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _complete(self, source: str, first_row: int, last_row: int):
+        '''Отмечает порцию обработанной и продвигает контрольную точку по непрерывному префиксу порций.'''
+        self._completed[first_row] = last_row
+        advanced = False
+        while self._offset + 1 in self._completed:
+            self._offset = self._completed.pop(self._offset + 1)
+            advanced = True
+        if advanced:
+            self._save_checkpoint(source)
+
+    def _write_failures(self, rows: list[dict[str, Any]]):
+        '''Дописывает строки в файл повторов.'''
+        if not rows:
+            return
+        self._stats['failed'] += len(rows)
+        if not self.retry_path:
+            for row in rows:
+                logger.warning(f'Client import row {row[ROW_FIELD]} failed: {row[ERROR_FIELD]}')
+            return
+        with open(self.retry_path, 'ab') as f:
+            f.write(b''.join(orjson.dumps(row, default=str) + b'\n' for row in rows))
+
+    async def _send(self, batch: list[Row]) -> list[dict[str, Any]]:
+        '''
+        Отправляет порцию клиентов одним запросом массового добавления.
+
+        Returns:
+            list[dict[str, Any]]: Строки файла повторов для клиентов, которых API не добавил.
+        '''
+        request_model = BulkCreateClientsRequest(
+            body=BulkCreateClientsRequestBody.model_construct(
+                clients=[ClientRequestData.model_construct(**client) for _, client in batch]
+            )
+        )
+        try:
+            response = await self.clients.bulk_add_clients(request_model)
+        except (APIError, ValidationError) as e:
+            logger.error(f'Bulk add of {len(batch)} clients failed: {e}')
+            return [_retry_row(row_number, client, str(e)) for row_number, client in batch]
+
+        self._stats['created'] += len(response.data.created)
+        errors = response.data.errors
+        return [
+            _retry_row(row_number, error.model_dump(exclude={'error'}, exclude_none=True), error.error)
+            for row_number, error in zip(_rejected_rows(batch, errors), errors)
+        ]
+
+    async def _process(self, source: str, executor: Executor | None, rows: list[Row]):
+        '''Валидирует и отправляет порцию строк.'''
+        if executor is None:
+            valid, invalid = validate_rows(rows)
+        else:
+            valid, invalid = await asyncio.get_running_loop().run_in_executor(executor, validate_rows, rows)
+        rejected = await self._send(valid) if valid else []
+
+        # Результаты порции учитываются только после её отправки, чтобы прерванная порция при продолжении
+        # с контрольной точки не попала в файл повторов дважды.
+        self._stats['invalid'] += len(invalid)
+        self._write_failures([row for _, row in invalid] + rejected)
+        self._stats['rows'] += len(rows)
+        if valid:
+            self._stats['batches'] += 1
+            if self._stats['batches'] % 50 == 0:
+                logger.info(f'Client import progress: {self.stats()}')
+        self._complete(source, rows[0][0], rows[-1][0])
+
+    async def run(self, source: str) -> dict[str, float | int]:
+        '''
+        Импортирует клиентов из файла, продолжая с контрольной точки.
+
+        Args:
+            source (str): Путь к файлу (.csv или .jsonl).
+
+        Returns:
+            dict[str, float | int]: Итоговая статистика импорта (см. `stats`).
+
+        Raises:
+            ValueError: Если формат файла не поддерживается.
+        '''
+        self._offset = self._load_checkpoint(source)
+        self._completed.clear()
+        if self._offset:
+            logger.info(f'Resuming client import of {source} after row {self._offset}')
+
+        rows = read_rows(source, skip=self._offset)
+        executor = ProcessPoolExecutor(self.workers) if self.workers else None
+        pending: set[asyncio.Task] = set()
+        self._started = time.perf_counter()
+        try:
+            while True:
+                chunk = await asyncio.to_thread(lambda: list(islice(rows, self.batch_size)))
+                if not chunk:
+                    break
+                while len(pending) >= self.concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                pending.add(asyncio.create_task(self._process(source, executor, chunk)))
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+            if executor is not None:
+                # Ожидание завершения процессов блокировало бы цикл событий: они закрываются в фоне.
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        stats = self.stats()
+        logger.info(f'Client import of {source} finished: {stats}')
+        return stats
+
+    def stats(self) -> dict[str, float | int]:
+        '''
+        Возвращает статистику импорта.
+
+        Returns:
+            dict[str, float | int]: Обработанные строки, добавленные клиенты, строки с ошибками (в том числе
+            не прошедшие валидацию), отправленные порции, номер строки контрольной точки, время и скорость
+            импорта в строках в секунду.
+        '''
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        return {
+            'rows': self._stats['rows'],
+            'created': self._stats['created'],
+            'failed': self._stats['failed'],
+            'invalid': self._stats['invalid'],
+            'batches': self._stats['batches'],
+            'offset': self._offset,
+            'elapsed': round(elapsed, 3),
+            'rows_per_sec': round(self._stats['rows'] / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+async def main(args: argparse.Namespace):
+    from yclients.utils import get_yclients
+
+    yclients = get_yclients()
+    importer = ClientImporter(
+        yclients.clients,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint or f'{args.source}.checkpoint',
+        retry_path=args.retry_file or f'{args.source}.retry.jsonl',
+    )
+    try:
+        stats = await importer.run(args.source)
+    finally:
+        await yclients.close()
+    print(orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == '__main__':
+    from config import settings
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    parser = argparse.ArgumentParser(description='Импорт клиентов в YClients из CSV или JSONL.')
+    parser.add_argument('source', help='Файл клиентов (.csv с заголовком или .jsonl)')
+    parser.add_argument('--checkpoint', help='Файл контрольной точки (по умолчанию <source>.checkpoint)')
+    parser.add_argument('--retry-file', help='Файл повторов (по умолчанию <source>.retry.jsonl)')
+    parser.add_argument('--batch-size', type=int, default=settings.YCLIENTS_IMPORT_BATCH_SIZE)
+    parser.add_argument('--concurrency', type=int, default=settings.YCLIENTS_IMPORT_CONCURRENCY)
+    parser.add_argument('--workers', type=int, default=settings.YCLIENTS_IMPORT_WORKERS)
+    asyncio.run(main(parser.parse_args()))
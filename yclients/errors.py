@@ -36,3 +36,9 @@ class UnprocessableEntityError(APIError):
     '''Исключение для ошибки 422 Unprocessable Entity.'''
 
     pass
+
+
+class RateLimitError(APIError):
+    '''Исключение, если запрос не дождался своей очереди в клиентском ограничителе частоты.'''
+
+    pass
@@ -1,10 +1,19 @@
 from typing import Any
+import asyncio
 import logging
+import re
+import traceback
+import weakref
 import aiohttp
 from aiohttp import ClientError
 import orjson
 
 from .services.common.enums import HTTPMethod
+from .retry import RetryPolicy, RetryStats, DEFAULT_RETRY_POLICY
+from .rate_limit import RateLimiter
+from .single_flight import SingleFlight
+from .cache import ResponseCache
+from .tracing import RequestTracer, preview
 from .errors import (
     APIError,
     BadRequestError,
@@ -16,12 +25,35 @@ from .errors import (
 
 logger = logging.getLogger(__name__)
 
+# Живые менеджеры с открытыми сессиями aiohttp: используется детектором утечек сессий.
+_live_managers: 'weakref.WeakSet[YClientsManager]' = weakref.WeakSet()
+
+SUCCESS_STATUSES = frozenset({200, 201, 202, 204})
+
+# Сегменты пути, которые являются идентификаторами или датами и не входят в класс конечной точки.
+_ID_SEGMENT = re.compile(r'^(\d+|\d{4}-\d{2}-\d{2}.*)$')
+
 
 def orjson_dumps(obj: Any) -> str:
     '''Сериализация объекта в JSON с помощью orjson.'''
     return orjson.dumps(obj).decode('utf-8')
 
 
+def endpoint_class(endpoint: str) -> str:
+    '''
+    Возвращает класс конечной точки — путь без идентификаторов и дат
+    (например, '/book_times/1/2/2024-01-01' -> '/book_times'). Используется как ключ метрик и лимитов.
+
+    Args:
+        endpoint (str): Конечная точка API.
+
+    Returns:
+        str: Класс конечной точки.
+    '''
+    segments = [segment for segment in endpoint.split('/') if segment and not _ID_SEGMENT.match(segment)]
+    return '/' + '/'.join(segments)
+
+
 class YClientsManager:
     '''
     Менеджер для работы с API YClients.
@@ -36,6 +68,17 @@ class YClientsManager:
         user_token: str | None,
         company_id: str,
         lang: str = 'ru-RU',
+        connector_limit: int = 100,
+        connector_limit_per_host: int = 30,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        max_sessions: int = 1,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        coalesce_requests: bool = True,
+        response_cache: ResponseCache | None = None,
+        fast_parse: bool = True,
+        tracer: RequestTracer | None = None,
     ):
         '''
         Инициализирует менеджер YClientsManager.
@@ -46,15 +89,72 @@ class YClientsManager:
             user_token (str | None): Токен пользователя для аутентификации. Может быть None.
             company_id (str): ID компании.
             lang (str, optional): Язык ответов API. По умолчанию - 'ru-RU'.
+            connector_limit (int, optional): Общий лимит одновременных соединений. По умолчанию - 100.
+            connector_limit_per_host (int, optional): Лимит соединений к одному хосту. По умолчанию - 30.
+            keepalive_timeout (float, optional): Время удержания простаивающего соединения (сек). По умолчанию - 30.
+            dns_cache_ttl (int, optional): Время жизни DNS-кэша (сек). По умолчанию - 300.
+            max_sessions (int, optional): Ожидаемое число одновременно открытых сессий в процессе;
+                при превышении пишется предупреждение об утечке. По умолчанию - 1.
+            retry_policy (RetryPolicy | None, optional): Политика повторов по умолчанию для всех запросов.
+            rate_limiter (RateLimiter | None, optional): Ограничитель частоты запросов. По умолчанию - без ограничений.
+            coalesce_requests (bool, optional): Объединять ли одинаковые одновременные GET-запросы.
+                По умолчанию - True.
+            response_cache (ResponseCache | None, optional): Кэш ответов конечных точек только для чтения.
+                По умолчанию - без кэширования.
+            fast_parse (bool, optional): Валидировать успешные JSON-ответы в модели напрямую из байтов тела.
+                По умолчанию - True.
+            tracer (RequestTracer | None, optional): Трассировка запросов. По умолчанию - трассировка
+                всех запросов при включённом DEBUG для логгера `yclients.trace`.
         '''
         self.api_url = api_url.rstrip('/')
         self.partner_token = partner_token
         self.user_token = user_token
         self.company_id = company_id
         self.lang = lang
-        self.client = aiohttp.ClientSession(json_serialize=orjson_dumps)
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.retry_stats = RetryStats()
+        self.rate_limiter = rate_limiter
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.response_cache = response_cache
+        self.fast_parse = fast_parse
+        self.tracer = tracer or RequestTracer()
+        connector = aiohttp.TCPConnector(
+            limit=connector_limit,
+            limit_per_host=connector_limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=dns_cache_ttl,
+        )
+        self.client = aiohttp.ClientSession(connector=connector, json_serialize=orjson_dumps)
+        self._track_session(max_sessions)
         logger.info('YClientsManager инициализирован')
 
+    def _track_session(self, max_sessions: int):
+        '''
+        Регистрирует сессию в детекторе утечек и предупреждает, если в процессе открыто больше сессий,
+        чем ожидается: каждая лишняя сессия — это отдельный пул соединений и TLS-рукопожатия.
+
+        Args:
+            max_sessions (int): Ожидаемое число одновременно открытых сессий.
+        '''
+        alive = [manager for manager in _live_managers if not manager.client.closed]
+        _live_managers.add(self)
+        if len(alive) >= max_sessions:
+            created_at = ''.join(traceback.format_stack(limit=4)[:-2])
+            logger.warning(
+                f'Possible aiohttp session leak: {len(alive) + 1} YClientsManager sessions are open '
+                f'(expected at most {max_sessions}). Reuse the shared YClients instance instead.\n{created_at}'
+            )
+
+    @staticmethod
+    def open_sessions() -> int:
+        '''
+        Возвращает количество открытых сессий YClientsManager в процессе.
+
+        Returns:
+            int: Количество незакрытых сессий.
+        '''
+        return sum(1 for manager in _live_managers if not manager.client.closed)
+
     def _get_headers(self, use_user_token: bool = True) -> dict[str, str]:
         '''
         Возвращает заголовки для запросов к API, включая токены авторизации.
@@ -129,6 +229,46 @@ class YClientsManager:
             response_data = {'text': response_text}
         return response_data
 
+    async def _send(
+        self,
+        method: HTTPMethod,
+        url: str,
+        headers: dict[str, str],
+        params: dict[str, Any] | None,
+        data: dict[str, Any] | None,
+        timeout: float,
+        raw: bool = False,
+    ) -> tuple[int, Any, dict[str, Any] | bytes]:
+        '''
+        Выполняет одну попытку HTTP-запроса.
+
+        Args:
+            method (HTTPMethod): HTTP метод.
+            url (str): Полный URL запроса.
+            headers (dict[str, str]): Заголовки запроса.
+            params (dict[str, Any] | None): Параметры запроса.
+            data (dict[str, Any] | None): Данные для тела запроса.
+            timeout (float): Таймаут попытки (сек).
+            raw (bool): Вернуть тело успешного JSON-ответа в байтах, не разбирая его.
+
+        Returns:
+            tuple[int, Any, dict[str, Any] | bytes]: HTTP-статус, заголовки ответа и распарсенный ответ
+            (или тело в байтах, если запрошено `raw`).
+        '''
+        async with self.client.request(
+            method.value,
+            url,
+            headers=headers,
+            params=params,
+            json=data,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            if raw and response.status in SUCCESS_STATUSES and 'application/json' in response.content_type:
+                body = await response.read()
+                return response.status, response.headers, body or {}
+            response_data = await self._parse_response(response)
+            return response.status, response.headers, response_data
+
     async def _make_request(
         self,
         method: HTTPMethod,
@@ -136,9 +276,12 @@ class YClientsManager:
         params: dict[str, Any] | None = None,
         data: dict[str, Any] | None = None,
         use_user_token: bool = True,
-    ) -> dict[str, Any]:
+        retry_policy: RetryPolicy | None = None,
+        retry_read_only: bool = False,
+        raw: bool = False,
+    ) -> dict[str, Any] | bytes:
         '''
-        Выполняет HTTP-запрос к API YClients.
+        Выполняет HTTP-запрос к API YClients с повторами по политике `retry_policy`.
 
         Args:
             method (HTTPMethod): HTTP метод.
@@ -146,39 +289,85 @@ class YClientsManager:
             params (dict[str, Any] | None): Параметры запроса.
             data (dict[str, Any] | None): Данные для тела запроса.
             use_user_token (bool): Использовать ли токен пользователя.
+            retry_policy (RetryPolicy | None): Политика повторов. По умолчанию - политика менеджера.
+            retry_read_only (bool): Запрос только читает данные: повторять его с любым методом.
+            raw (bool): Вернуть тело успешного JSON-ответа в байтах для разбора напрямую в модель.
 
         Returns:
-            dict[str, Any]: Результат запроса в виде словаря.
+            dict[str, Any] | bytes: Результат запроса в виде словаря или тело ответа в байтах.
 
         Raises:
+            RateLimitError: Если запрос не дождался очереди в ограничителе частоты.
             APIError: Если произошла ошибка при выполнении запроса.
         '''
+        policy = retry_policy or self.retry_policy
+        if retry_read_only:
+            policy = policy.read_only()
         url = f'{self.api_url}{endpoint}'
         headers = self._get_headers(use_user_token)
-        try:
-            logger.debug(f'Sending request: {method.value} {url}\nParams: {params}\nData: {data}')
-            async with self.client.request(
-                method.value,
-                url,
-                headers=headers,
-                params=params,
-                json=data,
-            ) as response:
-                response_data = await self._parse_response(response)
-
-                if response.status in [200, 201, 202, 204]:
-                    logger.debug(f'Successful response [{response.status}]: {response_data}')
+        stats_key = endpoint_class(endpoint)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.retry_stats.record(stats_key, 'attempts')
+            if attempt > 1:
+                self.retry_stats.record(stats_key, 'retries')
+
+            status = None
+            retry_after = None
+            error: Exception | None = None
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(stats_key, max_wait=deadline - loop.time())
+                self.tracer.event('request', method=method.value, url=url, attempt=attempt, params=params, data=data)
+                sent_at = loop.time()
+                status, response_headers, response_data = await self._send(
+                    method, url, headers, params, data, timeout=max(0.0, deadline - loop.time()), raw=raw
+                )
+                self.tracer.event(
+                    'response',
+                    method=method.value,
+                    url=url,
+                    status=status,
+                    elapsed_ms=round((loop.time() - sent_at) * 1000, 1),
+                    body=response_data,
+                )
+                if status in SUCCESS_STATUSES:
                     return response_data
-                else:
-                    logger.error(f'Error response [{response.status}]: {response_data}')
-                    self._handle_http_error(response.status, response_data)
-
-        except ClientError as exc:
-            logger.error(f'Aiohttp client error for URL {url}: {exc}')
-            raise APIError(f'Client error during request to {url}: {exc}') from exc
-        except Exception as e:
-            logger.exception(f'Unexpected error during request to {url}')
-            raise APIError(f'Unexpected error during request to {url}: {e}') from e
+
+                logger.error('Error response [%s]: %s', status, preview(response_data, self.tracer.preview_limit))
+                if not policy.should_retry_status(status):
+                    self.retry_stats.record(stats_key, 'failures')
+                    self._handle_http_error(status, response_data)
+                if status in (429, 503):
+                    retry_after = policy.parse_retry_after(response_headers.get('Retry-After'))
+
+            except (ClientError, asyncio.TimeoutError) as exc:
+                logger.error(f'Aiohttp client error for URL {url}: {exc!r}')
+                error = exc
+            except APIError:
+                raise
+            except Exception as e:
+                self.retry_stats.record(stats_key, 'failures')
+                logger.exception(f'Unexpected error during request to {url}')
+                raise APIError(f'Unexpected error during request to {url}: {e}') from e
+
+            delay = max(policy.backoff(attempt), retry_after or 0.0)
+            remaining = deadline - loop.time()
+            if not policy.allows(method) or attempt >= policy.max_attempts or delay >= remaining:
+                self.retry_stats.record(stats_key, 'failures')
+                if error is not None:
+                    raise APIError(f'Client error during request to {url}: {error!r}') from error
+                self._handle_http_error(status, response_data)  # type: ignore
+
+            logger.warning(
+                f'Retrying {method.value} {endpoint} in {delay:.2f}s '
+                f'(attempt {attempt + 1}/{policy.max_attempts}, status: {status or repr(error)})'
+            )
+            await asyncio.sleep(delay)
 
     async def close(self):
         '''Закрывает сессию aiohttp.ClientSession.'''
@@ -0,0 +1,120 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+R = TypeVar('R')
+T = TypeVar('T')
+
+
+async def _cancel(tasks: list[asyncio.Task]):
+    '''Отменяет задачи и дожидается их завершения.'''
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def iter_pages(
+    fetch_page: Callable[[int], Awaitable[R]],
+    page_items: Callable[[R], list[T]],
+    page_size: int,
+    first_page: int = 1,
+    prefetch: int = 2,
+    page_total: Callable[[R], int | None] | None = None,
+) -> AsyncIterator[T]:
+    '''
+    Асинхронно перебирает элементы постраничного ответа API с нумерованными страницами.
+
+    Следующие страницы запрашиваются заранее, пока вызывающий код обрабатывает текущую: одновременно
+    в полёте не более `prefetch` страниц, поэтому в памяти держится не больше `prefetch` страниц, а не весь
+    результат. Элементы отдаются по мере получения страниц, в порядке страниц. Перебор заканчивается на
+    первой неполной странице или, если известно общее количество элементов (`page_total`), на последней
+    странице. При досрочном выходе из цикла (`break`, исключение) запросы в полёте отменяются — чтобы
+    это произошло сразу, а не при сборке мусора, оборачивайте итератор в `contextlib.aclosing`.
+
+    Args:
+        fetch_page (Callable[[int], Awaitable[R]]): Запрос страницы по номеру.
+        page_items (Callable[[R], list[T]]): Извлекает элементы из ответа.
+        page_size (int): Размер страницы.
+        first_page (int): Номер первой страницы.
+        prefetch (int): Максимальное количество страниц в полёте.
+        page_total (Callable[[R], int | None] | None): Извлекает из ответа общее количество элементов.
+
+    Yields:
+        T: Элементы страниц.
+
+    Raises:
+        APIError: Если произошла ошибка при запросе страницы.
+    '''
+    prefetch = max(1, prefetch)
+    pending: deque[tuple[int, asyncio.Task]] = deque()
+    next_page = first_page
+    last_page: int | None = None
+    try:
+        while True:
+            while len(pending) < prefetch and (last_page is None or next_page <= last_page):
+                pending.append((next_page, asyncio.ensure_future(fetch_page(next_page))))
+                next_page += 1
+            if not pending:
+                return
+
+            _, task = pending.popleft()
+            response = await task
+            items = page_items(response)
+
+            total = page_total(response) if page_total and last_page is None else None
+            if total is not None:
+                last_page = max(first_page - 1, -(-total // page_size))
+            if len(items) < page_size:
+                last_page = next_page - len(pending) - 1
+            if last_page is not None:
+                extra = [task for page, task in pending if page > last_page]
+                pending = deque((page, task) for page, task in pending if page <= last_page)
+                await _cancel(extra)
+
+            for item in items:
+                yield item
+    finally:
+        await _cancel([task for _, task in pending])
+
+
+async def iter_cursor_pages(
+    fetch_page: Callable[[Any], Awaitable[R]],
+    page_items: Callable[[R], list[T]],
+    next_cursor: Callable[[R], Hashable | None],
+    cursor: Hashable | None = None,
+) -> AsyncIterator[T]:
+    '''
+    Асинхронно перебирает элементы постраничного ответа API с курсором (например, датой).
+
+    Курсор следующей страницы известен только из ответа, поэтому страницы запрашиваются последовательно,
+    но следующая страница запрашивается сразу после получения текущей — пока вызывающий код обрабатывает
+    её элементы. Перебор заканчивается, когда курсора следующей страницы нет или он не изменился.
+
+    Args:
+        fetch_page (Callable[[Any], Awaitable[R]]): Запрос страницы по курсору (None — первая страница).
+        page_items (Callable[[R], list[T]]): Извлекает элементы из ответа.
+        next_cursor (Callable[[R], Hashable | None]): Извлекает из ответа курсор следующей страницы.
+        cursor (Hashable | None): Курсор первой страницы.
+
+    Yields:
+        T: Элементы страниц.
+
+    Raises:
+        APIError: Если произошла ошибка при запросе страницы.
+    '''
+    task: asyncio.Task | None = asyncio.ensure_future(fetch_page(cursor))
+    try:
+        while task is not None:
+            response = await task
+            task = None
+            following = next_cursor(response)
+            if following is not None and following != cursor:
+                cursor = following
+                task = asyncio.ensure_future(fetch_page(cursor))
+
+            for item in page_items(response):
+                yield item
+    finally:
+        if task is not None:
+            await _cancel([task])
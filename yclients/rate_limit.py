@@ -0,0 +1,219 @@
+import asyncio
+import time
+
+from .errors import RateLimitError
+
+
+class TokenBucket:
+    '''
+    Корзина токенов с резервированием.
+
+    Каждый запрос сразу резервирует токен, даже если его пока нет: баланс уходит в минус, а запрос ждёт,
+    пока корзина его «отработает». Благодаря этому ожидающие обслуживаются строго в порядке вызова (FIFO),
+    а время ожидания известно заранее — запрос, которому пришлось бы ждать дольше допустимого,
+    отклоняется сразу, не занимая место в очереди.
+    '''
+
+    def __init__(self, rate: float, burst: int):
+        '''
+        Инициализирует корзину.
+
+        Args:
+            rate (float): Скорость пополнения (токенов в секунду).
+            burst (int): Ёмкость корзины — допустимый всплеск запросов.
+
+        Raises:
+            ValueError: Если скорость не положительна.
+        '''
+        if rate <= 0:
+            raise ValueError(f'Rate limit must be positive, got {rate}.')
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+
+        self.waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def _refill(self, now: float):
+        '''Пополняет корзину на момент `now`.'''
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def peek(self, now: float) -> float:
+        '''
+        Возвращает, сколько пришлось бы ждать токен, не резервируя его.
+
+        Args:
+            now (float): Текущее время (time.monotonic()).
+
+        Returns:
+            float: Время ожидания в секундах.
+        '''
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def reserve(self):
+        '''Резервирует один токен.'''
+        self.tokens -= 1
+
+    def release(self):
+        '''Возвращает зарезервированный, но не использованный токен.'''
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def stats(self) -> dict[str, float | int]:
+        '''
+        Возвращает метрики корзины.
+
+        Returns:
+            dict[str, float | int]: Глубина очереди, число выданных и отклонённых запросов,
+            среднее и максимальное время ожидания (сек).
+        '''
+        return {
+            'queue_depth': self.waiting,
+            'acquired': self.acquired,
+            'rejected': self.rejected,
+            'avg_wait': self.total_wait / self.acquired if self.acquired else 0.0,
+            'max_wait': self.max_wait_seen,
+        }
+
+
+class RateLimiter:
+    '''
+    Клиентский ограничитель частоты запросов к API YClients.
+
+    Запрос проходит через общую корзину (квота партнёра) и, если для его класса конечной точки задан
+    отдельный лимит, через корзину этого класса (например, '/book_times' или '/records'). Лимит класса
+    применяется ко всем конечным точкам, путь которых начинается с него.
+    '''
+
+    GLOBAL = '*'
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        endpoint_limits: dict[str, tuple[float, int]] | None = None,
+        max_wait: float = 10.0,
+    ):
+        '''
+        Инициализирует ограничитель.
+
+        Args:
+            rate (float): Общая скорость запросов (в секунду).
+            burst (int): Общий допустимый всплеск запросов.
+            endpoint_limits (dict[str, tuple[float, int]] | None): Лимиты классов конечных точек:
+                класс -> (скорость, всплеск).
+            max_wait (float): Максимальное время ожидания в очереди (сек), после которого запрос
+                отклоняется с RateLimitError.
+        '''
+        self.max_wait = max_wait
+        self.buckets: dict[str, TokenBucket] = {self.GLOBAL: TokenBucket(rate, burst)}
+        for prefix, (endpoint_rate, endpoint_burst) in (endpoint_limits or {}).items():
+            self.buckets[prefix.rstrip('/')] = TokenBucket(endpoint_rate, endpoint_burst)
+        self._resolved: dict[str, list[TokenBucket]] = {}
+
+    @staticmethod
+    def parse_limits(value: str | None) -> dict[str, tuple[float, int]]:
+        '''
+        Разбирает лимиты классов конечных точек из строки настроек.
+
+        Формат: '/book_times=2:4,/records=3:6' — класс, скорость в секунду и всплеск.
+
+        Args:
+            value (str | None): Строка настроек.
+
+        Returns:
+            dict[str, tuple[float, int]]: Лимиты по классам конечных точек.
+
+        Raises:
+            ValueError: Если строка имеет неверный формат.
+        '''
+        limits = {}
+        for item in filter(None, (part.strip() for part in (value or '').split(','))):
+            try:
+                prefix, limit = item.split('=', 1)
+                rate, burst = limit.split(':', 1)
+                limits[prefix.strip()] = (float(rate), int(burst))
+            except ValueError as e:
+                raise ValueError(f'Invalid endpoint rate limit "{item}", expected "/endpoint=rate:burst".') from e
+        return limits
+
+    def _buckets_for(self, endpoint: str) -> list[TokenBucket]:
+        '''
+        Возвращает корзины, через которые проходит запрос: общую и самую точную корзину класса.
+
+        Args:
+            endpoint (str): Класс конечной точки.
+
+        Returns:
+            list[TokenBucket]: Корзины запроса.
+        '''
+        buckets = self._resolved.get(endpoint)
+        if buckets is None:
+            prefixes = [
+                prefix
+                for prefix in self.buckets
+                if prefix != self.GLOBAL and (endpoint == prefix or endpoint.startswith(prefix + '/'))
+            ]
+            buckets = [self.buckets[self.GLOBAL]]
+            if prefixes:
+                buckets.append(self.buckets[max(prefixes, key=len)])
+            self._resolved[endpoint] = buckets
+        return buckets
+
+    async def acquire(self, endpoint: str, max_wait: float | None = None):
+        '''
+        Дожидается разрешения на запрос к конечной точке.
+
+        Args:
+            endpoint (str): Класс конечной точки.
+            max_wait (float | None): Максимальное время ожидания (сек). По умолчанию - `self.max_wait`.
+
+        Raises:
+            RateLimitError: Если разрешение не будет получено за `max_wait`.
+        '''
+        limit = self.max_wait if max_wait is None else min(max_wait, self.max_wait)
+        buckets = self._buckets_for(endpoint)
+        now = time.monotonic()
+        wait = max(bucket.peek(now) for bucket in buckets)
+
+        if wait > limit:
+            for bucket in buckets:
+                bucket.rejected += 1
+            raise RateLimitError(
+                f'Rate limit queue for {endpoint} is too long: would wait {wait:.2f}s (max {limit:.2f}s).',
+                status_code=429,
+            )
+
+        for bucket in buckets:
+            bucket.reserve()
+        if wait > 0:
+            for bucket in buckets:
+                bucket.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                for bucket in buckets:
+                    bucket.release()
+                raise
+            finally:
+                for bucket in buckets:
+                    bucket.waiting -= 1
+
+        for bucket in buckets:
+            bucket.acquired += 1
+            bucket.total_wait += wait
+            bucket.max_wait_seen = max(bucket.max_wait_seen, wait)
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        '''
+        Возвращает метрики всех корзин.
+
+        Returns:
+            dict[str, dict[str, float | int]]: Метрики по корзинам ('*' — общая корзина).
+        '''
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
@@ -0,0 +1,55 @@
+from yclients.yclients import YClients
+
+
+class YClientsRegistry:
+    '''Реестр единственного на процесс экземпляра YClients.
+
+    Все обработчики и AssistantManager должны использовать один и тот же клиент, а значит одну
+    сессию aiohttp и один пул соединений.
+
+    Атрибуты:
+        _yclients (YClients | None): Зарегистрированный экземпляр клиента.
+    '''
+
+    def __init__(self):
+        self._yclients: YClients | None = None
+
+    @property
+    def is_registered(self) -> bool:
+        '''Зарегистрирован ли клиент.'''
+        return self._yclients is not None
+
+    def register(self, yclients: YClients):
+        '''Регистрирует общий экземпляр клиента.
+
+        Параметры:
+            yclients (YClients): Экземпляр клиента YClients API.
+
+        Вызывает:
+            RuntimeError: Если зарегистрирован другой экземпляр.
+        '''
+        if self._yclients is not None and self._yclients is not yclients:
+            raise RuntimeError('Another YClients instance is already registered.')
+        self._yclients = yclients
+
+    def get(self) -> YClients:
+        '''Возвращает общий экземпляр клиента.
+
+        Возвращает:
+            YClients: Зарегистрированный экземпляр клиента.
+
+        Вызывает:
+            RuntimeError: Если клиент ещё не зарегистрирован.
+        '''
+        if self._yclients is None:
+            raise RuntimeError('YClients instance is not registered.')
+        return self._yclients
+
+    async def close(self):
+        '''Закрывает зарегистрированный клиент и очищает реестр.'''
+        if self._yclients is not None:
+            await self._yclients.close()
+            self._yclients = None
+
+
+registry = YClientsRegistry()
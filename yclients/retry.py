@@ -0,0 +1,145 @@
+import random
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .services.common.enums import HTTPMethod
+
+IDEMPOTENT_METHODS = frozenset({HTTPMethod.GET, HTTPMethod.PUT, HTTPMethod.DELETE})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    '''
+    Политика повторных попыток запросов к API YClients.
+
+    Повторяются только запросы с методами из `methods` (по умолчанию — идемпотентные), завершившиеся
+    статусом из `statuses` или сетевой ошибкой. Пауза между попытками — экспоненциальная с полным
+    джиттером; для 429/503 учитывается заголовок `Retry-After`. Все попытки укладываются в общий
+    дедлайн `deadline`.
+    '''
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        deadline: float = 15.0,
+        methods: frozenset[HTTPMethod] = IDEMPOTENT_METHODS,
+        statuses: frozenset[int] = RETRYABLE_STATUSES,
+    ):
+        '''
+        Инициализирует политику повторов.
+
+        Args:
+            max_attempts (int): Максимальное число попыток, включая первую.
+            base_delay (float): Базовая пауза перед повтором (сек).
+            max_delay (float): Максимальная пауза перед повтором (сек).
+            deadline (float): Общий бюджет времени на все попытки (сек).
+            methods (frozenset[HTTPMethod]): Методы, которые разрешено повторять.
+            statuses (frozenset[int]): HTTP-статусы, при которых запрос повторяется.
+        '''
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.methods = methods
+        self.statuses = statuses
+
+    def read_only(self) -> 'RetryPolicy':
+        '''
+        Возвращает копию политики, которая повторяет запросы с любым методом. Нужна для POST-запросов,
+        которые только читают данные (поиск клиентов, визитов, записей): их безопасно повторять.
+
+        Returns:
+            RetryPolicy: Политика с теми же попытками, паузами, дедлайном и статусами.
+        '''
+        return RetryPolicy(
+            max_attempts=self.max_attempts,
+            base_delay=self.base_delay,
+            max_delay=self.max_delay,
+            deadline=self.deadline,
+            methods=frozenset(HTTPMethod),
+            statuses=self.statuses,
+        )
+
+    def allows(self, method: HTTPMethod) -> bool:
+        '''Можно ли повторять запросы с данным методом.'''
+        return self.max_attempts > 1 and method in self.methods
+
+    def should_retry_status(self, status: int) -> bool:
+        '''Нужно ли повторять запрос, завершившийся данным статусом.'''
+        return status in self.statuses
+
+    def backoff(self, attempt: int) -> float:
+        '''
+        Возвращает паузу перед следующей попыткой (экспонента с полным джиттером).
+
+        Args:
+            attempt (int): Номер завершившейся попытки, начиная с 1.
+
+        Returns:
+            float: Пауза в секундах.
+        '''
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        '''
+        Разбирает заголовок `Retry-After` (число секунд или HTTP-дата).
+
+        Args:
+            value (str | None): Значение заголовка.
+
+        Returns:
+            float | None: Пауза в секундах или None, если заголовка нет или он некорректен.
+        '''
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+NO_RETRY_POLICY = RetryPolicy(max_attempts=1)
+
+
+class RetryStats:
+    '''
+    Счётчики попыток запросов по классам конечных точек.
+
+    Для каждого класса считаются `attempts` (все попытки), `retries` (повторные попытки)
+    и `failures` (запросы, завершившиеся ошибкой после всех попыток).
+    '''
+
+    def __init__(self):
+        self._counters: defaultdict[str, Counter] = defaultdict(Counter)
+
+    def record(self, endpoint: str, counter: str):
+        '''
+        Увеличивает счётчик.
+
+        Args:
+            endpoint (str): Класс конечной точки.
+            counter (str): Имя счётчика.
+        '''
+        self._counters[endpoint][counter] += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        '''
+        Возвращает копию счётчиков.
+
+        Returns:
+            dict[str, dict[str, int]]: Счётчики по классам конечных точек.
+        '''
+        return {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
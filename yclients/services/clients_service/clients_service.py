@@ -1,5 +1,9 @@
+from collections.abc import AsyncIterator
+from datetime import date
+
 from ..common.base_service import BaseService
 from ..common.enums import HTTPMethod
+from yclients.pagination import iter_cursor_pages, iter_pages
 
 from .models import (
     GetClientsRequest,
@@ -10,6 +14,7 @@ from .models import (
     BulkCreateClientsResponse,
     GetClientCommentsRequest,
     GetClientRequest,
+    GetClientsResponseData,
     VisitsSearchRequest,
     VisitsSearchResponse,
     GetClientResponse,
@@ -23,6 +28,11 @@ from .models import (
     DeleteClientCommentRequest,
     DeleteClientCommentResponse,
 )
+from .models._additional import Record
+from .utils.get_clients_filters_builder import ClientsSearchRequestBuilder
+
+# Максимальный размер страницы поиска клиентов, допускаемый API.
+CLIENTS_MAX_PAGE_SIZE = 200
 
 
 class ClientsService(BaseService):
@@ -55,6 +65,46 @@ class ClientsService(BaseService):
             request_model=request_model,
             response_model=GetClientsResponse,
             use_user_token=True,
+            retry_read_only=True,
+        )
+
+    def iter_clients(
+        self,
+        builder: ClientsSearchRequestBuilder,
+        prefetch: int = 2,
+    ) -> AsyncIterator[GetClientsResponseData]:
+        '''
+        Перебрать всех клиентов, подходящих под фильтры, постранично.
+
+        Перебор начинается со страницы `builder.page` (по умолчанию с первой) страницами по `builder.page_size`
+        (по умолчанию максимальными). Следующие страницы запрашиваются заранее, пока обрабатывается текущая
+        (см. `yclients.pagination.iter_pages`).
+
+        Args:
+            builder (ClientsSearchRequestBuilder): Построитель запроса поиска клиентов.
+            prefetch (int): Максимальное количество страниц в полёте.
+
+        Returns:
+            AsyncIterator[GetClientsResponseData]: Асинхронный итератор клиентов.
+
+        Raises:
+            ValidationError: Если ответ не соответствует ожидаемой модели.
+            APIError: Если произошла ошибка при выполнении запроса.
+        '''
+        request_model = builder.build()
+        page_size = request_model.body.page_size or CLIENTS_MAX_PAGE_SIZE
+
+        async def fetch_page(page: int) -> GetClientsResponse:
+            body = request_model.body.model_copy(update={'page': page, 'page_size': page_size})
+            return await self.get_clients_list(request_model.model_copy(update={'body': body}))
+
+        return iter_pages(
+            fetch_page,
+            page_items=lambda response: response.data,
+            page_size=page_size,
+            first_page=request_model.body.page or 1,
+            prefetch=prefetch,
+            page_total=lambda response: response.meta.total_count,
         )
 
     async def add_client(
@@ -136,6 +186,40 @@ class ClientsService(BaseService):
             request_model=request_model,
             response_model=VisitsSearchResponse,
             use_user_token=True,
+            retry_read_only=True,
+        )
+
+    def iter_client_visits(
+        self,
+        request_model: VisitsSearchRequest,
+    ) -> AsyncIterator[Record]:
+        '''
+        Перебрать записи из истории посещений клиента, следуя постраничной навигации по дате.
+
+        Следующая страница (с датой начала периода из `meta.dateCursor.next`) запрашивается сразу после
+        получения текущей, пока обрабатываются её записи (см. `yclients.pagination.iter_cursor_pages`).
+
+        Args:
+            request_model (VisitsSearchRequest): Модель данных для поиска визитов клиентов.
+
+        Returns:
+            AsyncIterator[Record]: Асинхронный итератор записей клиента.
+
+        Raises:
+            ValidationError: Если ответ не соответствует ожидаемой модели.
+            APIError: Если произошла ошибка при выполнении запроса.
+        '''
+
+        async def fetch_page(from_date: date | None) -> VisitsSearchResponse:
+            if from_date is None:
+                return await self.search_client_visits(request_model)
+            body = request_model.body.model_copy(update={'from_date': from_date})
+            return await self.search_client_visits(request_model.model_copy(update={'body': body}))
+
+        return iter_cursor_pages(
+            fetch_page,
+            page_items=lambda response: response.data.records,
+            next_cursor=_visits_next_date,
         )
 
     async def get_client(
@@ -165,6 +249,7 @@ class ClientsService(BaseService):
             request_model=request_model,
             response_model=GetClientResponse,
             use_user_token=True,
+            retry_read_only=True,
         )
 
     async def update_client(
@@ -252,6 +337,7 @@ class ClientsService(BaseService):
             request_model=request_model,
             response_model=GetClientCommentsResponse,
             use_user_token=True,
+            retry_read_only=True,
         )
 
     async def create_client_comment(
@@ -313,3 +399,11 @@ class ClientsService(BaseService):
             response_model=DeleteClientCommentResponse,
             use_user_token=True,
         )
+
+
+def _visits_next_date(response: VisitsSearchResponse) -> date | None:
+    '''Возвращает дату начала следующей страницы истории посещений или None, если страниц больше нет.'''
+    cursor = (response.meta.get('dateCursor') or {}).get('next') or {}
+    if not cursor.get('date') or not (cursor.get('count') or cursor.get('has_data')):
+        return None
+    return date.fromisoformat(str(cursor['date'])[:10])
@@ -1,10 +1,13 @@
 import logging
+import orjson
 from pydantic import ValidationError
 from typing import TypeVar, Generic, Type
 
-from yclients.manager import YClientsManager
+from yclients.manager import YClientsManager, endpoint_class
 from yclients.errors import APIError
+from yclients.retry import RetryPolicy
 from .enums import HTTPMethod
+from .parsing import parse_response
 from .models import (
     BaseRequestModel,
     BaseResponseModel,
@@ -38,10 +41,16 @@ class BaseService(Generic[T]):
         response_model: Type[T],
         exclude_unset: bool = True,
         use_user_token: bool = True,
+        retry_policy: RetryPolicy | None = None,
+        retry_read_only: bool = False,
     ) -> T:
         '''
         Выполняет запрос к API и парсит ответ в заданную модель.
 
+        Одинаковые одновременные GET-запросы объединяются (см. `YClientsManager.single_flight`): вызывающие
+        получают один и тот же экземпляр модели ответа, поэтому изменять его нельзя. Ответы конечных точек,
+        для которых задана политика кэширования, берутся из `YClientsManager.response_cache`.
+
         Args:
             method (HTTPMethod): HTTP метод.
             endpoint (str): Конечная точка API.
@@ -49,6 +58,8 @@ class BaseService(Generic[T]):
             response_model (Type[T]): Класс модели для успешного ответа.
             exclude_unset (bool): Исключать ли неустановленные поля из запроса.
             use_user_token (bool): Использовать ли токен пользователя.
+            retry_policy (RetryPolicy | None): Политика повторов для этого метода. По умолчанию - политика менеджера.
+            retry_read_only (bool): Запрос только читает данные: повторять его по политике независимо от метода.
 
         Returns:
             T: Экземпляр модели ответа.
@@ -68,6 +79,7 @@ class BaseService(Generic[T]):
         )
         query_params = (
             request_model.query.model_dump(
+                mode='json',
                 exclude_unset=exclude_unset,
                 by_alias=True,
             )
@@ -75,20 +87,51 @@ class BaseService(Generic[T]):
             else None
         )
         try:
-            self.logger.debug(
-                f'🏗️ Preparing request: {method.value} {endpoint}\n' f'\tBody: {body}\n\tQuery Params: {query_params}'
-            )
-
-            response_data = await self.manager._make_request(
-                method,
-                endpoint,
-                params=query_params,
-                data=body,
-                use_user_token=use_user_token,
-            )
-
-            parsed_response = response_model(**response_data)
-            self.logger.debug(f'✅ Successful API response: {parsed_response}')
+            tracer = self.manager.tracer
+            tracer.begin()
+            tracer.event('prepare', service=self.__class__.__name__, method=method.value, endpoint=endpoint)
+
+            params_key = orjson.dumps(query_params, option=orjson.OPT_SORT_KEYS)
+
+            async def load() -> dict | bytes:
+                return await self.manager._make_request(
+                    method,
+                    endpoint,
+                    params=query_params,
+                    data=body,
+                    use_user_token=use_user_token,
+                    retry_policy=retry_policy,
+                    retry_read_only=retry_read_only,
+                    raw=self.manager.fast_parse,
+                )
+
+            async def fetch() -> T:
+                cache = self.manager.response_cache
+                cache_key = endpoint_class(endpoint)
+                if method == HTTPMethod.GET and cache is not None and cache.policy_for(cache_key):
+                    response_data = await cache.get_or_fetch(
+                        cache_key, f'{endpoint}?{params_key.decode()}#{use_user_token}', load
+                    )
+                else:
+                    response_data = await load()
+                    if method != HTTPMethod.GET and cache is not None:
+                        # Изменяющий запрос делает устаревшими закэшированные ответы того же класса конечных точек.
+                        await cache.invalidate(cache_key)
+                return parse_response(response_model, response_data)
+
+            if method == HTTPMethod.GET and self.manager.single_flight is not None:
+                # Одинаковые одновременные GET-запросы выполняются один раз, модель ответа общая для всех.
+                key = (
+                    method,
+                    endpoint,
+                    params_key,
+                    use_user_token,
+                    response_model,
+                )
+                parsed_response = await self.manager.single_flight.do(key, fetch)
+            else:
+                parsed_response = await fetch()
+            tracer.event('parsed', endpoint=endpoint, model=response_model.__name__, response=parsed_response)
             return parsed_response
 
         except ValidationError as ve:
@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Any, Type, TypeVar
+
+from pydantic import TypeAdapter
+
+from .models import BaseResponseModel
+
+T = TypeVar('T', bound=BaseResponseModel)
+
+
+@lru_cache(maxsize=None)
+def response_adapter(response_model: Type[T]) -> TypeAdapter[T]:
+    '''
+    Возвращает TypeAdapter для модели ответа. Адаптеры создаются один раз на класс и кэшируются.
+
+    Args:
+        response_model (Type[T]): Класс модели ответа.
+
+    Returns:
+        TypeAdapter[T]: Адаптер модели.
+    '''
+    return TypeAdapter(response_model)
+
+
+def parse_response(response_model: Type[T], response_data: bytes | dict[str, Any]) -> T:
+    '''
+    Парсит ответ API в модель.
+
+    Тело ответа в байтах валидируется напрямую из JSON (без промежуточного словаря и копирования в kwargs);
+    словарь — прежним путём, через конструктор модели.
+
+    Args:
+        response_model (Type[T]): Класс модели ответа.
+        response_data (bytes | dict[str, Any]): Тело ответа в байтах или уже разобранный ответ.
+
+    Returns:
+        T: Экземпляр модели ответа.
+
+    Raises:
+        ValidationError: Если ответ не соответствует модели.
+    '''
+    if isinstance(response_data, bytes):
+        return response_adapter(response_model).validate_json(response_data)
+    return response_model(**response_data)
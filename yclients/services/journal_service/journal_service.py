@@ -41,6 +41,7 @@ class JournalService(BaseService):
             request_model=request_model,
             response_model=JournalDatesResponse,
             use_user_token=True,
+            retry_read_only=True,
         )
 
     async def get_journal_seances(
@@ -72,4 +73,5 @@ class JournalService(BaseService):
             request_model=request_model,
             response_model=JournalSeancesResponse,
             use_user_token=True,
+            retry_read_only=True,
         )
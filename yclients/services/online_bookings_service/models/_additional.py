@@ -152,6 +152,13 @@ class Seance(BaseModel):
     )
 
 
+class StaffSeance(Seance):
+    staff_id: int = Field(
+        default=...,
+        description='Идентификатор сотрудника, к которому доступен сеанс',
+    )
+
+
 # endregion
 
 
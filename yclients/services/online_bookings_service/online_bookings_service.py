@@ -1,10 +1,13 @@
-from datetime import date
+import asyncio
+from collections.abc import Callable
+from datetime import date, datetime
 import logging
 from .models import (
     BookableServicesRequest,
     BookableServicesResponse,
     BookableDatesRequest,
     BookableDatesResponse,
+    BookableTimesQueryParams,
     BookableTimesRequest,
     BookableTimesResponse,
     CheckAppointmentsRequest,
@@ -14,7 +17,9 @@ from .models import (
     RescheduleRecordRequest,
     RescheduleRecordResponse,
 )
+from .models._additional import StaffSeance
 from ..common.base_service import BaseService
+from yclients.manager import YClientsManager
 from ..common.enums import HTTPMethod
 
 logger = logging.getLogger(__name__)
@@ -25,6 +30,34 @@ class OnlineBookingsService(BaseService):
     Сервис для работы с онлайн-записями через API YClients.
     '''
 
+    def __init__(self, manager: YClientsManager):
+        '''
+        Инициализирует сервис.
+
+        Args:
+            manager (YClientsManager): Экземпляр менеджера YClientsManager.
+        '''
+        super().__init__(manager)
+        self._booking_listeners: list[Callable[[int, date | None], None]] = []
+
+    def add_booking_listener(self, listener: Callable[[int, date | None], None]):
+        '''
+        Подписывает обработчик на успешное создание и перенос записей: он вызывается с ID сотрудника
+        и датой, свободное время на которую изменилось (None, если дата неизвестна).
+
+        Args:
+            listener (Callable[[int, date | None], None]): Обработчик.
+        '''
+        self._booking_listeners.append(listener)
+
+    def _notify_booking(self, staff_id: int, day: date | None):
+        '''Уведомляет подписчиков об изменении свободного времени сотрудника.'''
+        for listener in self._booking_listeners:
+            try:
+                listener(staff_id, day)
+            except Exception as e:
+                logger.error(f'Booking listener {listener} failed: {e}')
+
     async def get_bookable_services(
         self,
         request_model: BookableServicesRequest,
@@ -110,6 +143,91 @@ class OnlineBookingsService(BaseService):
             use_user_token=True,
         )
 
+    async def get_bookable_times_range(
+        self,
+        staff_ids: list[int],
+        dates: list[date],
+        service_ids: list[int] | None = None,
+        concurrency: int = 4,
+        limit: int | None = None,
+    ) -> list[StaffSeance]:
+        '''
+        Получение свободных сеансов сразу для нескольких специалистов и дат.
+
+        Запросы `get_bookable_times` выполняются параллельно, но не более `concurrency` одновременно
+        и в порядке возрастания дат; каждый запрос проходит через ограничитель частоты менеджера.
+        Если задан `limit`, обход останавливается, как только все даты до некоторой включительно обработаны
+        и на них набралось не меньше `limit` сеансов: более поздние даты ближайших сеансов уже не дадут.
+
+        Args:
+            staff_ids (list[int]): ID специалистов.
+            dates (list[date]): Даты.
+            service_ids (list[int] | None): ID услуг.
+            concurrency (int): Максимальное число одновременных запросов. По умолчанию - 4.
+            limit (int | None): Сколько ближайших сеансов вернуть. По умолчанию - все.
+
+        Returns:
+            list[StaffSeance]: Сеансы, отсортированные по дате и времени, затем по ID специалиста.
+
+        Raises:
+            ValidationError: Если ответ не соответствует ожидаемой модели.
+            APIError: Если произошла ошибка при выполнении запроса.
+        '''
+        jobs = [(day, staff_id) for day in sorted(set(dates)) for staff_id in staff_ids]
+        request_model = BookableTimesRequest(
+            query=BookableTimesQueryParams(service_ids=service_ids) if service_ids else None,
+        )
+        results: dict[tuple[date, int], list[StaffSeance]] = {}
+        pending = iter(jobs)
+
+        def enough() -> bool:
+            # Сеансов достаточно, если их не меньше limit на датах, обработанных без пропусков начиная с самой ранней.
+            found = 0
+            for i, job in enumerate(jobs):
+                if job not in results:
+                    return False
+                found += len(results[job])
+                last_of_day = i + 1 == len(jobs) or jobs[i + 1][0] != job[0]
+                if last_of_day and found >= limit:  # type: ignore
+                    return True
+            return False
+
+        def cancel_others():
+            for task in workers:
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+        async def worker():
+            try:
+                for day, staff_id in pending:
+                    response = await self.get_bookable_times(staff_id=staff_id, date=day, request_model=request_model)
+                    seances = response.data if response.success else []
+                    results[(day, staff_id)] = [
+                        StaffSeance(**seance.model_dump(), staff_id=staff_id) for seance in seances
+                    ]
+                    if limit is not None and enough():
+                        cancel_others()
+                        return
+            except Exception:
+                cancel_others()
+                raise
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(jobs))))]
+        try:
+            await asyncio.wait(workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        for task in workers:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()  # type: ignore
+
+        slots = sorted(
+            (slot for seances in results.values() for slot in seances),
+            key=lambda slot: (slot.datetime, slot.staff_id),
+        )
+        return slots[:limit] if limit is not None else slots
+
     async def check_appointments(
         self,
         request_model: CheckAppointmentsRequest,
@@ -135,6 +253,7 @@ class OnlineBookingsService(BaseService):
             request_model=request_model,
             response_model=CheckAppointmentsResponse,
             use_user_token=True,
+            retry_read_only=True,
         )
 
     async def create_book_record(
@@ -156,13 +275,21 @@ class OnlineBookingsService(BaseService):
         '''
         endpoint = f'/book_record/{self.manager.company_id}'
 
-        return await self.request_and_parse(
+        response = await self.request_and_parse(
             method=HTTPMethod.POST,
             endpoint=endpoint,
             request_model=request_model,
             response_model=BookRecordResponse,
             use_user_token=True,
         )
+        if response.success:
+            for appointment in request_model.body.appointments:
+                try:
+                    day = datetime.fromisoformat(appointment.datetime).date()
+                except ValueError:
+                    day = None
+                self._notify_booking(appointment.staff_id, day)
+        return response
 
     async def reschedule_book_record(
         self,
@@ -185,10 +312,14 @@ class OnlineBookingsService(BaseService):
         '''
         endpoint = f'/book_record/{self.manager.company_id}/{record_id}'
 
-        return await self.request_and_parse(
+        response = await self.request_and_parse(
             method=HTTPMethod.PUT,
             endpoint=endpoint,
             request_model=request_model,
             response_model=RescheduleRecordResponse,
             use_user_token=True,
         )
+        if response.success:
+            # Прежняя дата записи неизвестна, поэтому свободное время сотрудника сбрасывается на все даты.
+            self._notify_booking(response.data.staff.id, None)
+        return response
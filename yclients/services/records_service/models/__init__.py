@@ -1,5 +1,6 @@
 from .requests import (
     CreateRecordRequest,
+    GetRecordsQueryParams,
     GetRecordsRequest,
     GetPartnerRecordsRequest,
     GetRecordRequest,
@@ -18,6 +19,7 @@ from .responses import (
 
 __all__ = [
     'CreateRecordRequest',
+    'GetRecordsQueryParams',
     'GetRecordsRequest',
     'GetPartnerRecordsRequest',
     'GetRecordRequest',
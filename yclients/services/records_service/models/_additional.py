@@ -150,6 +150,34 @@ class Record(BaseModel):
         default=None,
         description='Комментарий к записи',
     )
+    staff_id: int | None = Field(
+        default=None,
+        description='Идентификатор сотрудника',
+    )
+    datetime: dt | None = Field(
+        default=None,
+        description='Дата и время записи',
+    )
+    seance_length: int | None = Field(
+        default=None,
+        description='Длительность сеанса в секундах',
+    )
+    attendance: int | None = Field(
+        default=None,
+        description='Статус посещения',
+    )
+    confirmed: int | None = Field(
+        default=None,
+        description='Статус подтверждения записи',
+    )
+    last_change_date: dt | None = Field(
+        default=None,
+        description='Дата и время последнего изменения записи',
+    )
+    deleted: bool | None = Field(
+        default=None,
+        description='Удалена ли запись',
+    )
 
 
 class StaffPosition(BaseModel):
@@ -13,12 +13,42 @@ class GetRecordsQueryParams(BaseQueryParamsModel):
 
     Аргументы:
     - staff_id: Идентификатор сотрудника (опционально).
+    - page: Номер страницы (опционально).
+    - count: Количество записей на странице (опционально).
+    - start_date: Дата начала периода по дате записи в формате yyyy-mm-dd (опционально).
+    - end_date: Дата конца периода по дате записи в формате yyyy-mm-dd (опционально).
+    - changed_after: Только записи, изменённые после этого момента, в формате ISO 8601 (опционально).
+    - changed_before: Только записи, изменённые до этого момента, в формате ISO 8601 (опционально).
     '''
 
     staff_id: int | None = Field(
         default=None,
         description='Идентификатор сотрудника (необязательно)',
     )
+    page: int | None = Field(
+        default=None,
+        description='Номер страницы (необязательно)',
+    )
+    count: int | None = Field(
+        default=None,
+        description='Количество записей на странице (необязательно)',
+    )
+    start_date: str | None = Field(
+        default=None,
+        description='Дата начала периода в формате yyyy-mm-dd (необязательно)',
+    )
+    end_date: str | None = Field(
+        default=None,
+        description='Дата конца периода в формате yyyy-mm-dd (необязательно)',
+    )
+    changed_after: str | None = Field(
+        default=None,
+        description='Изменённые после этого момента, ISO 8601 (необязательно)',
+    )
+    changed_before: str | None = Field(
+        default=None,
+        description='Изменённые до этого момента, ISO 8601 (необязательно)',
+    )
 
 
 class GetRecordsRequest(BaseRequestModel):
@@ -1,7 +1,10 @@
+from collections.abc import AsyncIterator
+
 from yclients.services.common.base_service import BaseService
 from .models import (
     CreateRecordRequest,
     CreateRecordResponse,
+    GetRecordsQueryParams,
     GetRecordsRequest,
     GetRecordsResponse,
     GetPartnerRecordsRequest,
@@ -14,6 +17,11 @@ from .models import (
     DeleteRecordResponse,
 )
 from ..common.enums import HTTPMethod
+from .models._additional import Record
+from yclients.pagination import iter_pages
+
+# Размер страницы при постраничном переборе записей.
+RECORDS_PAGE_SIZE = 100
 
 
 class RecordsService(BaseService):
@@ -46,6 +54,47 @@ class RecordsService(BaseService):
             request_model=request_model,
             response_model=GetRecordsResponse,
             use_user_token=True,
+            retry_read_only=True,
+        )
+
+    def iter_records(
+        self,
+        request_model: GetRecordsRequest | None = None,
+        prefetch: int = 2,
+    ) -> AsyncIterator[Record]:
+        '''
+        Перебрать все записи компании постранично.
+
+        Перебор начинается со страницы `query.page` (по умолчанию с первой) страницами по `query.count`
+        (по умолчанию RECORDS_PAGE_SIZE). Следующие страницы запрашиваются заранее, пока обрабатывается
+        текущая (см. `yclients.pagination.iter_pages`).
+
+        Args:
+            request_model (GetRecordsRequest | None): Модель данных запроса (фильтры).
+            prefetch (int): Максимальное количество страниц в полёте.
+
+        Returns:
+            AsyncIterator[Record]: Асинхронный итератор записей.
+
+        Raises:
+            ValidationError: Если ответ не соответствует ожидаемой модели.
+            APIError: Если произошла ошибка при выполнении запроса.
+        '''
+        request_model = request_model or GetRecordsRequest()
+        query = request_model.query or GetRecordsQueryParams()
+        page_size = query.count or RECORDS_PAGE_SIZE
+
+        async def fetch_page(page: int) -> GetRecordsResponse:
+            page_query = query.model_copy(update={'page': page, 'count': page_size})
+            return await self.get_records(request_model.model_copy(update={'query': page_query}))
+
+        return iter_pages(
+            fetch_page,
+            page_items=lambda response: response.data,
+            page_size=page_size,
+            first_page=query.page or 1,
+            prefetch=prefetch,
+            page_total=lambda response: response.meta.get('total_count'),
         )
 
     async def create_record(
@@ -100,6 +149,7 @@ class RecordsService(BaseService):
             request_model=request_model,
             response_model=GetPartnerRecordsResponse,
             use_user_token=True,
+            retry_read_only=True,
         )
 
     async def get_record(
@@ -129,6 +179,7 @@ class RecordsService(BaseService):
             request_model=request_model,
             response_model=GetRecordResponse,
             use_user_token=True,
+            retry_read_only=True,
         )
 
     async def update_record(
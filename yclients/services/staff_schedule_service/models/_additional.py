@@ -46,7 +46,6 @@ class StaffScheduleData(BaseModel):
     )
     date: d = Field(
         default=...,
-        pattern=r'^\d{4}-\d{2}-\d{2}$',
         description='Дата расписания',
     )
     slots: list[TimeSlot] = Field(
@@ -1,6 +1,5 @@
-from datetime import datetime as d
 from pydantic import Field
-from typing import Literal
+from typing import Annotated, Literal
 from ...common.models import BaseRequestModel, BaseQueryParamsModel, BaseBodyModel
 from ._additional import StaffScheduleData, DeleteSchedule
 
@@ -19,23 +18,24 @@ class GetStaffScheduleQueryParams(BaseQueryParamsModel):
     - include: Сущности для включения в ответ (опционально).
     '''
 
-    start_date: d | None = Field(
+    start_date: str | None = Field(
         default=None,
         pattern=r'^\d{4}-\d{2}-\d{2}$',
         description='Дата начала поиска расписаний сотрудников в формате Y-m-d',
     )
-    end_date: d | None = Field(
+    end_date: str | None = Field(
         default=None,
         pattern=r'^\d{4}-\d{2}-\d{2}$',
         description='Дата окончания поиска расписаний сотрудников в формате Y-m-d',
     )
-    staff_ids: list[int] | None = Field(
+    staff_ids: list[Annotated[int, Field(ge=1)]] | None = Field(
         default=None,
-        ge=1,
+        serialization_alias='staff_ids[]',
         description='Набор идентификаторов сотрудников для поиска расписаний',
     )
     include: list[Literal['busy_intervals', 'off_day_type']] | None = Field(
         default=None,
+        serialization_alias='include[]',
         description='Сущности, которые должны быть включены в ответ',
     )
 
@@ -0,0 +1,79 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    '''
+    Объединение одинаковых одновременных запросов (single-flight).
+
+    Первый вызов с данным ключом запускает запрос в отдельной задаче, все последующие вызовы с тем же ключом,
+    пришедшие до его завершения, ждут ту же задачу и получают тот же результат (или то же исключение).
+    Отмена одного из ожидающих не отменяет запрос для остальных; запрос отменяется, только когда
+    его перестали ждать все.
+    '''
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        '''
+        Выполняет запрос или присоединяется к уже выполняющемуся запросу с тем же ключом.
+
+        Args:
+            key (Hashable): Ключ запроса.
+            factory (Callable[[], Awaitable[Any]]): Фабрика корутины запроса; вызывается, только если
+                такого запроса ещё нет в полёте.
+
+        Returns:
+            Any: Результат запроса.
+        '''
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0:
+                    task.cancel()
+            raise
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        '''Удаляет завершённый запрос из таблицы запросов в полёте.'''
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+
+    @property
+    def inflight(self) -> int:
+        '''Количество запросов в полёте.'''
+        return len(self._inflight)
+
+    def stats(self) -> dict[str, float | int]:
+        '''
+        Возвращает метрики объединения запросов.
+
+        Returns:
+            dict[str, float | int]: Число вызовов, объединённых вызовов, запросов к API,
+            доля объединённых вызовов и число запросов в полёте.
+        '''
+        return {
+            'calls': self.calls,
+            'shared': self.shared,
+            'upstream': self.calls - self.shared,
+            'shared_ratio': self.shared / self.calls if self.calls else 0.0,
+            'inflight': self.inflight,
+        }
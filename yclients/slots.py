@@ -0,0 +1,492 @@
+import asyncio
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, tzinfo
+
+from .services.journal_service import JournalService
+from .services.journal_service.models import JournalSeancesQueryParams, JournalSeancesRequest
+from .services.journal_service.models._additional import JournalSeance
+from .services.online_bookings_service.models._additional import StaffSeance
+from .services.services_service import ServicesService
+from .services.services_service.models import ServicesRequest, ServicesRequestQueryParams
+from .services.services_service.models._additional import ServiceModel
+from .services.staff_schedule_service import StaffScheduleService
+from .services.staff_schedule_service.models import GetStaffScheduleRequest
+from .services.staff_schedule_service.models._additional import StaffScheduleData
+from .services.staff_schedule_service.models.requests import GetStaffScheduleQueryParams
+
+DayKey = tuple[int, date]
+
+
+def seconds(value: str) -> int:
+    '''
+    Переводит время суток ('HH:MM' или 'HH:MM:SS') в секунды от полуночи. '24:00' — конец суток.
+
+    Args:
+        value (str): Время суток.
+
+    Returns:
+        int: Секунды от полуночи.
+    '''
+    parts = [int(part) for part in value.split(':')]
+    return parts[0] * 3600 + parts[1] * 60 + (parts[2] if len(parts) > 2 else 0)
+
+
+def merge(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    '''
+    Сортирует интервалы и объединяет пересекающиеся и смежные.
+
+    Args:
+        intervals (list[tuple[int, int]]): Интервалы [начало, конец) в секундах.
+
+    Returns:
+        list[tuple[int, int]]: Непересекающиеся интервалы по возрастанию.
+    '''
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(intervals: list[tuple[int, int]], busy: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    '''
+    Вычитает занятые интервалы из рабочих за один проход по двум отсортированным массивам.
+
+    Args:
+        intervals (list[tuple[int, int]]): Непересекающиеся рабочие интервалы по возрастанию.
+        busy (list[tuple[int, int]]): Непересекающиеся занятые интервалы по возрастанию.
+
+    Returns:
+        list[tuple[int, int]]: Свободные интервалы по возрастанию.
+    '''
+    free: list[tuple[int, int]] = []
+    i = 0
+    for start, end in intervals:
+        while i < len(busy) and busy[i][1] <= start:
+            i += 1
+        j = i
+        while j < len(busy) and busy[j][0] < end:
+            if busy[j][0] > start:
+                free.append((start, busy[j][0]))
+            start = max(start, busy[j][1])
+            j += 1
+        if start < end:
+            free.append((start, end))
+    return free
+
+
+class StaffDay:
+    '''
+    Рабочий день сотрудника: рабочие интервалы и свободные интервалы в виде отсортированных массивов
+    начал и концов (в секундах от полуночи) и, если известна, сетка начала сеансов из журнала
+    с моментом её загрузки.
+    '''
+
+    __slots__ = ('work', 'starts', 'ends', 'grid', 'grid_loaded_at')
+
+    def __init__(self, schedule: StaffScheduleData):
+        self.work = merge([(seconds(slot.from_time), seconds(slot.to_time)) for slot in schedule.slots])
+        busy = merge([(seconds(item.from_time), seconds(item.to_time)) for item in schedule.busy_intervals or []])
+        free = subtract(self.work, busy)
+        self.starts = [start for start, _ in free]
+        self.ends = [end for _, end in free]
+        self.grid: list[int] | None = None
+        self.grid_loaded_at: float | None = None
+
+    def candidates(self, step: int) -> list[int]:
+        '''Возможные начала сеансов: сетка журнала или шаг `step` от начала каждого рабочего интервала.'''
+        if self.grid is not None:
+            return self.grid
+        return [start for work_start, work_end in self.work for start in range(work_start, work_end, step)]
+
+    def free_starts(self, length: int, step: int, not_before: int = 0) -> list[int]:
+        '''
+        Возвращает начала сеансов длительностью `length`, которые помещаются в свободное время.
+        Кандидаты и свободные интервалы отсортированы, поэтому проверка — один совместный проход.
+        '''
+        result = []
+        i = 0
+        for start in self.candidates(step):
+            if start < not_before:
+                continue
+            while i < len(self.ends) and self.ends[i] < start + length:
+                i += 1
+            if i == len(self.ends):
+                break
+            if self.starts[i] <= start:
+                result.append(start)
+        return result
+
+
+class SlotEngine:
+    '''
+    Локальный расчёт свободного времени для онлайн-записи.
+
+    Вместо запроса свободных сеансов по каждому сотруднику и дню (`get_bookable_times`) движок одним запросом
+    загружает графики работы сотрудников с занятыми интервалами (`get_staff_schedule`) на весь период,
+    хранит для каждого дня сотрудника свободные интервалы в виде отсортированных массивов и подбирает
+    начала сеансов с учётом длительности услуг у конкретного сотрудника. Начала сеансов берутся из сетки
+    журнала, которую `free_slots` загружает для каждого дня сотрудника (не более `concurrency` запросов
+    одновременно); без сервиса журнала — с шагом `step` от начала рабочего интервала, и тогда результат
+    может расходиться с `get_bookable_times`.
+
+    Дни, загруженные раньше `max_age`, загружаются заново; после создания или переноса записи день
+    сотрудника сбрасывается (см. `OnlineBookingsService.add_booking_listener`); графики сотрудника, сброшенного
+    во время загрузки, из её ответа не сохраняются. Результат можно сверить
+    с `get_bookable_times` функцией `compare_seances`.
+
+    Движок пока не подключён к обработчикам и инструментам ассистента: они получают свободное время через
+    индекс доступности (`YClients.availability`).
+    '''
+
+    def __init__(
+        self,
+        staff_schedule: StaffScheduleService,
+        services: ServicesService,
+        journal: JournalService | None = None,
+        step: int = 900,
+        max_age: float = 600.0,
+        timezone: tzinfo | None = None,
+        concurrency: int = 4,
+    ):
+        '''
+        Инициализирует движок.
+
+        Args:
+            staff_schedule (StaffScheduleService): Сервис графиков работы сотрудников.
+            services (ServicesService): Сервис услуг (длительности услуг по сотрудникам).
+            journal (JournalService | None): Сервис журнала для загрузки сетки сеансов.
+            step (int): Шаг начала сеансов без сетки журнала (в секундах).
+            max_age (float): Время, после которого загруженные данные запрашиваются заново (сек).
+            timezone (tzinfo | None): Часовой пояс филиала для `datetime` сеансов.
+            concurrency (int): Максимальное число одновременных запросов сетки журнала.
+        '''
+        self.staff_schedule = staff_schedule
+        self.services = services
+        self.journal = journal
+        self.step = max(60, step)
+        self.max_age = max_age
+        self.timezone = timezone
+        self.concurrency = max(1, concurrency)
+
+        self._days: dict[DayKey, StaffDay] = {}
+        self._loaded: dict[date, float] = {}
+        self._durations: dict[int, dict[int, int]] = {}
+        self._durations_loaded_at: float | None = None
+        self._generations: Counter = Counter()
+        self._stats: Counter = Counter()
+
+    def _is_fresh(self, loaded_at: float | None) -> bool:
+        return loaded_at is not None and time.monotonic() - loaded_at < self.max_age
+
+    def add_schedules(self, schedules: list[StaffScheduleData]):
+        '''
+        Добавляет графики работы сотрудников (с занятыми интервалами) в движок.
+
+        Args:
+            schedules (list[StaffScheduleData]): Графики по сотрудникам и датам.
+        '''
+        for schedule in schedules:
+            key = (schedule.staff_id, schedule.date)
+            day = StaffDay(schedule)
+            if key in self._days:
+                day.grid = self._days[key].grid
+                day.grid_loaded_at = self._days[key].grid_loaded_at
+            self._days[key] = day
+
+    def add_services(self, services: list[ServiceModel]):
+        '''
+        Добавляет длительности услуг по сотрудникам.
+
+        Args:
+            services (list[ServiceModel]): Услуги со списками сотрудников.
+        '''
+        for service in services:
+            self._durations[service.id] = {staff.id: staff.seance_length for staff in service.staff}
+        self._durations_loaded_at = time.monotonic()
+
+    def set_journal(self, staff_id: int, day: date, seances: list[JournalSeance]):
+        '''
+        Задаёт сетку начала сеансов дня сотрудника из журнала.
+
+        Args:
+            staff_id (int): ID сотрудника.
+            day (date): Дата.
+            seances (list[JournalSeance]): Сеансы журнала.
+        '''
+        staff_day = self._days.get((staff_id, day))
+        if staff_day is not None:
+            staff_day.grid = sorted({seconds(seance.time) for seance in seances})
+            staff_day.grid_loaded_at = time.monotonic()
+
+    async def load_schedules(self, start: date, end: date, staff_ids: list[int] | None = None):
+        '''
+        Загружает графики работы с занятыми интервалами за период одним запросом. Графики сотрудников,
+        сброшенных через `invalidate` во время запроса, отбрасываются, а их дни не считаются загруженными.
+
+        Args:
+            start (date): Первая дата периода.
+            end (date): Последняя дата периода.
+            staff_ids (list[int] | None): ID сотрудников или None для всех.
+
+        Raises:
+            APIError: Если произошла ошибка при выполнении запроса.
+        '''
+        query = GetStaffScheduleQueryParams(
+            start_date=start.isoformat(),
+            end_date=end.isoformat(),
+            include=['busy_intervals'],
+        )
+        if staff_ids:
+            query.staff_ids = staff_ids
+        generations = self._generations.copy()
+        response = await self.staff_schedule.get_staff_schedule(GetStaffScheduleRequest(query=query))
+        self._stats['schedule_requests'] += 1
+        schedules, stale_days = [], set()
+        for schedule in response.data:
+            if self._generations[schedule.staff_id] != generations[schedule.staff_id]:
+                stale_days.add(schedule.date)
+            else:
+                schedules.append(schedule)
+        self._stats['discarded'] += len(response.data) - len(schedules)
+        self.add_schedules(schedules)
+        if not staff_ids:
+            # Ответ по всем сотрудникам полностью заменяет период: дней, которых в нём нет, больше нет в графике.
+            received = {(schedule.staff_id, schedule.date) for schedule in response.data}
+            self._days = {key: day for key, day in self._days.items() if key in received or not start <= key[1] <= end}
+            loaded_at = time.monotonic()
+            for offset in range((end - start).days + 1):
+                day = start + timedelta(days=offset)
+                if day not in stale_days:
+                    self._loaded[day] = loaded_at
+
+    async def load_durations(self):
+        '''
+        Загружает длительности услуг по сотрудникам.
+
+        Raises:
+            APIError: Если произошла ошибка при выполнении запроса.
+        '''
+        response = await self.services.get_services(ServicesRequest(query=ServicesRequestQueryParams()))
+        self._stats['services_requests'] += 1
+        if isinstance(response.data, list):
+            self.add_services(response.data)
+
+    async def load_journal(self, staff_id: int, day: date):
+        '''
+        Загружает сетку начала сеансов дня сотрудника из журнала. Если день сотрудника сброшен через
+        `invalidate` во время запроса, ответ отбрасывается.
+
+        Args:
+            staff_id (int): ID сотрудника.
+            day (date): Дата.
+
+        Raises:
+            APIError: Если произошла ошибка при выполнении запроса.
+        '''
+        if self.journal is None:
+            return
+        generation = self._generations[staff_id]
+        response = await self.journal.get_journal_seances(
+            JournalSeancesRequest(query=JournalSeancesQueryParams(date=day, staff_id=staff_id)),
+            staff_id=staff_id,
+            date=day,
+        )
+        self._stats['journal_requests'] += 1
+        if self._generations[staff_id] != generation:
+            self._stats['discarded'] += 1
+        elif response.success:
+            self.set_journal(staff_id, day, response.data)
+
+    async def _load_journals(self, keys: list[DayKey]):
+        '''Загружает сетку журнала для дней сотрудников, не более `concurrency` запросов одновременно.'''
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(staff_id: int, day: date):
+            async with semaphore:
+                await self.load_journal(staff_id, day)
+
+        await asyncio.gather(*(load(staff_id, day) for staff_id, day in keys))
+
+    def durations(self, service_ids: list[int]) -> dict[int, int]:
+        '''
+        Возвращает суммарную длительность услуг у каждого сотрудника, который оказывает их все.
+
+        Args:
+            service_ids (list[int]): ID услуг.
+
+        Returns:
+            dict[int, int]: Длительность в секундах по ID сотрудника.
+        '''
+        staff_lengths = [self._durations.get(service_id, {}) for service_id in service_ids]
+        if not staff_lengths:
+            return {}
+        staff_ids = set(staff_lengths[0]).intersection(*staff_lengths[1:])
+        return {staff_id: sum(lengths[staff_id] for lengths in staff_lengths) for staff_id in staff_ids}
+
+    async def free_slots(
+        self,
+        service_ids: list[int],
+        start: date | None = None,
+        days: int = 30,
+        staff_ids: list[int] | None = None,
+        limit: int | None = None,
+        now: datetime | None = None,
+    ) -> list[StaffSeance]:
+        '''
+        Возвращает свободные сеансы на услуги за период.
+
+        Недостающие или устаревшие данные загружаются заранее: графики за весь период — одним запросом,
+        длительности услуг — одним запросом, сетка журнала — по запросу на каждый рабочий день сотрудников,
+        оказывающих услуги; затем сеансы рассчитываются локально (см. `compute`). Без сервиса журнала
+        начала сеансов берутся с шагом `step` и могут не совпадать с `get_bookable_times`.
+
+        Args:
+            service_ids (list[int]): ID услуг.
+            start (date | None): Первая дата периода. По умолчанию - сегодня.
+            days (int): Длина периода в днях.
+            staff_ids (list[int] | None): ID сотрудников или None для всех, кто оказывает услуги.
+            limit (int | None): Сколько ближайших сеансов вернуть. По умолчанию - все.
+            now (datetime | None): Текущий момент по времени филиала. По умолчанию - сейчас.
+
+        Returns:
+            list[StaffSeance]: Сеансы, отсортированные по дате и времени, затем по ID специалиста.
+
+        Raises:
+            APIError: Если произошла ошибка при загрузке данных.
+        '''
+        now = now or datetime.now(self.timezone)
+        start = start or now.date()
+        period = [start + timedelta(days=offset) for offset in range(max(1, days))]
+
+        if not self._is_fresh(self._durations_loaded_at):
+            await self.load_durations()
+        stale = [day for day in period if not self._is_fresh(self._loaded.get(day))]
+        if stale:
+            await self.load_schedules(stale[0], stale[-1])
+        else:
+            self._stats['hits'] += 1
+        if self.journal is not None:
+            lengths = self.durations(service_ids)
+            keys = [
+                (staff_id, day)
+                for day in period
+                if day >= now.date()
+                for staff_id in sorted(lengths)
+                if (staff_ids is None or staff_id in staff_ids)
+                and (staff_id, day) in self._days
+                and not self._is_fresh(self._days[(staff_id, day)].grid_loaded_at)
+            ]
+            await self._load_journals(keys)
+        return self.compute(service_ids, start, days, staff_ids=staff_ids, limit=limit, now=now)
+
+    def compute(
+        self,
+        service_ids: list[int],
+        start: date,
+        days: int,
+        staff_ids: list[int] | None = None,
+        limit: int | None = None,
+        now: datetime | None = None,
+    ) -> list[StaffSeance]:
+        '''
+        Рассчитывает свободные сеансы по уже загруженным данным за один проход по дням сотрудников,
+        без запросов к API. Сеансы раньше `now` не возвращаются.
+
+        Args:
+            service_ids (list[int]): ID услуг.
+            start (date): Первая дата периода.
+            days (int): Длина периода в днях.
+            staff_ids (list[int] | None): ID сотрудников или None для всех, кто оказывает услуги.
+            limit (int | None): Сколько ближайших сеансов вернуть. По умолчанию - все.
+            now (datetime | None): Текущий момент по времени филиала. По умолчанию - сейчас.
+
+        Returns:
+            list[StaffSeance]: Сеансы, отсортированные по дате и времени, затем по ID специалиста.
+        '''
+        started = time.perf_counter()
+        now = now or datetime.now(self.timezone)
+        lengths = self.durations(service_ids)
+        if staff_ids is not None:
+            lengths = {staff_id: length for staff_id, length in lengths.items() if staff_id in staff_ids}
+
+        slots = []
+        for offset in range(max(1, days)):
+            day = start + timedelta(days=offset)
+            if day < now.date():
+                continue
+            not_before = now.hour * 3600 + now.minute * 60 + now.second if day == now.date() else 0
+            for staff_id, length in sorted(lengths.items()):
+                staff_day = self._days.get((staff_id, day))
+                if staff_day is None:
+                    continue
+                for seance_start in staff_day.free_starts(length, self.step, not_before):
+                    seance_time = (datetime.min + timedelta(seconds=seance_start)).time()
+                    slots.append(
+                        StaffSeance(
+                            time=seance_time.strftime('%H:%M'),
+                            seance_length=length,
+                            datetime=datetime.combine(day, seance_time, self.timezone),
+                            staff_id=staff_id,
+                        )
+                    )
+            # Дни перебираются по возрастанию: если сеансов уже достаточно, более поздние дни ближе не будут.
+            if limit is not None and len(slots) >= limit:
+                break
+
+        slots.sort(key=lambda slot: (slot.datetime, slot.staff_id))
+        self._stats['queries'] += 1
+        self._stats['last_query_ms'] = int((time.perf_counter() - started) * 1000)
+        return slots[:limit] if limit is not None else slots
+
+    def invalidate(self, staff_id: int, day: date | None = None):
+        '''
+        Сбрасывает загруженный день (или все дни) сотрудника: при следующем обращении период будет загружен заново.
+        Графики сотрудника из загрузки, начатой до вызова, не сохраняются.
+
+        Args:
+            staff_id (int): ID сотрудника.
+            day (date | None): Дата или None для всех дат.
+        '''
+        keys = [key for key in self._days if key[0] == staff_id and (day is None or key[1] == day)]
+        for key in keys:
+            del self._days[key]
+            self._loaded.pop(key[1], None)
+        self._generations[staff_id] += 1
+        self._stats['invalidations'] += 1
+
+    def stats(self) -> dict[str, float | int]:
+        '''
+        Возвращает статистику движка.
+
+        Returns:
+            dict[str, float | int]: Количество загруженных дней сотрудников, запросов к API по видам, расчётов,
+            расчётов без запросов к API, инвалидаций, отброшенных из-за инвалидации графиков и длительность
+            последнего расчёта.
+        '''
+        return {**self._stats, 'staff_days': len(self._days)}
+
+
+def compare_seances(local: list[StaffSeance], remote: list[StaffSeance]) -> dict[str, list[tuple[int, str, str]]]:
+    '''
+    Сверяет сеансы, рассчитанные локально, с сеансами из `get_bookable_times`.
+
+    Args:
+        local (list[StaffSeance]): Сеансы движка.
+        remote (list[StaffSeance]): Сеансы API.
+
+    Returns:
+        dict[str, list[tuple[int, str, str]]]: Сеансы (ID сотрудника, дата, время), которые есть только
+        в API (`missing`) и только в расчёте движка (`extra`).
+    '''
+
+    def keys(seances: list[StaffSeance]) -> set[tuple[int, str, str]]:
+        return {(seance.staff_id, seance.datetime.date().isoformat(), seance.time[:5]) for seance in seances}
+
+    local_keys, remote_keys = keys(local), keys(remote)
+    return {'missing': sorted(remote_keys - local_keys), 'extra': sorted(local_keys - remote_keys)}
@@ -0,0 +1,116 @@
+import contextvars
+import logging
+import random
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+# Решение о трассировке текущего запроса: принимается один раз в BaseService.request_and_parse
+# и наследуется всеми событиями запроса, включая задачи, созданные внутри него.
+_sampled: contextvars.ContextVar[bool | None] = contextvars.ContextVar('yclients_trace_sampled', default=None)
+
+
+def preview(value: Any, limit: int = 500) -> str:
+    '''
+    Возвращает строковое представление значения, обрезанное до `limit` символов.
+
+    Args:
+        value (Any): Значение (словарь, модель, байты тела ответа и т.д.).
+        limit (int): Максимальная длина представления.
+
+    Returns:
+        str: Представление значения.
+    '''
+    # Модели и словари сериализуются в JSON быстрыми сериализаторами pydantic/orjson, а не через repr.
+    if isinstance(value, BaseModel):
+        value = value.__pydantic_serializer__.to_json(value, fallback=str)
+    elif isinstance(value, (dict, list)):
+        try:
+            value = orjson.dumps(value, default=str)
+        except TypeError:
+            pass
+    if isinstance(value, (bytes, bytearray)):
+        text = bytes(value[: limit + 1]).decode('utf-8', errors='replace')
+        size = len(value)
+    else:
+        text = str(value)
+        size = len(text)
+    if size <= limit:
+        return text
+    return f'{text[:limit]}… [{size} total]'
+
+
+class LazyFields:
+    '''
+    Поля события трассировки, которые форматируются только при выводе записи лога.
+    '''
+
+    __slots__ = ('fields', 'limit')
+
+    def __init__(self, fields: dict[str, Any], limit: int):
+        self.fields = fields
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return ' '.join(f'{name}={preview(value, self.limit)}' for name, value in self.fields.items())
+
+
+class RequestTracer:
+    '''
+    Структурированная трассировка запросов пакета yclients.
+
+    События пишутся в логгер `yclients.trace` на уровне DEBUG. Поля передаются как есть и форматируются
+    лениво (см. `LazyFields`), поэтому при выключенном DEBUG стоимость события — одна проверка уровня.
+    Полезная нагрузка в тексте записи обрезается до `preview_limit` символов; исходные значения доступны
+    обработчикам логов в `record.trace`. Трассируется доля запросов `sample_rate`.
+    '''
+
+    def __init__(self, sample_rate: float = 1.0, preview_limit: int = 500, logger_name: str = 'yclients.trace'):
+        '''
+        Инициализирует трассировку.
+
+        Args:
+            sample_rate (float): Доля трассируемых запросов от 0 до 1.
+            preview_limit (int): Максимальная длина представления полезной нагрузки в тексте записи.
+            logger_name (str): Имя логгера трассировки.
+        '''
+        self.sample_rate = sample_rate
+        self.preview_limit = preview_limit
+        self.logger = logging.getLogger(logger_name)
+
+    def begin(self) -> bool:
+        '''
+        Принимает решение о трассировке нового запроса.
+
+        Returns:
+            bool: Будет ли запрос трассироваться.
+        '''
+        sampled = self.logger.isEnabledFor(logging.DEBUG) and (
+            self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        )
+        _sampled.set(sampled)
+        return sampled
+
+    @property
+    def active(self) -> bool:
+        '''Трассируется ли текущий запрос.'''
+        sampled = _sampled.get()
+        return self.begin() if sampled is None else sampled
+
+    def event(self, name: str, **fields: Any):
+        '''
+        Записывает событие трассировки текущего запроса.
+
+        Args:
+            name (str): Имя события.
+            **fields (Any): Поля события.
+        '''
+        if not self.active:
+            return
+        self.logger.debug(
+            '%s %s',
+            name,
+            LazyFields(fields, self.preview_limit),
+            extra={'trace': {'event': name, **fields}},
+        )
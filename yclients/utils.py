@@ -1,11 +1,21 @@
 from config import settings
-from yclients import YClientsManager
+from yclients import YClientsManager, YClients
+from yclients.registry import registry
+from yclients.retry import RetryPolicy
+from yclients.rate_limit import RateLimiter
+from yclients.tracing import RequestTracer
+from yclients.cache import ResponseCache, MemoryCacheBackend, DiskCacheBackend
 
 
-def get_manager():
-    if not hasattr(settings, 'TELEGRAM_BOT_TOKEN') or not settings.TELEGRAM_BOT_TOKEN:
-        raise ValueError('TELEGRAM_BOT_TOKEN is not set in settings.')
+def create_manager() -> YClientsManager:
+    '''Создаёт YClientsManager по настройкам приложения.
 
+    Returns:
+        YClientsManager: Новый менеджер с собственной сессией aiohttp.
+
+    Raises:
+        ValueError: Если отсутствуют необходимые настройки.
+    '''
     if not hasattr(settings, 'YCLIENTS_API_URL') or not settings.YCLIENTS_API_URL:
         raise ValueError('YCLIENTS_API_URL is not set in settings.')
 
@@ -18,10 +28,89 @@ def get_manager():
     if not hasattr(settings, 'YCLIENTS_COMPANY_ID') or not settings.YCLIENTS_COMPANY_ID:
         raise ValueError('YCLIENTS_COMPANY_ID is not set in settings.')
 
-    manager = YClientsManager(
+    return YClientsManager(
         api_url=settings.YCLIENTS_API_URL,
         partner_token=settings.YCLIENTS_PARTNER_TOKEN,
         user_token=settings.YCLIENTS_USER_TOKEN,
         company_id=settings.YCLIENTS_COMPANY_ID,
+        connector_limit=settings.YCLIENTS_CONNECTOR_LIMIT,
+        connector_limit_per_host=settings.YCLIENTS_CONNECTOR_LIMIT_PER_HOST,
+        keepalive_timeout=settings.YCLIENTS_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl=settings.YCLIENTS_DNS_CACHE_TTL,
+        retry_policy=RetryPolicy(
+            max_attempts=settings.YCLIENTS_RETRY_MAX_ATTEMPTS,
+            base_delay=settings.YCLIENTS_RETRY_BASE_DELAY,
+            max_delay=settings.YCLIENTS_RETRY_MAX_DELAY,
+            deadline=settings.YCLIENTS_RETRY_DEADLINE,
+        ),
+        rate_limiter=create_rate_limiter(),
+        response_cache=create_response_cache(),
+        tracer=RequestTracer(
+            sample_rate=settings.YCLIENTS_TRACE_SAMPLE_RATE,
+            preview_limit=settings.YCLIENTS_TRACE_PREVIEW_LIMIT,
+        ),
+    )
+
+
+def create_rate_limiter() -> RateLimiter | None:
+    '''Создаёт ограничитель частоты запросов по настройкам приложения.
+
+    Returns:
+        RateLimiter | None: Ограничитель или None, если общий лимит не задан (YCLIENTS_RATE_LIMIT=0).
+    '''
+    if settings.YCLIENTS_RATE_LIMIT <= 0:
+        return None
+    return RateLimiter(
+        rate=settings.YCLIENTS_RATE_LIMIT,
+        burst=settings.YCLIENTS_RATE_BURST,
+        endpoint_limits=RateLimiter.parse_limits(settings.YCLIENTS_ENDPOINT_RATE_LIMITS),
+        max_wait=settings.YCLIENTS_RATE_MAX_WAIT,
     )
-    return manager
+
+
+def create_response_cache() -> ResponseCache | None:
+    '''Создаёт кэш ответов API по настройкам приложения.
+
+    Returns:
+        ResponseCache | None: Кэш или None, если кэширование отключено (YCLIENTS_CACHE_BACKEND=none).
+
+    Raises:
+        ValueError: Если указано неизвестное хранилище кэша.
+    '''
+    if settings.YCLIENTS_CACHE_BACKEND == 'none':
+        return None
+    if settings.YCLIENTS_CACHE_BACKEND == 'memory':
+        backend = MemoryCacheBackend(settings.YCLIENTS_CACHE_MAX_ENTRIES)
+    elif settings.YCLIENTS_CACHE_BACKEND == 'disk':
+        backend = DiskCacheBackend(settings.YCLIENTS_CACHE_DIR)
+    else:
+        raise ValueError(f'Unknown YCLIENTS_CACHE_BACKEND: {settings.YCLIENTS_CACHE_BACKEND}')
+    return ResponseCache(backend, ResponseCache.parse_policies(settings.YCLIENTS_CACHE_POLICIES))
+
+
+def get_yclients() -> YClients:
+    '''Возвращает общий на процесс экземпляр YClients, создавая и регистрируя его при первом обращении.
+
+    Returns:
+        YClients: Общий экземпляр клиента.
+    '''
+    if not registry.is_registered:
+        registry.register(
+            YClients(
+                create_manager(),
+                availability_window_days=settings.AVAILABILITY_WINDOW_DAYS,
+                availability_refresh_interval=settings.AVAILABILITY_REFRESH_INTERVAL,
+                availability_max_age=settings.AVAILABILITY_MAX_AGE,
+                slot_step=settings.AVAILABILITY_SLOT_STEP,
+            )
+        )
+    return registry.get()
+
+
+def get_manager() -> YClientsManager:
+    '''Возвращает менеджер общего экземпляра YClients (новая сессия aiohttp не создаётся).
+
+    Returns:
+        YClientsManager: Общий менеджер.
+    '''
+    return get_yclients().manager
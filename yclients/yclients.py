@@ -11,10 +11,19 @@ from yclients.services.staff_schedule_service import StaffScheduleService
 from yclients.services.user_records_service import UserRecordService
 from yclients.services.validation_service import ValidationService
 from yclients.services.visits_service import VisitsService
+from yclients.availability import AvailabilityIndex
+from yclients.slots import SlotEngine
 
 
 class YClients:
-    def __init__(self, manager: YClientsManager):
+    def __init__(
+        self,
+        manager: YClientsManager,
+        availability_window_days: int = 14,
+        availability_refresh_interval: float = 300.0,
+        availability_max_age: float = 600.0,
+        slot_step: int = 900,
+    ):
         self.manager = manager
 
         self.clients = ClientsService(manager)
@@ -29,6 +38,24 @@ class YClients:
         self.validation = ValidationService(manager)
         self.visits = VisitsService(manager)
 
+        # Индекс свободного времени; фоновое обновление запускается отдельно через availability.start().
+        self.availability = AvailabilityIndex(
+            self.online_bookings,
+            window_days=availability_window_days,
+            refresh_interval=availability_refresh_interval,
+            max_age=availability_max_age,
+        )
+        # Локальный расчёт свободного времени по графикам сотрудников; сбрасывается после записи.
+        self.slots = SlotEngine(
+            self.staff_schedule,
+            self.services,
+            journal=self.journal,
+            step=slot_step,
+            max_age=availability_max_age,
+        )
+        self.online_bookings.add_booking_listener(self.slots.invalidate)
+
     async def close(self):
         '''Закрывает менеджер и связанные с ним ресурсы.'''
+        await self.availability.stop()
         await self.manager.close()